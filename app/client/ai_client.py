@@ -1,8 +1,13 @@
-
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
-from google import genai
 load_dotenv()
 
-# client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+
+@lru_cache(maxsize=None)
+def get_ai_client():
+    """Build the Gemini client on first use; google-genai is imported lazily."""
+    from google import genai
+
+    # client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+    return genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
@@ -1,6 +1,6 @@
 import os
+from functools import lru_cache
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from supabase import create_client, Client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,8 +9,14 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 
-if not all([SUPABASE_URL, SUPABASE_KEY, JWT_SECRET]):
-    raise ValueError("Missing required environment variables")
+security = HTTPBearer()
 
-supabase: Client = create_client(str(SUPABASE_URL), str(SUPABASE_KEY))
-security = HTTPBearer()
\ No newline at end of file
+
+@lru_cache(maxsize=None)
+def get_auth_supabase():
+    """Build the Supabase client used for auth calls on first use."""
+    if not all([SUPABASE_URL, SUPABASE_KEY, JWT_SECRET]):
+        raise ValueError("Missing required environment variables")
+
+    from supabase import create_client
+    return create_client(str(SUPABASE_URL), str(SUPABASE_KEY))
@@ -1,6 +1,6 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
-from supabase import create_client, Client
 
 # Load environment variables
 load_dotenv()
@@ -8,4 +8,9 @@ load_dotenv()
 SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+@lru_cache(maxsize=None)
+def get_supabase():
+    """Build the storage Supabase client on first use."""
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
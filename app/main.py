@@ -1,10 +1,68 @@
+import time
+IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from .routes.file_operation import router as file_upload_router
 from .routes.resume import router as data_extract_router
 from .routes.auth import router as auth_router
+from .services.parse_executor import ParseExecutor
+from .services.parse_cache import ParseCache
+from .services.optimization_cache import create_optimization_cache
+from .services.job_descriptions import JobDescriptionStore
+from .services.context_cache import create_context_cache
+from .services.job_queue import JobStore, OptimizationJobQueue
+from .services.resume_parser import ai_dispatcher
+from .services.startup import STARTUP_WARM_CLIENTS, StartupReport
+from .services.metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
+from .services.timing import ServerTimingMiddleware
+from .client.ai_client import get_ai_client
+from .client.auth_client import get_auth_supabase
+from .client.supabase_client import get_supabase
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    report = StartupReport(started=IMPORT_STARTED)
+    report.record("imports", time.perf_counter() - IMPORT_STARTED)
+
+    # Start the parse workers (each loads spaCy once) before the first request
+    with report.step("parse_executor"):
+        app.state.parse_executor = ParseExecutor()
+    with report.step("parse_cache"):
+        app.state.parse_cache = ParseCache()
+    with report.step("optimization_cache"):
+        app.state.optimization_cache = create_optimization_cache()
+    with report.step("context_cache"):
+        app.state.context_cache = create_context_cache()
+    with report.step("job_descriptions"):
+        app.state.job_descriptions = JobDescriptionStore()
+    with report.step("job_queue"):
+        # Also re-queues jobs a previous process left running
+        app.state.job_queue = OptimizationJobQueue(JobStore(), app.state.optimization_cache)
+        await app.state.job_queue.start()
+
+    # Client construction is local (no network); failures are retried on first use
+    if STARTUP_WARM_CLIENTS:
+        for name, provider in (
+            ("supabase_client", get_supabase),
+            ("auth_client", get_auth_supabase),
+            ("ai_client", get_ai_client),
+        ):
+            with report.step(name, required=False):
+                provider()
+
+    report.log()
+    app.state.startup_report = report
+    yield
+    await app.state.job_queue.stop()
+    app.state.parse_executor.shutdown()
+    app.state.job_descriptions.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 
@@ -13,13 +71,44 @@ def helloWorld():
     return {"message": "FastAPI Running"}
 
 
+@app.get("/health/parser")
+def parser_health():
+    return {
+        **app.state.parse_executor.stats(),
+        "cache": app.state.parse_cache.stats(),
+    }
+
+
+@app.get("/health/optimizer")
+def optimizer_health():
+    cache = app.state.optimization_cache
+    return {
+        "cache": cache.stats() if cache is not None else None,
+        "job_descriptions": app.state.job_descriptions.stats(),
+        "jobs": app.state.job_queue.stats(),
+        "ai_dispatcher": ai_dispatcher.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get("/health/startup")
+def startup_health():
+    return app.state.startup_report.as_dict()
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],  # React dev server
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+app.add_middleware(ServerTimingMiddleware)
 # include router
 app.include_router(file_upload_router, prefix="/files", tags=["File Upload"])
 app.include_router(data_extract_router,prefix="/api", tags=["Optimize"])
@@ -34,3 +34,15 @@ class ResumeContent(BaseModel):
     summary: str = ""
     raw_markdown: str = ""
     extracted_text: str = ""
+
+class BulkParseRequest(BaseModel):
+    filenames: List[str]
+
+class BatchOptimizeJob(BaseModel):
+    job_description: Optional[str] = None
+    job_description_id: Optional[str] = None
+
+class BatchOptimizeRequest(BaseModel):
+    resume_content: ResumeContent
+    jobs: List[BatchOptimizeJob]
+    additional_info: Optional[str] = None
@@ -2,7 +2,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from ..services.auth_util import get_current_user
 from ..models.auth_model import AuthResponse, ForgotPasswordRequest, MessageResponse, OTPRequest, UserProfile, UserSignIn, UserSignUp
-from ..client.auth_client import supabase
+from ..client.auth_client import get_auth_supabase
 
 router = APIRouter()
 
@@ -10,7 +10,7 @@ router = APIRouter()
 async def sign_up(user_data: UserSignUp):
         """Register a new user"""
         try:
-            auth_response = supabase.auth.sign_up({
+            auth_response = get_auth_supabase().auth.sign_up({
                 "email": user_data.email,
                 "password": user_data.password,
                 "options": {
@@ -29,7 +29,7 @@ async def sign_up(user_data: UserSignUp):
 async def sign_in(user_data: UserSignIn):
         """Sign in user and return access token"""
         try:
-            auth_response = supabase.auth.sign_in_with_password({
+            auth_response = get_auth_supabase().auth.sign_in_with_password({
                 "email": user_data.email,
                 "password": user_data.password
             })
@@ -55,7 +55,7 @@ async def sign_in(user_data: UserSignIn):
 async def forgot_password(request: ForgotPasswordRequest):
         """Send password reset link"""
         try:
-            supabase.auth.reset_password_email(request.email)
+            get_auth_supabase().auth.reset_password_email(request.email)
             return {"message": "Password reset email sent"}
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to send reset email")
@@ -65,7 +65,7 @@ async def forgot_password(request: ForgotPasswordRequest):
 async def sign_in_with_otp(request: OTPRequest):
         """Send magic link/OTP to email"""
         try:
-            supabase.auth.sign_in_with_otp({"email": request.email})
+            get_auth_supabase().auth.sign_in_with_otp({"email": request.email})
             return {"message": "OTP sent to email"}
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to send OTP")
@@ -75,7 +75,7 @@ async def sign_in_with_otp(request: OTPRequest):
 async def sign_out(current_user: str = Depends(get_current_user)):
         """Sign out current user"""
         try:
-            supabase.auth.sign_out()
+            get_auth_supabase().auth.sign_out()
             return {"message": "Successfully signed out"}
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to sign out")
@@ -85,7 +85,7 @@ async def sign_out(current_user: str = Depends(get_current_user)):
 async def get_profile(current_user: str = Depends(get_current_user)):
         """Get current user profile"""
         try:
-            user = supabase.auth.get_user()
+            user = get_auth_supabase().auth.get_user()
             if user and user.user and user.user.email:
                 return UserProfile(
                     id=user.user.id,
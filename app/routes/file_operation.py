@@ -1,5 +1,5 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from ..client.supabase_client import supabase
+from ..client.supabase_client import get_supabase
 from ..services.auth_util import get_current_user
 import os
 from dotenv import load_dotenv
@@ -22,7 +22,7 @@ async def upload_resume(
 
     try:
         content = await file.read()
-        res = supabase.storage.from_(str(BUCKET_NAME)).upload(
+        res = get_supabase().storage.from_(str(BUCKET_NAME)).upload(
             file_path,
             content
         )
@@ -40,11 +40,11 @@ async def list_files(current_user: dict = Depends(get_current_user)):
     """List files uploaded by the logged-in user (with signed URLs)"""
     try:
         user_id = current_user["id"]
-        files = supabase.storage.from_(str(BUCKET_NAME)).list(user_id)
+        files = get_supabase().storage.from_(str(BUCKET_NAME)).list(user_id)
 
         file_list = []
         for file in files:
-            signed_url_data = supabase.storage.from_(str(BUCKET_NAME)).create_signed_url(
+            signed_url_data = get_supabase().storage.from_(str(BUCKET_NAME)).create_signed_url(
                 f"{user_id}/{file['name']}",
                 3600  # 1 hour expiry
             )
@@ -68,7 +68,7 @@ async def download_file(filename: str, current_user: dict = Depends(get_current_
         user_id = current_user["id"]
         file_path = f"{user_id}/{filename}"
 
-        signed_url_data = supabase.storage.from_(str(BUCKET_NAME)).create_signed_url(
+        signed_url_data = get_supabase().storage.from_(str(BUCKET_NAME)).create_signed_url(
             file_path,
             600  # 10 min expiry
         )
@@ -88,7 +88,7 @@ async def delete_file(filename: str, current_user: dict = Depends(get_current_us
         user_id = current_user["id"]
         file_path = f"{user_id}/{filename}"
 
-        res = supabase.storage.from_(str(BUCKET_NAME)).remove([file_path])
+        res = get_supabase().storage.from_(str(BUCKET_NAME)).remove([file_path])
 
         error = getattr(res, 'error', None) if not isinstance(res, dict) else res.get('error')
         if error:
@@ -1,82 +1,730 @@
-from fastapi import APIRouter, Body, Query, Depends, HTTPException
-from ..services.extract_info import ResumeParser
-from app.models.resume_model import PersonalInfo, ResumeContent
+from fastapi import APIRouter, Body, Query, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, List, Tuple
+from ..services.parse_executor import ParseExecutor, ParserSaturated, get_parse_executor
+from ..services.parse_cache import ParseCache, get_parse_cache
+from ..services.optimization_cache import OptimizationCache, get_optimization_cache, request_hash
+from ..services.prompt_builder import compact_resume, missing_sections, restore_trimmed, select_sections
+from ..services.resonance import score_against
+from ..services.job_descriptions import (
+    JobDescriptionStore,
+    get_job_descriptions,
+    job_terms_of,
+    public_view,
+    resolve_job_description,
+)
+from ..services.timing import span
+from ..services.disconnect import cancel_on_disconnect
+from ..services.singleflight import SingleFlight
+from ..services.ai_dispatcher import BATCH, INTERACTIVE, set_ai_caller
+from ..services.job_queue import JobQueueFull, OptimizationJobQueue, get_job_queue, validate_webhook_url
+from ..services.streaming import (
+    NDJSON_MEDIA_TYPE,
+    SSE_HEADERS,
+    SSE_MEDIA_TYPE,
+    StageClock,
+    ndjson_line,
+    sse_event,
+)
+from app.models.resume_model import BatchOptimizeRequest, BulkParseRequest, PersonalInfo, ResumeContent
 from ..services.auth_util import get_current_user
-from ..client.supabase_client import supabase
+from ..client.supabase_client import get_supabase
 import os, io
-from ..services.resume_parser import call_ai_for_optimization
+import asyncio
+from ..services.resume_parser import AI_MODEL, call_ai_for_optimization
+from ..services.context_cache import ContextCache, get_context_cache
+from ..services.optimization_planner import OPTIMIZE_STRATEGY, optimize, stream_optimization
 from app.models.resume_model import ResumeContent
 from ..services.auth_util import get_current_user
 
 router = APIRouter()
 BUCKET_NAME = os.getenv("BUCKET_NAME")
 
+# Bulk parsing limits
+MAX_BULK_FILES = int(os.getenv("MAX_BULK_FILES", "50"))
+DOWNLOAD_CONCURRENCY = int(os.getenv("DOWNLOAD_CONCURRENCY", "8"))
+PARSE_BATCH_SIZE = int(os.getenv("PARSE_BATCH_SIZE", "4"))
+
+# Batch optimization limits
+MAX_BATCH_JOBS = int(os.getenv("MAX_BATCH_JOBS", "30"))
+BATCH_OPTIMIZE_CONCURRENCY = int(os.getenv("BATCH_OPTIMIZE_CONCURRENCY", "4"))
+
+# Concurrent identical requests (double clicks, client retries) share one parse / AI call
+_parse_flights = SingleFlight("parse")
+_optimize_flights = SingleFlight("optimize")
+
+
+def _optimize_flight_key(
+    route: str,
+    user_id: str,
+    resume_data: Dict,
+    job_description: str,
+    additional_info: str | None,
+) -> Tuple:
+    """
+    Key of an optimization in _optimize_flights.
+
+    The routes build different prompts for the same request (the batch
+    route one context-cached prompt, optimize-resume per OPTIMIZE_STRATEGY),
+    so the route and strategy are part of the key and a call is only shared
+    with requests that would have made the same one.
+    """
+    return (route, OPTIMIZE_STRATEGY, user_id, request_hash(resume_data, job_description, additional_info, AI_MODEL))
+
+
+def _build_parse_response(result: Dict) -> Dict:
+    """Shape a ResumeParser result into the parse-resume response body"""
+    extracted_info = result["extracted_info"]
+    personal_info = PersonalInfo(
+        name=extracted_info.get("name", ""),
+        email=extracted_info.get("email", ""),
+        phone=extracted_info.get("phone", ""),
+        linkedin=extracted_info.get("linkedin", ""),
+        github=extracted_info.get("github", ""),
+        location=extracted_info.get("location", ""),
+        website=extracted_info.get("website", "")
+    )
+
+    resume_content = ResumeContent(
+        education=extracted_info.get("education", []),
+        experience=extracted_info.get("experience", []),
+        skills=extracted_info.get("skills", []),
+        projects=extracted_info.get("projects", []),
+        certifications=extracted_info.get("certifications", []),
+        languages=extracted_info.get("languages", []),
+        summary=extracted_info.get("summary", ""),
+        raw_markdown=result.get("markdown", ""),
+        extracted_text=result.get("raw_text", "")
+    )
+
+    return {
+        "personal_info": personal_info,
+        "resume_content": resume_content
+    }
+
+
 @router.post("/parse-resume/")
 async def parse_resume(
     filename: str = Query(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    parse_executor: ParseExecutor = Depends(get_parse_executor),
+    parse_cache: ParseCache = Depends(get_parse_cache)
 ):
+    """
+    Parse a resume PDF from the user's storage.
+    Identical requests from the same user in flight at once share one parse.
+    """
     user_id = current_user["id"]
     file_path = f"{user_id}/{filename}"
+    return await _parse_flights.do(
+        file_path, lambda: _parse_stored_file(file_path, filename, parse_executor, parse_cache)
+    )
+
 
+async def _parse_stored_file(
+    file_path: str,
+    filename: str,
+    parse_executor: ParseExecutor,
+    parse_cache: ParseCache,
+) -> Dict:
     # Download file
     try:
-        pdf_bytes: bytes = supabase.storage.from_(BUCKET_NAME).download(file_path)
+        with span("download"):
+            pdf_bytes: bytes = await asyncio.to_thread(
+                get_supabase().storage.from_(BUCKET_NAME).download, file_path
+            )
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"File not found: {filename}")
 
-    parser = ResumeParser()
-    result = parser.parse_resume(pdf_bytes)
+    # Reuse the previous result when this exact PDF was parsed before
+    with span("cache"):
+        cache_key = parse_cache.key(pdf_bytes)
+        result = await asyncio.to_thread(parse_cache.get, cache_key)
 
-    personal_info = PersonalInfo(
-        name=result["extracted_info"].get("name", ""),
-        email=result["extracted_info"].get("email", ""),
-        phone=result["extracted_info"].get("phone", ""),
-        linkedin=result["extracted_info"].get("linkedin", ""),
-        github=result["extracted_info"].get("github", ""),
-        location=result["extracted_info"].get("location", ""),
-        website=result["extracted_info"].get("website", "")
-    )
+    if result is None:
+        try:
+            result = await parse_executor.parse(pdf_bytes)
+        except ParserSaturated:
+            raise HTTPException(
+                status_code=503,
+                detail="Resume parser is busy, try again shortly",
+                headers={"Retry-After": "2"},
+            )
+        except (asyncio.TimeoutError, TimeoutError):
+            raise HTTPException(status_code=504, detail="Resume parsing timed out")
+        await asyncio.to_thread(parse_cache.put, cache_key, result)
 
-    resume_content = ResumeContent(
-        education=result["extracted_info"].get("education", []),
-        experience=result["extracted_info"].get("experience", []),
-        skills=result["extracted_info"].get("skills", []),
-        projects=result["extracted_info"].get("projects", []),
-        certifications=result["extracted_info"].get("certifications", []),
-        languages=result["extracted_info"].get("languages", []),
-        summary=result["extracted_info"].get("summary", ""),
-        raw_markdown=result.get("markdown", ""),
-        extracted_text=result.get("raw_text", "")
+    return _build_parse_response(result)
+
+
+@router.post("/parse-resumes/")
+async def parse_resumes(
+    request: BulkParseRequest = Body(...),
+    current_user: dict = Depends(get_current_user),
+    parse_executor: ParseExecutor = Depends(get_parse_executor),
+    parse_cache: ParseCache = Depends(get_parse_cache)
+):
+    """
+    Parse several uploaded resumes in one request.
+
+    Responds with NDJSON, one line per file in completion order:
+    {"filename", "personal_info", "resume_content"} on success or
+    {"filename", "error"} when that file could not be downloaded or parsed.
+    Repeated filenames are parsed once.
+    """
+    filenames = list(dict.fromkeys(request.filenames))
+    if not filenames:
+        raise HTTPException(status_code=400, detail="No filenames given")
+    if len(filenames) > MAX_BULK_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_FILES} files can be parsed per request",
+        )
+
+    return StreamingResponse(
+        _bulk_parse_lines(current_user["id"], filenames, parse_executor, parse_cache),
+        media_type=NDJSON_MEDIA_TYPE,
     )
 
-    return {
-        "personal_info": personal_info,
-        "resume_content": resume_content
+
+async def _bulk_parse_lines(
+    user_id: str,
+    filenames: List[str],
+    parse_executor: ParseExecutor,
+    parse_cache: ParseCache,
+) -> AsyncIterator[bytes]:
+    """
+    Download every file concurrently and parse cache misses in batches.
+
+    Downloads run on threads, at most DOWNLOAD_CONCURRENCY at a time. A file
+    found in the parse cache is answered as soon as it is downloaded; the
+    others are grouped into batches of PARSE_BATCH_SIZE for
+    ParseExecutor.parse_batch, so parsing starts while later files are
+    still downloading.
+    """
+    download_slots = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    async def fetch(filename: str) -> Tuple[bytes, str, Dict | None]:
+        async with download_slots:
+            with span("download"):
+                pdf_bytes = await asyncio.to_thread(
+                    get_supabase().storage.from_(BUCKET_NAME).download, f"{user_id}/{filename}"
+                )
+        cache_key = parse_cache.key(pdf_bytes)
+        return pdf_bytes, cache_key, await asyncio.to_thread(parse_cache.get, cache_key)
+
+    # task -> ("download", filename) or ("parse", [(filename, cache key), ...])
+    tasks: Dict[asyncio.Task, Tuple[str, object]] = {
+        asyncio.create_task(fetch(filename)): ("download", filename) for filename in filenames
     }
+    to_parse: List[Tuple[str, str, bytes]] = []
+
+    try:
+        while tasks or to_parse:
+            downloading = any(kind == "download" for kind, _ in tasks.values())
+            if to_parse and (len(to_parse) >= PARSE_BATCH_SIZE or not downloading):
+                batch, to_parse = to_parse[:PARSE_BATCH_SIZE], to_parse[PARSE_BATCH_SIZE:]
+                task = asyncio.create_task(parse_executor.parse_batch([pdf for _, _, pdf in batch]))
+                tasks[task] = ("parse", [(filename, cache_key) for filename, cache_key, _ in batch])
+                continue
+
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                kind, item = tasks.pop(task)
+
+                if kind == "download":
+                    try:
+                        pdf_bytes, cache_key, result = task.result()
+                    except Exception:
+                        yield ndjson_line({"filename": item, "error": f"File not found: {item}"})
+                        continue
+                    if result is None:
+                        to_parse.append((item, cache_key, pdf_bytes))
+                    else:
+                        yield ndjson_line({"filename": item, **_build_parse_response(result)})
+                    continue
+
+                try:
+                    results = task.result()
+                except ParserSaturated:
+                    results = [{"error": "Resume parser is busy, try again shortly"}] * len(item)
+                except (asyncio.TimeoutError, TimeoutError):
+                    results = [{"error": "Resume parsing timed out"}] * len(item)
+                except Exception:
+                    results = [{"error": "Resume parsing failed"}] * len(item)
+
+                for (filename, cache_key), result in zip(item, results):
+                    if result.get("error"):
+                        yield ndjson_line({"filename": filename, "error": result["error"]})
+                        continue
+                    await asyncio.to_thread(parse_cache.put, cache_key, result)
+                    yield ndjson_line({"filename": filename, **_build_parse_response(result)})
+    finally:
+        # Client went away or the stream failed: stop outstanding downloads
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/parse-resume/stream")
+async def parse_resume_stream(
+    filename: str = Query(...),
+    current_user: dict = Depends(get_current_user),
+    parse_executor: ParseExecutor = Depends(get_parse_executor),
+    parse_cache: ParseCache = Depends(get_parse_cache)
+):
+    """
+    Server-Sent Events variant of parse-resume.
+
+    Emits downloaded, text_extracted and fields_extracted events, each
+    carrying stage_ms and elapsed_ms timings; fields_extracted carries the
+    parse-resume response body. text_extracted is skipped when the result
+    comes from the parse cache. Failures after the download arrive as an
+    error event.
+    """
+    clock = StageClock()
+    user_id = current_user["id"]
+    file_path = f"{user_id}/{filename}"
+
+    # Download before streaming so a missing file is still a plain 404
+    try:
+        with span("download"):
+            pdf_bytes: bytes = await asyncio.to_thread(
+                get_supabase().storage.from_(BUCKET_NAME).download, file_path
+            )
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"File not found: {filename}")
+
+    return StreamingResponse(
+        _parse_events(clock, filename, pdf_bytes, parse_executor, parse_cache),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS,
+    )
+
+
+async def _parse_events(
+    clock: StageClock,
+    filename: str,
+    pdf_bytes: bytes,
+    parse_executor: ParseExecutor,
+    parse_cache: ParseCache,
+) -> AsyncIterator[bytes]:
+    yield sse_event("downloaded", {"filename": filename, "bytes": len(pdf_bytes), **clock.lap()})
+
+    cache_key = parse_cache.key(pdf_bytes)
+    result = await asyncio.to_thread(parse_cache.get, cache_key)
+    cached = result is not None
+
+    if not cached:
+        try:
+            text = await parse_executor.extract_text(pdf_bytes)
+            yield sse_event("text_extracted", {"characters": len(text), **clock.lap()})
+            result = await parse_executor.analyse(text)
+        except ParserSaturated:
+            yield sse_event("error", {
+                "detail": "Resume parser is busy, try again shortly", "retry_after": 2, **clock.lap()
+            })
+            return
+        except (asyncio.TimeoutError, TimeoutError):
+            yield sse_event("error", {"detail": "Resume parsing timed out", **clock.lap()})
+            return
+        except Exception:
+            yield sse_event("error", {"detail": "Resume parsing failed", **clock.lap()})
+            return
+        await asyncio.to_thread(parse_cache.put, cache_key, result)
+
+    yield sse_event("fields_extracted", {**_build_parse_response(result), "cached": cached, **clock.lap()})
 
 
 @router.post("/optimize-resume/")
 async def optimize_resume(
+    request: Request,
     resume_content: ResumeContent = Body(...),
-    job_description: str = Body(...),
+    job_description: str | None = Body(None),
+    job_description_id: str | None = Body(None),
     additional_info: str | None = Body(None),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    optimization_cache: OptimizationCache | None = Depends(get_optimization_cache),
+    job_descriptions: JobDescriptionStore = Depends(get_job_descriptions)
 ):
     """
     Optimize a parsed resume content using AI.
-    Personal info is NOT sent to AI.
+    Personal info is NOT sent to AI, and only the sections being
+    rewritten are, compacted to PROMPT_RESUME_TOKEN_BUDGET; anything the
+    compaction left out comes back as submitted.
+    The job description is sent as text or as the ID returned by
+    /job-descriptions.
+    Identical requests from the same user in flight at once share one
+    AI call, which is cancelled once every client waiting on it has
+    disconnected.
     """
+    set_ai_caller(current_user["id"], INTERACTIVE)
     try:
-        # Convert Pydantic model to dict
-        resume_data = resume_content.dict()
+        job = await resolve_job_description(job_descriptions, job_description, job_description_id)
+        job_description = job["text"]
+
+        # Only the rewritten sections; the planner trims its prompt copy to the token budget
+        resume_data = select_sections(resume_content.dict())
+
+        # Re-submits of the same resume and job description reuse the last answer
+        cache_key, optimized_result = await _cached_optimization(
+            optimization_cache, resume_data, job_description, additional_info
+        )
+        if optimized_result is not None:
+            return optimized_result
         
-        optimized_result = call_ai_for_optimization(
-            ai_data=resume_data, 
-            job_description=job_description, 
-            additional_info=additional_info
+        flight_key = _optimize_flight_key(
+            "optimize", current_user["id"], resume_data, job_description, additional_info
         )
-        return optimized_result
+        return await cancel_on_disconnect(request, _optimize_flights.do(
+            flight_key,
+            lambda: _optimize_and_store(
+                resume_data, job_description, additional_info, optimization_cache, cache_key
+            ),
+        ))
 
+    except HTTPException:
+        raise
+    except (asyncio.TimeoutError, TimeoutError):
+        raise HTTPException(status_code=504, detail="AI optimization timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI optimization failed: {str(e)}")
+
+
+@router.post("/optimize-resume/stream")
+async def optimize_resume_stream(
+    resume_content: ResumeContent = Body(...),
+    job_description: str | None = Body(None),
+    job_description_id: str | None = Body(None),
+    additional_info: str | None = Body(None),
+    current_user: dict = Depends(get_current_user),
+    optimization_cache: OptimizationCache | None = Depends(get_optimization_cache),
+    job_descriptions: JobDescriptionStore = Depends(get_job_descriptions)
+):
+    """
+    Server-Sent Events variant of optimize-resume.
+
+    Emits ai_started when the request goes to the model, one ai_item
+    ({"section", "index", "item"}) per optimized array element as soon as
+    it is ready (per finished section with OPTIMIZE_STRATEGY=fanout), then
+    ai_sections_ready with the complete result and the sections that kept
+    their submitted text ("failed"), or an error event. All carry
+    stage_ms and elapsed_ms timings. A cached answer is sent as
+    ai_sections_ready with cached=true and no ai_started.
+    """
+    # Inherited by the task that runs the stream
+    set_ai_caller(current_user["id"], INTERACTIVE)
+    # Resolved before streaming so an unknown job description ID is still a 404
+    job = await resolve_job_description(job_descriptions, job_description, job_description_id)
+    return StreamingResponse(
+        _optimize_events(select_sections(resume_content.dict()), job["text"], additional_info, optimization_cache),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS,
+    )
+
+
+async def _optimize_events(
+    resume_data: dict,
+    job_description: str,
+    additional_info: str | None,
+    optimization_cache: OptimizationCache | None,
+) -> AsyncIterator[bytes]:
+    clock = StageClock()
+    cache_key, optimized_result = await _cached_optimization(
+        optimization_cache, resume_data, job_description, additional_info
+    )
+    if optimized_result is not None:
+        yield sse_event("ai_sections_ready", {
+            "sections": list(optimized_result), "result": optimized_result, "cached": True, **clock.lap()
+        })
+        return
+
+    yield sse_event("ai_started", {"model": AI_MODEL, "strategy": OPTIMIZE_STRATEGY, **clock.lap()})
+
+    optimized_result = {}
+    failed = []
+    try:
+        async for event in stream_optimization(
+            ai_data=resume_data,
+            job_description=job_description,
+            additional_info=additional_info
+        ):
+            if "result" in event:
+                optimized_result, failed = event["result"], event["failed"]
+            else:
+                yield sse_event("ai_item", {**event, **clock.lap()})
+    except (asyncio.TimeoutError, TimeoutError):
+        yield sse_event("error", {"detail": "AI optimization timed out", **clock.lap()})
+        return
+    except Exception as e:
+        yield sse_event("error", {"detail": f"AI optimization failed: {str(e)}", **clock.lap()})
+        return
+
+    if not failed:
+        await _store_optimization(optimization_cache, cache_key, optimized_result)
+    yield sse_event("ai_sections_ready", {
+        "sections": list(optimized_result), "result": optimized_result, "cached": False, "failed": failed,
+        **clock.lap()
+    })
+
+
+@router.post("/optimize-resumes/")
+async def optimize_resumes(
+    request: BatchOptimizeRequest = Body(...),
+    current_user: dict = Depends(get_current_user),
+    optimization_cache: OptimizationCache | None = Depends(get_optimization_cache),
+    job_descriptions: JobDescriptionStore = Depends(get_job_descriptions),
+    context_cache: ContextCache = Depends(get_context_cache)
+):
+    """
+    Optimize one resume for several job descriptions in one request.
+
+    Each job gives job_description or job_description_id. Responds with
+    NDJSON, one line per job in completion order: {"index",
+    "job_description_id" (as sent, null for text), "result", "cached"}
+    on success or {"index", "error"} for that job. The resume part of the prompt is the same for
+    every job and goes through the shared context cache; at most
+    BATCH_OPTIMIZE_CONCURRENCY jobs call the model at once, at batch
+    priority so interactive requests are not kept waiting behind them.
+    """
+    if not request.jobs:
+        raise HTTPException(status_code=400, detail="No jobs given")
+    if len(request.jobs) > MAX_BATCH_JOBS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_JOBS} jobs can be optimized per request",
+        )
+
+    return StreamingResponse(
+        _batch_optimize_lines(
+            current_user["id"],
+            select_sections(request.resume_content.dict()),
+            request,
+            optimization_cache,
+            job_descriptions,
+            context_cache,
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+async def _batch_optimize_lines(
+    user_id: str,
+    resume_data: dict,
+    request: BatchOptimizeRequest,
+    optimization_cache: OptimizationCache | None,
+    job_descriptions: JobDescriptionStore,
+    context_cache: ContextCache,
+) -> AsyncIterator[bytes]:
+    model_slots = asyncio.Semaphore(BATCH_OPTIMIZE_CONCURRENCY)
+    # One trimmed copy shared by every job's prompt
+    prompt_data = compact_resume(resume_data)
+    # Many calls for one user; single optimizations from others go first
+    set_ai_caller(user_id, BATCH)
+
+    async def run(index: int, job) -> Dict:
+        try:
+            analysis = await resolve_job_description(
+                job_descriptions, job.job_description, job.job_description_id
+            )
+        except HTTPException as e:
+            return {"index": index, "error": e.detail}
+        # Postings sent as text are not stored, so they have no ID to hand back
+        line = {"index": index, "job_description_id": job.job_description_id}
+
+        cache_key, result = await _cached_optimization(
+            optimization_cache, resume_data, analysis["text"], request.additional_info, route="batch"
+        )
+        if result is not None:
+            return {**line, "result": result, "cached": True}
+
+        async def optimize_job() -> dict:
+            async with model_slots:
+                result = await call_ai_for_optimization(
+                    prompt_data, analysis["text"], request.additional_info, context_cache=context_cache
+                )
+            # A cut-off answer (repaired JSON missing entries) is retried on the next batch
+            complete = not missing_sections(result, prompt_data)
+            result = restore_trimmed(result, resume_data, prompt_data)
+            if complete:
+                await _store_optimization(optimization_cache, cache_key, result)
+            return result
+
+        # Repeated postings in the batch (and identical concurrent batches) share one call
+        flight_key = _optimize_flight_key(
+            "batch", user_id, resume_data, analysis["text"], request.additional_info
+        )
+        try:
+            result = await _optimize_flights.do(flight_key, optimize_job)
+        except (asyncio.TimeoutError, TimeoutError):
+            return {**line, "error": "AI optimization timed out"}
+        except Exception as e:
+            return {**line, "error": f"AI optimization failed: {str(e)}"}
+        return {**line, "result": result, "cached": False}
+
+    tasks = [asyncio.create_task(run(index, job)) for index, job in enumerate(request.jobs)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield ndjson_line(await finished)
+    finally:
+        # Client went away or the stream failed: stop the remaining jobs
+        for task in tasks:
+            task.cancel()
+
+
+async def _optimize_and_store(
+    resume_data: dict,
+    job_description: str,
+    additional_info: str | None,
+    optimization_cache: OptimizationCache | None,
+    cache_key: str | None,
+) -> dict:
+    outcome = await optimize(
+        ai_data=resume_data, 
+        job_description=job_description, 
+        additional_info=additional_info
+    )
+    # Sections that fell back to the submitted text are retried on the next submit
+    if outcome.complete:
+        await _store_optimization(optimization_cache, cache_key, outcome.result)
+    return outcome.result
+
+
+async def _cached_optimization(
+    optimization_cache: OptimizationCache | None,
+    resume_data: dict,
+    job_description: str,
+    additional_info: str | None,
+    route: str = "optimize",
+) -> Tuple[str | None, dict | None]:
+    """
+    Return (cache key, cached result); both None when caching is disabled.
+
+    route keeps answers from different prompt paths apart (see request_hash).
+    """
+    if optimization_cache is None:
+        return None, None
+    with span("optimize_cache"):
+        cache_key = optimization_cache.key(resume_data, job_description, additional_info, AI_MODEL, route)
+        return cache_key, await asyncio.to_thread(optimization_cache.get, cache_key)
+
+
+async def _store_optimization(
+    optimization_cache: OptimizationCache | None,
+    cache_key: str | None,
+    optimized_result: dict,
+) -> None:
+    if optimization_cache is not None and cache_key is not None:
+        await asyncio.to_thread(optimization_cache.put, cache_key, optimized_result)
+
+
+@router.post("/optimize-jobs", status_code=202)
+async def submit_optimize_job(
+    resume_content: ResumeContent = Body(...),
+    job_description: str | None = Body(None),
+    job_description_id: str | None = Body(None),
+    additional_info: str | None = Body(None),
+    webhook_url: str | None = Body(None),
+    current_user: dict = Depends(get_current_user),
+    optimization_cache: OptimizationCache | None = Depends(get_optimization_cache),
+    job_descriptions: JobDescriptionStore = Depends(get_job_descriptions),
+    job_queue: OptimizationJobQueue = Depends(get_job_queue)
+):
+    """
+    Queue an optimization and return its job ID at once.
+
+    Takes the same body as optimize-resume plus an optional https
+    webhook_url on a public address. Poll /optimize-jobs/{id} for the
+    status (queued, running, succeeded, failed) and result; the webhook,
+    if given, is POSTed the same body once the job has finished. Failed or
+    incomplete AI calls are retried with backoff, and queued jobs survive
+    a restart. Answers 429 while the user (or the queue) has too many
+    unfinished jobs.
+    """
+    if webhook_url:
+        await validate_webhook_url(webhook_url)
+    job = await resolve_job_description(job_descriptions, job_description, job_description_id)
+    resume_data = select_sections(resume_content.dict())
+
+    # A cached answer makes the job succeed without queueing it
+    _, optimized_result = await _cached_optimization(
+        optimization_cache, resume_data, job["text"], additional_info
+    )
+    try:
+        submitted = await job_queue.submit(
+            current_user["id"],
+            {"resume_data": resume_data, "job_description": job["text"], "additional_info": additional_info},
+            webhook_url=webhook_url,
+            result=optimized_result,
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return {"id": submitted["id"], "status": submitted["status"]}
+
+
+@router.get("/optimize-jobs/{job_id}")
+async def get_optimize_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user),
+    job_queue: OptimizationJobQueue = Depends(get_job_queue)
+):
+    """
+    Status of an optimization job: {"id", "status", "attempts",
+    "created_at", "updated_at", "finished_at"}, plus "result" and "failed"
+    (sections kept as submitted) once succeeded, and "error" after a
+    failed attempt.
+    """
+    job = await job_queue.get(job_id, current_user["id"])
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown optimization job: {job_id}")
+    return job
+
+
+@router.post("/score")
+async def score(
+    resume_content: ResumeContent = Body(...),
+    job_description: str | None = Body(None),
+    job_description_id: str | None = Body(None),
+    current_user: dict = Depends(get_current_user),
+    job_descriptions: JobDescriptionStore = Depends(get_job_descriptions)
+):
+    """
+    Score how well the resume matches the job description, locally.
+
+    No AI call: hashed TF-IDF vectors of the resume sections and the job
+    description give an overall 0-100 score, per-section similarity and
+    keyword coverage, and the job description's matched and missing
+    keywords. Takes milliseconds, so the client can call it as the user
+    types; the job description's tokens come precomputed from the job
+    description store.
+    """
+    job = await resolve_job_description(job_descriptions, job_description, job_description_id)
+    with span("score"):
+        return score_against(resume_content.dict(), job_terms_of(job))
+
+
+@router.post("/job-descriptions")
+async def ingest_job_description(
+    job_description: str = Body(..., embed=True),
+    current_user: dict = Depends(get_current_user),
+    job_descriptions: JobDescriptionStore = Depends(get_job_descriptions)
+):
+    """
+    Analyse a job posting once and return its ID, keywords and requirements.
+
+    Pass the ID as job_description_id to optimize-resume and score instead
+    of resending the text; postings sent as text there are not stored. Postings that differ only in whitespace share
+    an ID, and popular postings are analysed only once across all users.
+    """
+    with span("job_description"):
+        job = await asyncio.to_thread(job_descriptions.ingest, job_description)
+    return public_view(job)
+
+
+@router.get("/job-descriptions/{job_description_id}")
+async def get_job_description(
+    job_description_id: str,
+    current_user: dict = Depends(get_current_user),
+    job_descriptions: JobDescriptionStore = Depends(get_job_descriptions)
+):
+    job = await resolve_job_description(job_descriptions, None, job_description_id)
+    return public_view(job)
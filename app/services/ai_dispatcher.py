@@ -0,0 +1,261 @@
+# app/services/ai_dispatcher.py
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from .metrics import counter, gauge, histogram
+from .prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Provider quotas for the model, shared by every call from this process; 0 disables a limit
+AI_REQUESTS_PER_MINUTE = int(os.getenv("AI_REQUESTS_PER_MINUTE", "2000"))
+AI_TOKENS_PER_MINUTE = int(os.getenv("AI_TOKENS_PER_MINUTE", "4000000"))
+# Tokens of credit a waiting user gets per scheduling round
+AI_FAIR_QUANTUM_TOKENS = int(os.getenv("AI_FAIR_QUANTUM_TOKENS", "2000"))
+# Response tokens assumed when estimating a call's cost up front
+AI_OUTPUT_TOKEN_ESTIMATE = int(os.getenv("AI_OUTPUT_TOKEN_ESTIMATE", "1000"))
+
+_WINDOW_SECONDS = 60.0
+
+# Priority classes, highest first
+INTERACTIVE, BATCH = "interactive", "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+ai_dispatch_queued = gauge(
+    "ai_dispatch_queued",
+    "AI calls waiting for the dispatcher, by priority",
+)
+ai_dispatch_wait_seconds = histogram(
+    "ai_dispatch_wait_seconds",
+    "Time AI calls waited for the dispatcher, by priority",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+ai_dispatch_tokens_total = counter(
+    "ai_dispatch_tokens_total",
+    "Tokens of dispatched AI calls, as estimated up front and as reported by the model",
+)
+
+
+class AICaller(NamedTuple):
+    user_id: str
+    priority: str
+
+
+_caller: ContextVar[AICaller] = ContextVar("ai_caller", default=AICaller("anonymous", INTERACTIVE))
+
+
+def set_ai_caller(user_id: str, priority: str = INTERACTIVE) -> None:
+    """Attribute the AI calls made from the current task (and tasks it starts) to a user and priority."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown AI call priority {priority!r}, expected one of {PRIORITIES}")
+    _caller.set(AICaller(user_id, priority))
+
+
+def current_ai_caller() -> AICaller:
+    return _caller.get()
+
+
+def estimate_call_tokens(prompt: str) -> int:
+    """Up-front token cost of a call: the prompt plus AI_OUTPUT_TOKEN_ESTIMATE for the answer"""
+    return estimate_tokens(prompt) + AI_OUTPUT_TOKEN_ESTIMATE
+
+
+def usage_tokens(response) -> Optional[int]:
+    """Total tokens the model reports for a response (or final stream chunk), if it does"""
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None)
+    return total if isinstance(total, int) else None
+
+
+class _Waiter:
+    __slots__ = ("future", "cost", "enqueued")
+
+    def __init__(self, future: "asyncio.Future[List]", cost: int, enqueued: float):
+        self.future = future
+        self.cost = cost
+        self.enqueued = enqueued
+
+
+class AIDispatcher:
+    """
+    Admits AI calls fairly across users within the provider's quotas.
+
+    At most max_concurrency calls run at once, and calls started in the
+    last minute stay within requests_per_minute and tokens_per_minute
+    (by their estimated cost, corrected to the model's reported usage
+    once a call finishes). Waiting calls are ordered by:
+
+    - priority class: interactive calls always go ahead of batch ones;
+    - deficit round-robin across users within a class: each waiting user
+      gets quantum tokens of credit per round and is admitted while its
+      credit covers its next call, so a user with many queued calls
+      cannot starve one with a single call, whatever the prompt sizes.
+
+    A call that does not fit the remaining token budget holds back the
+    calls behind it until it does, rather than being overtaken forever by
+    smaller ones. The caller comes from set_ai_caller().
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: int = AI_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = AI_TOKENS_PER_MINUTE,
+        quantum: int = AI_FAIR_QUANTUM_TOKENS,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.quantum = max(1, quantum)
+        self._flows: Dict[str, "OrderedDict[str, Deque[_Waiter]]"] = {p: OrderedDict() for p in PRIORITIES}
+        self._deficits: Dict[str, Dict[str, int]] = {p: {} for p in PRIORITIES}
+        self._credited: Dict[str, Optional[str]] = {p: None for p in PRIORITIES}
+        self._window: Deque[List] = deque()  # [started (monotonic), tokens] per admitted call
+        self._running = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, cost: int, caller: Optional[AICaller] = None) -> List:
+        """
+        Wait until a call costing about cost tokens may start.
+
+        Returns a charge to hand back to release() once the call is over.
+        """
+        caller = caller or current_ai_caller()
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), cost, loop.time())
+        self._flows[caller.priority].setdefault(caller.user_id, deque()).append(waiter)
+        ai_dispatch_queued.inc(priority=caller.priority)
+        ai_dispatch_tokens_total.inc(cost, source="estimate")
+        self._pump()
+        try:
+            charge = await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the caller was cancelled
+                self.release(waiter.future.result())
+            else:
+                self._discard(caller, waiter)
+            raise
+        ai_dispatch_wait_seconds.observe(loop.time() - waiter.enqueued, priority=caller.priority)
+        return charge
+
+    def release(self, charge: List, used_tokens: Optional[int] = None) -> None:
+        """Free the call's slot; used_tokens, if known, replaces its estimated cost in the budget."""
+        if used_tokens is not None:
+            charge[1] = used_tokens
+            ai_dispatch_tokens_total.inc(used_tokens, source="usage")
+        self._running -= 1
+        self._pump()
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        self._expire(now)
+        return {
+            "running": self._running,
+            "max_concurrency": self.max_concurrency,
+            "queued": {p: sum(len(q) for q in self._flows[p].values()) for p in PRIORITIES},
+            "users_waiting": {p: len(self._flows[p]) for p in PRIORITIES},
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": sum(tokens for _, tokens in self._window),
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+        }
+
+    def _pump(self) -> None:
+        while self._running < self.max_concurrency:
+            priority = next((p for p in PRIORITIES if self._flows[p]), None)
+            if priority is None:
+                return
+            user = self._select(priority)
+            waiter = self._flows[priority][user][0]
+            if waiter.future.done():
+                # Cancelled, and acquire() has not run to discard it yet
+                self._pop(priority, user, charged=False)
+                continue
+            now = time.monotonic()
+            delay = self._budget_delay(waiter.cost, now)
+            if delay > 0:
+                self._wake_in(delay)
+                return
+            self._pop(priority, user)
+            charge = [now, waiter.cost]
+            waiter.future.set_result(charge)
+            # Only a call that was really handed its slot counts against the limits
+            self._window.append(charge)
+            self._running += 1
+
+    def _select(self, priority: str) -> str:
+        # Deficit round-robin: the front user is credited once per turn and
+        # keeps the turn while its credit covers its next call
+        flows, deficits = self._flows[priority], self._deficits[priority]
+        while True:
+            user, queue = next(iter(flows.items()))
+            if self._credited[priority] != user:
+                deficits[user] = deficits.get(user, 0) + self.quantum
+                self._credited[priority] = user
+            if deficits[user] >= queue[0].cost:
+                return user
+            flows.move_to_end(user)
+            self._credited[priority] = None
+
+    def _pop(self, priority: str, user: str, charged: bool = True) -> None:
+        queue = self._flows[priority][user]
+        waiter = queue.popleft()
+        if charged:
+            self._deficits[priority][user] -= waiter.cost
+        if not queue:
+            self._forget(priority, user)
+        ai_dispatch_queued.dec(priority=priority)
+
+    def _discard(self, caller: AICaller, waiter: _Waiter) -> None:
+        queue = self._flows[caller.priority].get(caller.user_id)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        if not queue:
+            self._forget(caller.priority, caller.user_id)
+        ai_dispatch_queued.dec(priority=caller.priority)
+        # The cancelled call may have been the one holding the others back
+        self._pump()
+
+    def _forget(self, priority: str, user: str) -> None:
+        # An idle user keeps no credit for later
+        del self._flows[priority][user]
+        self._deficits[priority].pop(user, None)
+        if self._credited[priority] == user:
+            self._credited[priority] = None
+
+    def _expire(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - _WINDOW_SECONDS:
+            self._window.popleft()
+
+    def _budget_delay(self, cost: int, now: float) -> float:
+        """Seconds until a call of this cost fits the per-minute budgets (0 if it fits now)"""
+        self._expire(now)
+        delay = 0.0
+        if self.requests_per_minute and len(self._window) >= self.requests_per_minute:
+            oldest_counted = self._window[len(self._window) - self.requests_per_minute]
+            delay = max(delay, oldest_counted[0] + _WINDOW_SECONDS - now)
+        if self.tokens_per_minute and self._window:
+            used = sum(tokens for _, tokens in self._window)
+            # A call larger than the whole budget runs once the window is empty
+            for started, tokens in self._window:
+                if used + cost <= self.tokens_per_minute:
+                    break
+                used -= tokens
+                delay = max(delay, started + _WINDOW_SECONDS - now)
+        return delay
+
+    def _wake_in(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._pump()
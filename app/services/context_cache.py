@@ -0,0 +1,133 @@
+# app/services/context_cache.py
+import os
+import time
+import hashlib
+import logging
+from typing import Optional, Protocol
+
+from fastapi import HTTPException, Request
+
+from ..client.ai_client import get_ai_client
+from .cache import LRUCache
+from .metrics import counter
+from .resume_parser import AI_MODEL, generate_text
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# "local" or "gemini"
+OPTIMIZE_CONTEXT_CACHE = os.getenv("OPTIMIZE_CONTEXT_CACHE", "local")
+CONTEXT_CACHE_ENTRIES = int(os.getenv("CONTEXT_CACHE_ENTRIES", "128"))
+CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("CONTEXT_CACHE_TTL_SECONDS", "600"))
+# A cached context this close to expiry is recreated rather than used
+_EXPIRY_MARGIN_SECONDS = 30
+
+context_cache_lookups_total = counter(
+    "context_cache_lookups_total",
+    "Shared prompt context lookups by backend and result",
+)
+
+
+class ContextCache(Protocol):
+    """Sends prompts that follow a long shared context (the resume) to the model."""
+
+    async def generate(self, context: str, prompt: str, timeout: Optional[float] = None) -> str: ...
+
+
+def context_key(context: str, model: str = AI_MODEL) -> str:
+    return hashlib.sha256(f"{model}\n{context}".encode("utf-8")).hexdigest()
+
+
+class LocalContextCache:
+    """
+    Stand-in for a provider-side context cache.
+
+    The context is sent inline ahead of every prompt. Because it is
+    byte-identical across the prompts of one resume, providers with
+    implicit prefix caching can still reuse it. Lookups are counted the
+    same way as with a real context cache, so hit rates can be compared
+    before switching backends.
+    """
+
+    def __init__(self, max_entries: int = CONTEXT_CACHE_ENTRIES):
+        self._seen = LRUCache(max_entries)
+
+    async def generate(self, context: str, prompt: str, timeout: Optional[float] = None) -> str:
+        key = context_key(context)
+        result = "hit" if self._seen.get(key) is not None else "miss"
+        context_cache_lookups_total.inc(backend="local", result=result)
+        self._seen.set(key, True)
+        return await generate_text(context + prompt, timeout)
+
+
+class GeminiContextCache:
+    """
+    Gemini explicit context caching.
+
+    Each distinct context is uploaded once with caches.create and its
+    name reused for ttl_seconds, so later prompts send only their own
+    text. Concurrent first uses of a context share one upload. Contexts
+    the API refuses (e.g. shorter than the model's cache minimum) are
+    remembered and go through the local stand-in instead.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = CONTEXT_CACHE_TTL_SECONDS,
+        max_entries: int = CONTEXT_CACHE_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._names = LRUCache(max_entries)        # key -> (cached content name, expires at)
+        self._unsupported = LRUCache(max_entries)  # keys the API refused to cache
+        self._uploads = SingleFlight("context_cache")
+        self.fallback = LocalContextCache(max_entries)
+
+    async def generate(self, context: str, prompt: str, timeout: Optional[float] = None) -> str:
+        key = context_key(context)
+        if self._unsupported.get(key) is None:
+            name = await self._cached_name(key, context)
+            if name is not None:
+                return await generate_text(prompt, timeout, cached_content=name)
+        return await self.fallback.generate(context, prompt, timeout)
+
+    async def _cached_name(self, key: str, context: str) -> Optional[str]:
+        entry = self._names.get(key)
+        if entry is not None and entry[1] - _EXPIRY_MARGIN_SECONDS > time.time():
+            context_cache_lookups_total.inc(backend="gemini", result="hit")
+            return entry[0]
+        context_cache_lookups_total.inc(backend="gemini", result="miss")
+        return await self._uploads.do(key, lambda: self._upload(key, context))
+
+    async def _upload(self, key: str, context: str) -> Optional[str]:
+        from google.genai import types
+
+        try:
+            cached = await get_ai_client().aio.caches.create(
+                model=AI_MODEL,
+                config=types.CreateCachedContentConfig(
+                    contents=[context],
+                    ttl=f"{self.ttl_seconds}s",
+                    display_name=f"resume-context-{key[:12]}",
+                ),
+            )
+        except Exception as e:
+            logger.info(f"Context not cached by the provider, sending it inline: {e}")
+            self._unsupported.set(key, True)
+            return None
+        self._names.set(key, (cached.name, time.time() + self.ttl_seconds))
+        return cached.name
+
+
+def create_context_cache(backend: str = OPTIMIZE_CONTEXT_CACHE) -> ContextCache:
+    if backend == "local":
+        return LocalContextCache()
+    if backend == "gemini":
+        return GeminiContextCache()
+    raise ValueError(f"Unknown OPTIMIZE_CONTEXT_CACHE {backend!r}, expected local or gemini")
+
+
+def get_context_cache(request: Request) -> ContextCache:
+    """FastAPI dependency returning the context cache created in the app lifespan"""
+    if not hasattr(request.app.state, "context_cache"):
+        raise HTTPException(status_code=503, detail="Optimizer is not ready")
+    return request.app.state.context_cache
@@ -0,0 +1,49 @@
+# app/services/disconnect.py
+import asyncio
+import logging
+from typing import Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# nginx's status for a request the client closed before the response
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    # The body has already been read, so the next message is the disconnect
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def cancel_on_disconnect(request: Request, work: Awaitable[T]) -> T:
+    """
+    Await work, cancelling it if the HTTP client goes away first.
+
+    Only for routes that return a plain response; StreamingResponse already
+    cancels its generator on disconnect.
+
+    Raises:
+        HTTPException: 499 if the client disconnected (nobody receives it,
+            but it ends the request and is visible in access logs and metrics)
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.create_task(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+            # Let the work unwind (and release what it holds) before answering
+            await asyncio.wait({task})
+
+    if task.cancelled():
+        logger.info(f"Client disconnected, cancelled {request.method} {request.url.path}")
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    return task.result()
@@ -1,35 +1,196 @@
-import io
+import os
 import re
 import logging
-from typing import List, Dict, Optional, Union
-import PyPDF2
-from pdfminer.high_level import extract_text
+from functools import lru_cache
+from typing import Iterable, List, Dict, Optional, Tuple, Union
 import spacy
 from spacy.matcher import Matcher
 
+from .pdf_text import PDF_MAX_BYTES, PDF_MAX_PAGES, iter_pdf_pages
+from .redaction import RedactionTerm, Redactor
+from .resume_document import ResumeDocument, is_heading
+from .timing import span
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_SPACY_MODEL = 'en_core_web_sm'
+
+# The name matcher only reads POS tags, which come from tok2vec + tagger +
+# attribute_ruler; the dependency parser, lemmatizer and NER are never used
+NAME_PIPELINE_EXCLUDE: Tuple[str, ...] = ('parser', 'lemmatizer', 'ner', 'senter')
+
+NAME_BATCH_SIZE = int(os.getenv("NAME_BATCH_SIZE", "32"))
+NAME_N_PROCESS = int(os.getenv("NAME_N_PROCESS", "1"))
+
+
+@lru_cache(maxsize=None)
+def load_spacy_model(model_name: str = DEFAULT_SPACY_MODEL, exclude: Tuple[str, ...] = ()):
+    """
+    Load a spacy model once per process and share it between callers.
+    
+    Args:
+        model_name: Name of the spacy language model to load
+        exclude: Pipeline components not to load at all
+        
+    Returns:
+        The loaded spacy Language object
+    """
+    logger.info(f"Loading spacy model: {model_name} (excluding {', '.join(exclude) or 'nothing'})")
+    return spacy.load(model_name, exclude=list(exclude))
+
+
+# Precompiled pattern registry, shared by every ResumeParser instance
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b')
+
+PHONE_PATTERNS = (
+    re.compile(r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'),  # US format
+    re.compile(r'\+?(\d{1,4})?[-.\s]?\(?(\d{3,4})\)?[-.\s]?(\d{3,4})[-.\s]?(\d{3,4})'),  # International
+    re.compile(r'(\d{10})'),  # Simple 10-digit number
+)
+
+LINKEDIN_PATTERNS = (
+    re.compile(r'https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9\-_]+/?', re.IGNORECASE),
+    re.compile(r'linkedin\.com/in/[a-zA-Z0-9\-_]+', re.IGNORECASE),
+    re.compile(r'LinkedIn[:\s\-]+([a-zA-Z0-9\-_]{3,})', re.IGNORECASE),  # "LinkedIn: username"
+)
+
+GITHUB_PATTERNS = (
+    re.compile(r'https?://(?:www\.)?github\.com/[a-zA-Z0-9\-_]+/?', re.IGNORECASE),
+    re.compile(r'github\.com/[a-zA-Z0-9\-_]+', re.IGNORECASE),
+    re.compile(r'GitHub[:\s\-]+([a-zA-Z0-9\-_]{3,})', re.IGNORECASE),  # "GitHub: username"
+    re.compile(r'git[:\s\-]+([a-zA-Z0-9\-_]{3,})', re.IGNORECASE),
+)
+
+CGPA_PATTERNS = (
+    re.compile(r'(?:GPA|CGPA)[:\s]*([0-9]\.?[0-9]{0,2}\s*/\s*(?:10|4)\.?0?0?)', re.IGNORECASE),
+    re.compile(r'(?:GPA|CGPA)[:\s]*([0-9]\.?[0-9]{0,2})', re.IGNORECASE),
+    re.compile(r'([0-9]\.?[0-9]{0,2})\s*/\s*(?:10|4)\.?0?0?', re.IGNORECASE),
+)
+
+DEGREE_PATTERNS = (
+    re.compile(r"(?i)(B\.E\.|B\.Tech|B\.Sc|B\.A\.|B\.Com|BBA|BCA)"),
+    re.compile(r"(?i)(M\.E\.|M\.Tech|M\.Sc|M\.A\.|M\.Com|MBA|MCA)"),
+    re.compile(r"(?i)(Ph\.D|PhD|Doctorate)"),
+    re.compile(r"(?i)(Bachelor(?:'s)?(?:\s+of)?(?:\s+\w+)*)"),
+    re.compile(r"(?i)(Master(?:'s)?(?:\s+of)?(?:\s+\w+)*)"),
+    re.compile(r"(?i)(Associate(?:'s)?(?:\s+of)?(?:\s+\w+)*)"),
+)
+
+DATE_RANGE_PATTERN = re.compile(
+    r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}\s*[-–—]\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)?\s*\d{4}|\d{4}\s*[-–—]\s*\d{4}'
+)
+
+PAGE_NUMBER_PATTERN = re.compile(r'Page (\d+)')
+NUMBERED_LINE_PATTERN = re.compile(r'^\d+\.')
+BULLET_PREFIX_PATTERN = re.compile(r'^[•\-*\d.\s]+')
+EXCESS_NEWLINES_PATTERN = re.compile(r'\n{3,}')
+NON_DIGIT_PATTERN = re.compile(r'\D')
+PHONE_PUNCTUATION_PATTERN = re.compile(r'[\s\-\(\)\.]+')
+
+# Contact fields in priority order; within a field, earlier patterns win
+CONTACT_FIELD_PATTERNS = {
+    'email': (EMAIL_PATTERN,),
+    'phone': PHONE_PATTERNS,
+    'linkedin': LINKEDIN_PATTERNS,
+    'github': GITHUB_PATTERNS,
+}
+
+def _phone_value(match: re.Match) -> str:
+    """Join the captured phone groups, or '' if the digit count is implausible."""
+    phone_str = ''.join(filter(None, match.groups())) if match.groups() else match.group(0)
+    digits_only = NON_DIGIT_PATTERN.sub('', phone_str)
+    return phone_str if 10 <= len(digits_only) <= 15 else ""
+
+
+def _profile_url(match: re.Match, base_url: str) -> str:
+    """Turn a LinkedIn/GitHub match into a full profile URL."""
+    url = match.group(0) if match.group(0).startswith('http') else match.group(1) if match.lastindex else match.group(0)
+    if not url.startswith('http'):
+        url = f"{base_url}{url.strip('/')}"
+    return url
+
+
+_CONTACT_VALUE = {
+    'email': lambda match: match.group(0),
+    'phone': _phone_value,
+    'linkedin': lambda match: _profile_url(match, "https://linkedin.com/in/"),
+    'github': lambda match: _profile_url(match, "https://github.com/"),
+}
+
+
+def first_contact_value(field: str, text: str) -> str:
+    """
+    Return the value of the first pattern for a contact field that yields one.
+    
+    Each pattern stops at its first match instead of collecting every match,
+    so a field found in the resume header costs a few hundred bytes of
+    scanning rather than a pass over the whole document.
+    
+    Args:
+        field: One of the CONTACT_FIELD_PATTERNS keys
+        text: Full resume text
+        
+    Returns:
+        Extracted value or empty string
+    """
+    to_value = _CONTACT_VALUE[field]
+    for pattern in CONTACT_FIELD_PATTERNS[field]:
+        match = pattern.search(text)
+        if match:
+            value = to_value(match)
+            if value:
+                return value
+    
+    return ""
+
+
+def scan_contact_fields(text: str) -> Dict[str, str]:
+    """
+    Extract email, phone, LinkedIn and GitHub from resume text in one call.
+    
+    Args:
+        text: Full resume text
+        
+    Returns:
+        Dictionary with 'email', 'phone', 'linkedin' and 'github' keys
+    """
+    return {field: first_contact_value(field, text) for field in CONTACT_FIELD_PATTERNS}
+
+
+def _as_document(text: Union[str, ResumeDocument]) -> ResumeDocument:
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
+
 
 class ResumeParser:
     """A comprehensive resume parser that extracts structured information from PDF resumes."""
     
-    def __init__(self, spacy_model: str = 'en_core_web_sm'):
+    def __init__(
+        self,
+        spacy_model: str = DEFAULT_SPACY_MODEL,
+        pipeline_exclude: Tuple[str, ...] = NAME_PIPELINE_EXCLUDE,
+    ):
         """
         Initialize the ResumeParser.
         
         Args:
             spacy_model: Name of the spacy language model to use
+            pipeline_exclude: Pipeline components to leave out; pass () for the full pipeline
         """
-        self.nlp = spacy.load(spacy_model)
-        self.matcher = Matcher(self.nlp.vocab) if self.nlp else None
+        self.nlp = load_spacy_model(spacy_model, tuple(pipeline_exclude))
+        self.matcher = Matcher(self.nlp.vocab) if self.nlp is not None else None
+        if self.nlp is not None and not {'tagger', 'morphologizer'} & set(self.nlp.pipe_names):
+            # The name patterns match on POS, which needs a tagger or morphologizer
+            logger.warning(f"Spacy model {spacy_model} has no tagger; using fallback name extraction.")
+            self.matcher = None
         self._setup_name_patterns()
     
     
     def _setup_name_patterns(self) -> None:
         """Setup patterns for name extraction using spacy matcher."""
-        if not self.matcher:
+        if self.matcher is None:
             return
             
         # Define name patterns for different name formats
@@ -43,48 +204,26 @@ class ResumeParser:
             self.matcher.add(f'NAME_PATTERN_{i}', [pattern])
     
     @staticmethod
-    def extract_text_from_pdf(pdf_data: bytes, fallback_method: bool = True) -> str:
+    def extract_text_from_pdf(
+        pdf_data: bytes,
+        fallback_method: bool = True,
+        max_pages: int = PDF_MAX_PAGES,
+        max_bytes: int = PDF_MAX_BYTES,
+    ) -> str:
         """
         Extract text from PDF bytes with fallback options.
         
         Args:
             pdf_data: PDF file as bytes
             fallback_method: Whether to use pdfminer as fallback if PyPDF2 fails
+            max_pages: Pages beyond this count are ignored
+            max_bytes: Larger inputs are rejected with PdfTooLarge
             
         Returns:
             Extracted text content
         """
-        text_content = []
-        
-        # Primary method: PyPDF2
-        try:
-            pdf_file = io.BytesIO(pdf_data)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text and page_text.strip():
-                        text_content.append(page_text)
-                except Exception as e:
-                    logger.warning(f"Error extracting text from page {page_num + 1}: {e}")
-                    continue
-                    
-        except Exception as e:
-            logger.warning(f"PyPDF2 extraction failed: {e}")
-        
-        # Fallback method: pdfminer
-        if not text_content and fallback_method:
-            try:
-                logger.info("Trying fallback method: pdfminer")
-                pdf_file = io.BytesIO(pdf_data)
-                text = extract_text(pdf_file)
-                if text and text.strip():
-                    text_content.append(text)
-            except Exception as e:
-                logger.error(f"pdfminer extraction also failed: {e}")
-        
-        return "\n".join(text_content)
+        with span("pdf_text"):
+            return "\n".join(iter_pdf_pages(pdf_data, fallback_method, max_pages, max_bytes))
     
     @staticmethod
     def detect_heading(line: str) -> bool:
@@ -97,61 +236,25 @@ class ResumeParser:
         Returns:
             True if line appears to be a heading
         """
-        if not line or len(line.strip()) < 2:
-            return False
-            
-        line = line.strip()
-        
-        # All caps and reasonable length
-        if line.isupper() and 3 <= len(line) <= 50:
-            return True
-        
-        # Common resume section headers
-        section_headers = {
-            'EXPERIENCE', 'WORK EXPERIENCE', 'EMPLOYMENT', 'CAREER',
-            'EDUCATION', 'ACADEMIC BACKGROUND', 'QUALIFICATIONS',
-            'SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES',
-            'SUMMARY', 'PROFILE', 'OBJECTIVE', 'ABOUT',
-            'PROJECTS', 'KEY PROJECTS', 'ACHIEVEMENTS',
-            'CERTIFICATIONS', 'CERTIFICATES', 'LICENSES',
-            'CONTACT', 'CONTACT INFORMATION', 'PERSONAL DETAILS',
-            'PUBLICATIONS', 'AWARDS', 'HONORS', 'LANGUAGES'
-        }
-        
-        if line.upper() in section_headers:
-            return True
-        
-        # Pattern-based detection
-        heading_patterns = [
-            r'^(Chapter|Section|Part|Article)\s+\d+',
-            r'^\d+\.\s+[A-Z][a-zA-Z\s]+$',  # "1. Introduction"
-            r'^[IVX]+\.\s+[A-Z]',  # Roman numerals
-        ]
-        
-        for pattern in heading_patterns:
-            if re.match(pattern, line, re.IGNORECASE):
-                return True
-        
-        return False
+        return is_heading(line)
     
-    def convert_text_to_markdown(self, text: str) -> str:
+    def convert_text_to_markdown(self, text: Union[str, ResumeDocument]) -> str:
         """
         Convert extracted PDF text to markdown format.
         
         Args:
-            text: Raw text content from PDF
+            text: Raw text content from PDF, or its ResumeDocument
             
         Returns:
             Formatted markdown string
         """
-        if not text:
+        document = _as_document(text)
+        if not document.text:
             return ""
             
-        lines = text.split('\n')
         markdown_lines = []
         
-        for line in lines:
-            original_line = line
+        for line, heading in zip(document.lines, document.heading_flags):
             line = line.strip()
             
             if not line:
@@ -160,17 +263,17 @@ class ResumeParser:
             
             # Convert page markers to markdown headers
             if line.startswith("--- Page") and line.endswith("---"):
-                page_match = re.search(r'Page (\d+)', line)
+                page_match = PAGE_NUMBER_PATTERN.search(line)
                 if page_match:
                     markdown_lines.append(f"\n## Page {page_match.group(1)}\n")
                 continue
             
-            # Detect headings
-            if self.detect_heading(line):
+            # Headings were detected when the document was indexed
+            if heading:
                 markdown_lines.append(f"### {line}\n")
             # Detect bullet points
-            elif line.startswith(('•', '-', '*')) or re.match(r'^\d+\.', line):
-                clean_bullet = re.sub(r'^[•\-*\d.\s]+', '', line).strip()
+            elif line.startswith(('•', '-', '*')) or NUMBERED_LINE_PATTERN.match(line):
+                clean_bullet = BULLET_PREFIX_PATTERN.sub('', line).strip()
                 markdown_lines.append(f"- {clean_bullet}")
             # Regular paragraph text
             else:
@@ -178,7 +281,7 @@ class ResumeParser:
         
         # Clean up multiple empty lines
         markdown_content = '\n'.join(markdown_lines)
-        markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+        markdown_content = EXCESS_NEWLINES_PATTERN.sub('\n\n', markdown_content)
         
         return markdown_content.strip()
     
@@ -192,15 +295,49 @@ class ResumeParser:
         Returns:
             Extracted name or empty string if not found
         """
-        if not self.nlp or not self.matcher:
+        if self.nlp is None or self.matcher is None:
             logger.warning("Spacy model not loaded. Cannot extract name with NLP.")
             return self._extract_name_fallback(resume_text)
         
-        # Analyze first few lines where name is typically located
-        lines = resume_text.split('\n')
-        text_to_analyze = '\n'.join(lines[:5])
+        doc = self.nlp(self._name_window(resume_text))
+        return self._name_from_doc(doc, resume_text)
+    
+    def extract_names(
+        self,
+        resume_texts: Iterable[str],
+        batch_size: int = NAME_BATCH_SIZE,
+        n_process: int = NAME_N_PROCESS,
+    ) -> List[str]:
+        """
+        Extract candidate names from many resumes with batched nlp.pipe.
         
-        doc = self.nlp(text_to_analyze)
+        Args:
+            resume_texts: Full text of each resume
+            batch_size: Documents per spacy batch
+            n_process: Processes for nlp.pipe (1 runs in this process)
+            
+        Returns:
+            One name (or empty string) per resume, in input order
+        """
+        resume_texts = list(resume_texts)
+        if self.nlp is None or self.matcher is None:
+            logger.warning("Spacy model not loaded. Cannot extract name with NLP.")
+            return [self._extract_name_fallback(text) for text in resume_texts]
+        
+        docs = self.nlp.pipe(
+            (self._name_window(text) for text in resume_texts),
+            batch_size=batch_size,
+            n_process=n_process,
+        )
+        return [self._name_from_doc(doc, text) for doc, text in zip(docs, resume_texts)]
+    
+    @staticmethod
+    def _name_window(resume_text: str) -> str:
+        """First few lines, where the name is typically located."""
+        return '\n'.join(resume_text.split('\n', 5)[:5])
+    
+    def _name_from_doc(self, doc, resume_text: str) -> str:
+        """Pick the name from a processed name window, else use the fallback."""
         matches = self.matcher(doc)
         
         if matches:
@@ -230,6 +367,18 @@ class ResumeParser:
         
         return ""
     
+    def extract_contact_info(self, resume_text: str) -> Dict[str, str]:
+        """
+        Extract email, phone, LinkedIn and GitHub in one call.
+        
+        Args:
+            resume_text: Full resume text
+            
+        Returns:
+            Dictionary with 'email', 'phone', 'linkedin' and 'github' keys
+        """
+        return scan_contact_fields(resume_text)
+    
     def extract_email(self, resume_text: str) -> str:
         """
         Extract email address from resume text.
@@ -240,16 +389,7 @@ class ResumeParser:
         Returns:
             First email found or empty string
         """
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
-        emails = re.findall(email_pattern, resume_text)
-        
-        if emails:
-            # Return the first valid-looking email
-            for email in emails:
-                if '.' in email and '@' in email:
-                    return email
-        
-        return ""
+        return first_contact_value('email', resume_text)
     
     def extract_phone(self, resume_text: str) -> str:
         """
@@ -261,126 +401,49 @@ class ResumeParser:
         Returns:
             First phone number found or empty string
         """
-        phone_patterns = [
-            r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',  # US format
-            r'\+?(\d{1,4})?[-.\s]?\(?(\d{3,4})\)?[-.\s]?(\d{3,4})[-.\s]?(\d{3,4})',  # International
-            r'(\d{10})',  # Simple 10-digit number
-        ]
-        
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, resume_text)
-            if phones:
-                phone = phones[0]
-                if isinstance(phone, tuple):
-                    # Join tuple elements and clean
-                    phone_str = ''.join(filter(None, phone))
-                else:
-                    phone_str = phone
-                
-                # Basic validation
-                digits_only = re.sub(r'\D', '', phone_str)
-                if 10 <= len(digits_only) <= 15:
-                    return phone_str
-        
-        return ""
+        return first_contact_value('phone', resume_text)
     
     def extract_linkedin(self, text: str) -> str:
         """
         Extract LinkedIn profile URL from resume text.
         """
-        # Match full URLs or just username
-        patterns = [
-            r'https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9\-_]+/?',
-            r'linkedin\.com/in/[a-zA-Z0-9\-_]+',
-            r'LinkedIn[:\s\-]+([a-zA-Z0-9\-_]{3,})',  # "LinkedIn: username"
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                # Full URL or just username
-                url = match.group(0) if match.group(0).startswith('http') else match.group(1) if match.lastindex else match.group(0)
-                if not url.startswith('http'):
-                    url = f"https://linkedin.com/in/{url.strip('/')}"
-                return url
-
-        return ""
+        return first_contact_value('linkedin', text)
 
 
     def extract_github(self, text: str) -> str:
         """
         Extract GitHub profile URL from resume text.
         """
-        patterns = [
-            r'https?://(?:www\.)?github\.com/[a-zA-Z0-9\-_]+/?',
-            r'github\.com/[a-zA-Z0-9\-_]+',
-            r'GitHub[:\s\-]+([a-zA-Z0-9\-_]{3,})',  # "GitHub: username"
-            r'git[:\s\-]+([a-zA-Z0-9\-_]{3,})',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                url = match.group(0) if match.group(0).startswith('http') else match.group(1) if match.lastindex else match.group(0)
-                if not url.startswith('http'):
-                    url = f"https://github.com/{url.strip('/')}"
-                return url
-
-        return ""
+        return first_contact_value('github', text)
 
     
-    def extract_college_and_degree(self, text: str) -> List[Dict[str, str]]:
+    def extract_college_and_degree(self, text: Union[str, ResumeDocument]) -> List[Dict[str, str]]:
         """
         Extract education information including college and degree details.
         
         Args:
-            text: Resume text or markdown
+            text: Resume text or markdown, or its ResumeDocument
             
         Returns:
             List of education entries with college and degree information
         """
         education_list = []
         
-        # Find education section
-        education_patterns = [
-            r'(?:###\s*)?Education\s*\n(.*?)(?:\n###|$)',
-            r'(?:###\s*)?EDUCATION\s*\n(.*?)(?:\n###|$)',
-            r'(?:###\s*)?Academic Background\s*\n(.*?)(?:\n###|$)',
-        ]
-        
-        edu_text = ""
-        for pattern in education_patterns:
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                edu_text = match.group(1).strip()
-                break
+        # Education section body from the document index
+        edu_text = _as_document(text).section('education')
         
         if not edu_text:
             return education_list
         
         lines = [line.strip() for line in edu_text.splitlines() if line.strip()]
         
-        # Comprehensive degree patterns
-        degree_patterns = [
-            r"(?i)(B\.E\.|B\.Tech|B\.Sc|B\.A\.|B\.Com|BBA|BCA)",
-            r"(?i)(M\.E\.|M\.Tech|M\.Sc|M\.A\.|M\.Com|MBA|MCA)",
-            r"(?i)(Ph\.D|PhD|Doctorate)",
-            r"(?i)(Bachelor(?:'s)?(?:\s+of)?(?:\s+\w+)*)",
-            r"(?i)(Master(?:'s)?(?:\s+of)?(?:\s+\w+)*)",
-            r"(?i)(Associate(?:'s)?(?:\s+of)?(?:\s+\w+)*)"
-        ]
-        
         for i, line in enumerate(lines):
             # Remove trailing dates
-            line_clean = re.sub(
-                r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}\s*[-–—]\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)?\s*\d{4}|\d{4}\s*[-–—]\s*\d{4}',
-                '',
-                line
-            ).strip(' -–—')
+            line_clean = DATE_RANGE_PATTERN.sub('', line).strip(' -–—')
             
             # Check for degree in this line
-            for degree_pattern in degree_patterns:
-                degree_match = re.search(degree_pattern, line_clean)
+            for degree_pattern in DEGREE_PATTERNS:
+                degree_match = degree_pattern.search(line_clean)
                 if degree_match:
                     degree = degree_match.group(1).strip()
                     
@@ -399,24 +462,27 @@ class ResumeParser:
         
         return education_list
     
-    def extract_cgpa(self, text: str) -> str:
+    def extract_cgpa(self, text: Union[str, ResumeDocument]) -> str:
         """
         Extract CGPA/GPA from resume text.
         
+        Looks only inside the education section when the resume has one,
+        and falls back to the full text otherwise.
+        
         Args:
-            text: Resume text
+            text: Resume text, or its ResumeDocument
             
         Returns:
             CGPA/GPA string if found, empty string otherwise
         """
-        patterns = [
-            r'(?:GPA|CGPA)[:\s]*([0-9]\.?[0-9]{0,2}\s*/\s*(?:10|4)\.?0?0?)',
-            r'(?:GPA|CGPA)[:\s]*([0-9]\.?[0-9]{0,2})',
-            r'([0-9]\.?[0-9]{0,2})\s*/\s*(?:10|4)\.?0?0?',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        document = _as_document(text)
+        if document.has_section('education'):
+            text = document.section('education')
+        else:
+            text = document.text
+        
+        for pattern in CGPA_PATTERNS:
+            match = pattern.search(text)
             if match:
                 cgpa = match.group(1).strip()
                 # Basic validation
@@ -432,6 +498,10 @@ class ResumeParser:
     def clean_markdown(self, markdown: str, extracted_info: Dict) -> str:
         """
         Clean markdown by removing already extracted information.
+
+        All values are removed in one pass (see Redactor), so a value found
+        inside another, such as the name in an email address, goes with
+        the longer match.
         
         Args:
             markdown: Original markdown content
@@ -440,78 +510,46 @@ class ResumeParser:
         Returns:
             Cleaned markdown content
         """
-        cleaned = markdown
+        terms = []
         
-        # Remove name
+        # Name
         if extracted_info.get("name"):
-            cleaned = re.sub(
-                rf"\b{re.escape(extracted_info['name'])}\b", 
-                "", cleaned, flags=re.IGNORECASE
-            )
+            terms.append(RedactionTerm(extracted_info["name"], ignore_case=True, whole_word=True))
         
-        # Remove email
+        # Email
         if extracted_info.get("email"):
-            cleaned = cleaned.replace(extracted_info["email"], "")
+            terms.append(RedactionTerm(extracted_info["email"]))
         
-        # Remove phone
+        # Phone, as written and with punctuation stripped
         if extracted_info.get("phone"):
-            # Remove various phone formats
-            phone_clean = re.sub(r'[\s\-\(\)\.]+', '', extracted_info["phone"])
-            cleaned = re.sub(rf"{re.escape(extracted_info['phone'])}", "", cleaned)
-            cleaned = re.sub(rf"{re.escape(phone_clean)}", "", cleaned)
-        
-        # Remove LinkedIn
-        if extracted_info.get("linkedin"):
-            cleaned = cleaned.replace(extracted_info["linkedin"], "")
-            # Also remove partial LinkedIn mentions
-            linkedin_variations = [
-                extracted_info["linkedin"].replace("https://", ""),
-                extracted_info["linkedin"].replace("https://www.", ""),
-                extracted_info["linkedin"].replace("linkedin.com/in/", "")
-            ]
-            for variation in linkedin_variations:
-                if variation:
-                    cleaned = cleaned.replace(variation, "")
-        
-        # Remove GitHub  
-        if extracted_info.get("github"):
-            cleaned = cleaned.replace(extracted_info["github"], "")
-            # Also remove partial GitHub mentions
-            github_variations = [
-                extracted_info["github"].replace("https://", ""),
-                extracted_info["github"].replace("https://www.", ""),
-                extracted_info["github"].replace("github.com/", "")
-            ]
-            for variation in github_variations:
-                if variation:
-                    cleaned = cleaned.replace(variation, "")
-        
-        # Remove education details
+            terms.append(RedactionTerm(extracted_info["phone"]))
+            terms.append(RedactionTerm(PHONE_PUNCTUATION_PATTERN.sub('', extracted_info["phone"])))
+        
+        # LinkedIn and GitHub, plus partial mentions of each
+        for field, host_path in (("linkedin", "linkedin.com/in/"), ("github", "github.com/")):
+            url = extracted_info.get(field)
+            if url:
+                for variation in (
+                    url,
+                    url.replace("https://", ""),
+                    url.replace("https://www.", ""),
+                    url.replace(host_path, ""),
+                ):
+                    terms.append(RedactionTerm(variation))
+        
+        # Education details
         for edu in extracted_info.get("education", []):
             if edu.get("college"):
-                cleaned = re.sub(
-                    rf"{re.escape(edu['college'])}", 
-                    "", cleaned, flags=re.IGNORECASE
-                )
+                terms.append(RedactionTerm(edu["college"], ignore_case=True))
             if edu.get("degree"):
-                cleaned = re.sub(
-                    rf"{re.escape(edu['degree'])}", 
-                    "", cleaned, flags=re.IGNORECASE
-                )
+                terms.append(RedactionTerm(edu["degree"], ignore_case=True))
         
-        # Remove CGPA
+        # CGPA
         if extracted_info.get("cgpa"):
-            cleaned = re.sub(
-                rf"{re.escape(extracted_info['cgpa'])}", 
-                "", cleaned, flags=re.IGNORECASE
-            )
-        
-        # Clean up extra whitespace and newlines
-        cleaned = re.sub(r'\n\s*\n\s*\n', '\n\n', cleaned)  # Max 2 consecutive newlines
-        cleaned = re.sub(r' {2,}', ' ', cleaned)  # Multiple spaces to single
-        cleaned = cleaned.strip()
+            terms.append(RedactionTerm(extracted_info["cgpa"], ignore_case=True))
         
-        return cleaned
+        # Remove everything and normalise whitespace in a single pass
+        return Redactor(terms).apply(markdown)
     
     def parse_resume(self, pdf_data: bytes) -> Dict[str, Union[str, List, Dict]]:
         """
@@ -526,50 +564,127 @@ class ResumeParser:
         try:
             # Extract text from PDF
             text = self.extract_text_from_pdf(pdf_data)
+        except Exception as e:
+            logger.error(f"Error parsing resume: {str(e)}")
+            return self._error_result(str(e))
+        
+        return self.analyse_text(text)
+    
+    def analyse_text(self, text: str) -> Dict[str, Union[str, List, Dict]]:
+        """
+        Extract structured information from already extracted resume text.
+        
+        The second half of parse_resume, for callers that report progress
+        between text extraction and field extraction.
+        
+        Args:
+            text: Text returned by extract_text_from_pdf
+            
+        Returns:
+            Dictionary containing parsed resume data
+        """
+        if not text.strip():
+            logger.warning("No text extracted from PDF")
+            return self._error_result('No text content found in PDF')
+        
+        try:
+            with span("name"):
+                name = self.extract_name(text)
+            return self._analyse_text(text, name)
+        except Exception as e:
+            logger.error(f"Error parsing resume: {str(e)}")
+            return self._error_result(str(e))
+    
+    def parse_resumes(
+        self,
+        pdfs: List[bytes],
+        batch_size: int = NAME_BATCH_SIZE,
+        n_process: int = NAME_N_PROCESS,
+    ) -> List[Dict[str, Union[str, List, Dict]]]:
+        """
+        Parse several resumes, running name extraction as one nlp.pipe batch.
+        
+        Args:
+            pdfs: PDF file contents as bytes
+            batch_size: Documents per spacy batch
+            n_process: Processes for nlp.pipe
             
+        Returns:
+            One result per PDF, in input order, shaped like parse_resume's
+        """
+        results: List[Optional[Dict]] = [None] * len(pdfs)
+        texts: Dict[int, str] = {}
+        
+        for i, pdf_data in enumerate(pdfs):
+            try:
+                text = self.extract_text_from_pdf(pdf_data)
+            except Exception as e:
+                logger.error(f"Error parsing resume: {str(e)}")
+                results[i] = self._error_result(str(e))
+                continue
             if not text.strip():
                 logger.warning("No text extracted from PDF")
-                return {
-                    'error': 'No text content found in PDF',
-                    'clean_markdown': '',
-                    'extracted_info': {}
-                }
-            
-            # Extract structured information
-            name = self.extract_name(text)
-            email = self.extract_email(text)
-            phone = self.extract_phone(text)
-            linkedin = self.extract_linkedin(text)
-            github = self.extract_github(text)
-            education = self.extract_college_and_degree(text)
-            cgpa = self.extract_cgpa(text)
-            
-            # Convert to markdown
-            markdown = self.convert_text_to_markdown(text)
-            
-            # Prepare extracted info
-            extracted_info = {
-                'name': name,
-                'email': email,
-                'phone': phone,
-                'linkedin': linkedin,
-                'github': github,
-                'education': education,
-                'cgpa': cgpa
-            }
-            
-            # Clean markdown
+                results[i] = self._error_result('No text content found in PDF')
+                continue
+            texts[i] = text
+        
+        with span("name"):
+            try:
+                names = self.extract_names(texts.values(), batch_size=batch_size, n_process=n_process)
+            except Exception as e:
+                logger.error(f"Batched name extraction failed, falling back per document: {e}")
+                names = [self.extract_name(text) for text in texts.values()]
+        
+        for (i, text), name in zip(texts.items(), names):
+            try:
+                results[i] = self._analyse_text(text, name)
+            except Exception as e:
+                logger.error(f"Error parsing resume: {str(e)}")
+                results[i] = self._error_result(str(e))
+        
+        return results
+    
+    def _analyse_text(self, text: str, name: str) -> Dict[str, Union[str, List, Dict]]:
+        """Run every extractor except the name over the extracted text."""
+        # Split into lines and index sections once for every extractor
+        with span("document"):
+            document = ResumeDocument(text)
+        
+        # Extract structured information
+        with span("contact"):
+            contact = self.extract_contact_info(text)
+        with span("education"):
+            education = self.extract_college_and_degree(document)
+            cgpa = self.extract_cgpa(document)
+        
+        # Convert to markdown
+        with span("markdown"):
+            markdown = self.convert_text_to_markdown(document)
+        
+        # Prepare extracted info
+        extracted_info = {
+            'name': name,
+            'email': contact['email'],
+            'phone': contact['phone'],
+            'linkedin': contact['linkedin'],
+            'github': contact['github'],
+            'education': education,
+            'cgpa': cgpa
+        }
+        
+        # Clean markdown
+        with span("clean"):
             clean_md = self.clean_markdown(markdown, extracted_info)
-            
-            return {
-                'clean_markdown': clean_md,
-                'extracted_info': extracted_info,
-            }
-            
-        except Exception as e:
-            logger.error(f"Error parsing resume: {str(e)}")
-            return {
-                'error': str(e),
-                'clean_markdown': '',
-                'extracted_info': {}
-            }
+        
+        return {
+            'clean_markdown': clean_md,
+            'extracted_info': extracted_info,
+        }
+    
+    @staticmethod
+    def _error_result(message: str) -> Dict[str, Union[str, List, Dict]]:
+        return {
+            'error': message,
+            'clean_markdown': '',
+            'extracted_info': {}
+        }
@@ -0,0 +1,285 @@
+# app/services/job_descriptions.py
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import inspect
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, Request
+
+from . import resonance
+from .cache import LRUCache
+from .metrics import counter
+from .optimization_cache import normalise_text
+
+logger = logging.getLogger(__name__)
+
+JOB_DESCRIPTION_DB = os.getenv("JOB_DESCRIPTION_DB", ".cache/job_descriptions.sqlite3")
+JOB_DESCRIPTION_ENTRIES = int(os.getenv("JOB_DESCRIPTION_ENTRIES", "10000"))
+JOB_DESCRIPTION_MEMORY_ENTRIES = int(os.getenv("JOB_DESCRIPTION_MEMORY_ENTRIES", "256"))
+
+REQUIREMENT_LIMIT = 20
+
+_BULLET_PATTERN = re.compile(r"^\s*(?:[-*•·▪‣◦]|\d+[.)])\s+")
+_REQUIREMENT_CUES = re.compile(
+    r"\b(?:must|required|requirements?|proficien\w*|experience (?:with|in)|knowledge of|familiar\w*"
+    r"|degree|\d+\+? years?|hands-on|expertise|understanding of|ability to)\b",
+    re.IGNORECASE,
+)
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+job_description_lookups_total = counter(
+    "job_description_lookups_total",
+    "Job description analysis lookups by tier and result",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_descriptions (
+    id TEXT PRIMARY KEY,
+    analysis TEXT NOT NULL,
+    analyser_version TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    uses INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS job_descriptions_last_used ON job_descriptions (last_used_at);
+"""
+
+
+def compute_analyser_version() -> str:
+    """Fingerprint the analysis code so stored analyses are redone when it changes"""
+    digest = hashlib.sha256()
+    for module in (resonance, sys.modules[__name__]):
+        digest.update(inspect.getsource(module).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def job_description_id(text: str) -> str:
+    """Content ID of a posting; copies differing only in whitespace or Unicode form share it."""
+    return hashlib.sha256(normalise_text(text).encode("utf-8")).hexdigest()[:24]
+
+
+def clean_text(text: str) -> str:
+    """Collapse whitespace within lines and drop blank and repeated lines, keeping line structure."""
+    seen = set()
+    lines = []
+    for line in text.splitlines():
+        line = normalise_text(line)
+        if line and line not in seen:
+            seen.add(line)
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def extract_requirements(text: str, limit: int = REQUIREMENT_LIMIT) -> List[str]:
+    """Bulleted lines and sentences that state a requirement, in posting order."""
+    requirements = []
+    for line in text.splitlines():
+        if line.rstrip().endswith(":"):
+            continue  # a heading such as "Requirements:"
+        if _BULLET_PATTERN.match(line):
+            candidates = [_BULLET_PATTERN.sub("", line)]
+        else:
+            candidates = [s for s in _SENTENCE_PATTERN.split(line) if _REQUIREMENT_CUES.search(s)]
+        for candidate in candidates:
+            candidate = candidate.strip()
+            if len(candidate) > 3 and candidate not in requirements:
+                requirements.append(candidate)
+                if len(requirements) == limit:
+                    return requirements
+    return requirements
+
+
+def analyse_job_description(text: str) -> Dict:
+    """
+    Everything the scoring and prompt paths need from a posting, computed once.
+
+    Keywords, requirements and tokens come from clean_text(text); the
+    text itself is kept as the user wrote it, since that is what the
+    prompts embed.
+
+    Returns:
+        {"id", "text", "keywords", "requirements", "terms", "segments"
+        (resonance.job_terms)}
+    """
+    cleaned = clean_text(text)
+    job = resonance.job_terms(cleaned)
+    return {
+        "id": job_description_id(text),
+        "text": text,
+        "keywords": resonance.top_keywords(job, limit=25),
+        "requirements": extract_requirements(cleaned),
+        "terms": list(job.terms),
+        "segments": [list(segment) for segment in job.segments],
+    }
+
+
+def job_terms_of(analysis: Dict) -> resonance.JobTerms:
+    """The stored tokens of an analysis as resonance.JobTerms"""
+    return resonance.JobTerms(
+        tuple(analysis["terms"]), tuple(tuple(segment) for segment in analysis["segments"])
+    )
+
+
+def public_view(analysis: Dict) -> Dict:
+    """The analysis without the token lists"""
+    return {key: analysis[key] for key in ("id", "keywords", "requirements")}
+
+
+class JobDescriptionStore:
+    """
+    Analyses of job postings, keyed by content ID, in SQLite behind an in-memory LRU.
+
+    Postings are stored when a client asks for an ID (ingest), so later
+    requests can refer to them instead of resending the text. Postings
+    sent with a request are only analysed (analyse): a stored analysis is
+    reused, otherwise the result is kept in a memory-only LRU, so popular
+    postings pasted by many users are still analysed once without every
+    request writing to disk. Rows written by another analyser version are
+    re-analysed from their stored text on read. The least recently used
+    rows beyond max_entries are deleted. Methods block on SQLite; call
+    them from a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str = JOB_DESCRIPTION_DB,
+        max_entries: int = JOB_DESCRIPTION_ENTRIES,
+        memory_entries: int = JOB_DESCRIPTION_MEMORY_ENTRIES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.analyser_version = compute_analyser_version()
+        self.memory = LRUCache(memory_entries)
+        # Analyses of postings nobody asked to store; not reachable by ID
+        self.unsaved = LRUCache(memory_entries)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.executescript(_SCHEMA)
+        logger.info(f"Job description store ready at {path} (analyser version {self.analyser_version})")
+
+    def ingest(self, text: str) -> Dict:
+        """Return the analysis of text, computing and storing it on first sight."""
+        analysis = self.get(job_description_id(text))
+        if analysis is None:
+            analysis = self.unsaved.get(job_description_id(text)) or analyse_job_description(text)
+            self._save(analysis)
+        return analysis
+
+    def analyse(self, text: str) -> Dict:
+        """Return the analysis of text, reusing a stored one, without storing it."""
+        jd_id = job_description_id(text)
+        analysis = self.get(jd_id)
+        if analysis is not None:
+            return analysis
+        analysis = self.unsaved.get(jd_id)
+        if analysis is not None:
+            job_description_lookups_total.inc(tier="unsaved", result="hit")
+            return analysis
+        job_description_lookups_total.inc(tier="unsaved", result="miss")
+        analysis = analyse_job_description(text)
+        self.unsaved.set(jd_id, analysis)
+        return analysis
+
+    def get(self, jd_id: str) -> Optional[Dict]:
+        analysis = self.memory.get(jd_id)
+        if analysis is not None:
+            job_description_lookups_total.inc(tier="memory", result="hit")
+            return analysis
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT analysis, analyser_version FROM job_descriptions WHERE id = ?", (jd_id,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE job_descriptions SET last_used_at = ?, uses = uses + 1 WHERE id = ?",
+                    (time.time(), jd_id),
+                )
+                self._db.commit()
+        if row is None:
+            job_description_lookups_total.inc(tier="sqlite", result="miss")
+            return None
+
+        analysis = json.loads(row[0])
+        if row[1] != self.analyser_version:
+            job_description_lookups_total.inc(tier="sqlite", result="stale")
+            analysis = analyse_job_description(analysis["text"])
+            analysis["id"] = jd_id
+            self._save(analysis)
+        else:
+            job_description_lookups_total.inc(tier="sqlite", result="hit")
+            self.memory.set(jd_id, analysis)
+        return analysis
+
+    def _save(self, analysis: Dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO job_descriptions (id, analysis, analyser_version, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+                "analysis = excluded.analysis, analyser_version = excluded.analyser_version, "
+                "last_used_at = excluded.last_used_at",
+                (analysis["id"], json.dumps(analysis, ensure_ascii=False), self.analyser_version, now, now),
+            )
+            self._db.execute(
+                "DELETE FROM job_descriptions WHERE id NOT IN "
+                "(SELECT id FROM job_descriptions ORDER BY last_used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+        self.memory.set(analysis["id"], analysis)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM job_descriptions").fetchone()
+        return {
+            "entries": entries,
+            "memory_entries": len(self.memory),
+            "unsaved_entries": len(self.unsaved),
+            "analyser_version": self.analyser_version,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+async def resolve_job_description(
+    store: "JobDescriptionStore",
+    job_description: Optional[str],
+    job_description_id: Optional[str],
+) -> Dict:
+    """
+    The analysis for a request that sends either the posting text or its ID.
+
+    Text is analysed but not stored; POST /job-descriptions stores it.
+
+    Raises:
+        HTTPException: 400 if neither was sent, 404 if the ID is unknown
+    """
+    if job_description:
+        return await asyncio.to_thread(store.analyse, job_description)
+    if job_description_id:
+        analysis = await asyncio.to_thread(store.get, job_description_id)
+        if analysis is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job description: {job_description_id}")
+        return analysis
+    raise HTTPException(status_code=400, detail="Send job_description or job_description_id")
+
+
+def get_job_descriptions(request: Request) -> JobDescriptionStore:
+    """FastAPI dependency returning the store created in the app lifespan"""
+    if not hasattr(request.app.state, "job_descriptions"):
+        raise HTTPException(status_code=503, detail="Job description store is not ready")
+    return request.app.state.job_descriptions
@@ -0,0 +1,532 @@
+# app/services/job_queue.py
+import os
+import json
+import time
+import uuid
+import random
+import socket
+import asyncio
+import logging
+import sqlite3
+import ipaddress
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from fastapi import HTTPException, Request
+
+from .ai_dispatcher import BATCH, set_ai_caller
+from .metrics import counter, gauge, histogram
+from .optimization_cache import OptimizationCache, has_content
+from .optimization_planner import optimize
+from .resume_parser import AI_MODEL
+
+logger = logging.getLogger(__name__)
+
+OPTIMIZE_JOB_DB = os.getenv("OPTIMIZE_JOB_DB", ".cache/optimize_jobs.sqlite3")
+OPTIMIZE_JOB_WORKERS = int(os.getenv("OPTIMIZE_JOB_WORKERS", "4"))
+OPTIMIZE_JOB_MAX_ATTEMPTS = int(os.getenv("OPTIMIZE_JOB_MAX_ATTEMPTS", "4"))
+# Retry n waits a random 50-100% of min(base * 2**(n-1), max)
+OPTIMIZE_JOB_BACKOFF_SECONDS = float(os.getenv("OPTIMIZE_JOB_BACKOFF_SECONDS", "2"))
+OPTIMIZE_JOB_BACKOFF_MAX_SECONDS = float(os.getenv("OPTIMIZE_JOB_BACKOFF_MAX_SECONDS", "60"))
+OPTIMIZE_JOB_RETENTION_SECONDS = float(os.getenv("OPTIMIZE_JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+# Longest an idle worker sleeps before looking for due retries
+OPTIMIZE_JOB_POLL_SECONDS = float(os.getenv("OPTIMIZE_JOB_POLL_SECONDS", "1"))
+# Jobs waiting or running at once, in total and per user; 0 disables a limit
+OPTIMIZE_JOB_MAX_QUEUED = int(os.getenv("OPTIMIZE_JOB_MAX_QUEUED", "1000"))
+OPTIMIZE_JOB_MAX_QUEUED_PER_USER = int(os.getenv("OPTIMIZE_JOB_MAX_QUEUED_PER_USER", "20"))
+# Comma-separated hosts webhooks may be sent to; empty allows any https host
+# that resolves to public addresses only. Listed hosts may resolve to any address.
+OPTIMIZE_WEBHOOK_HOSTS = [h.strip() for h in os.getenv("OPTIMIZE_WEBHOOK_HOSTS", "").split(",") if h.strip()]
+WEBHOOK_TIMEOUT_SECONDS = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "10"))
+
+_LATENCY_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+optimize_jobs_queued = gauge(
+    "optimize_jobs_queued",
+    "Optimization jobs waiting to run, including retries in backoff",
+)
+optimize_jobs_running = gauge(
+    "optimize_jobs_running",
+    "Optimization jobs being run by a worker",
+)
+optimize_job_wait_seconds = histogram(
+    "optimize_job_wait_seconds",
+    "Time from submitting an optimization job to its first run",
+    buckets=_LATENCY_BUCKETS,
+)
+optimize_job_seconds = histogram(
+    "optimize_job_seconds",
+    "Time from submitting an optimization job to its final status, by status",
+    buckets=_LATENCY_BUCKETS,
+)
+optimize_job_attempts_total = counter(
+    "optimize_job_attempts_total",
+    "Optimization job attempts by outcome (succeeded, retry, failed)",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS optimize_jobs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    failed_sections TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    webhook_url TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    run_after REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS optimize_jobs_due ON optimize_jobs (status, run_after);
+"""
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue or the user already has the maximum number of unfinished jobs."""
+
+
+class JobStore:
+    """
+    SQLite persistence for optimization jobs.
+
+    Every state change is committed before it takes effect, so queued and
+    interrupted jobs survive a restart. Methods block; call them from a
+    worker thread.
+    """
+
+    def __init__(self, path: str = OPTIMIZE_JOB_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.executescript(_SCHEMA)
+
+    def create(self, job: Dict, max_unfinished: int = 0, max_unfinished_per_user: int = 0) -> None:
+        """
+        Insert a job; the limits (0 for none) count queued and running jobs.
+
+        Raises:
+            JobQueueFull: If a queued job would go over a limit
+        """
+        columns = ", ".join(job)
+        with self._lock:
+            if job["status"] == QUEUED:
+                self._check_limits(job["user_id"], max_unfinished, max_unfinished_per_user)
+            self._db.execute(
+                f"INSERT INTO optimize_jobs ({columns}) VALUES ({', '.join('?' * len(job))})", tuple(job.values())
+            )
+            self._db.commit()
+
+    def _check_limits(self, user_id: str, max_unfinished: int, max_unfinished_per_user: int) -> None:
+        unfinished = "SELECT COUNT(*) FROM optimize_jobs WHERE status IN (?, ?)"
+        if max_unfinished:
+            (count,) = self._db.execute(unfinished, (QUEUED, RUNNING)).fetchone()
+            if count >= max_unfinished:
+                raise JobQueueFull(f"{count} optimization jobs already unfinished")
+        if max_unfinished_per_user:
+            (count,) = self._db.execute(unfinished + " AND user_id = ?", (QUEUED, RUNNING, user_id)).fetchone()
+            if count >= max_unfinished_per_user:
+                raise JobQueueFull(f"User already has {count} unfinished optimization jobs")
+
+    def claim(self, now: float) -> Optional[Dict]:
+        """Mark the next due queued job running and return it."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM optimize_jobs WHERE status = ? AND run_after <= ? ORDER BY run_after, created_at LIMIT 1",
+                (QUEUED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE optimize_jobs SET status = ?, attempts = attempts + 1, "
+                "started_at = COALESCE(started_at, ?), updated_at = ? WHERE id = ?",
+                (RUNNING, now, now, row["id"]),
+            )
+            self._db.commit()
+        return {
+            **dict(row),
+            "status": RUNNING,
+            "attempts": row["attempts"] + 1,
+            "started_at": row["started_at"] or now,
+        }
+
+    def update(self, job_id: str, **fields) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE optimize_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+            )
+            self._db.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM optimize_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def requeue_running(self, now: float) -> int:
+        """Put jobs a previous process was running back in the queue."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE optimize_jobs SET status = ?, run_after = ?, updated_at = ? WHERE status = ?",
+                (QUEUED, now, now, RUNNING),
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def count(self, status: str) -> int:
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM optimize_jobs WHERE status = ?", (status,)
+            ).fetchone()
+        return count
+
+    def purge_finished(self, before: float) -> int:
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM optimize_jobs WHERE status IN (?, ?) AND finished_at < ?", (SUCCEEDED, FAILED, before)
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def job_view(job: Dict) -> Dict:
+    """The status/result body of a job"""
+    view = {
+        "id": job["id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "finished_at": job["finished_at"],
+    }
+    if job["status"] == SUCCEEDED:
+        view["result"] = json.loads(job["result"])
+        view["failed"] = json.loads(job["failed_sections"] or "[]")
+    if job["error"]:
+        view["error"] = job["error"]
+    return view
+
+
+def backoff_seconds(attempt: int) -> float:
+    """Delay before retrying after the given failed attempt (1-based), with jitter"""
+    delay = min(OPTIMIZE_JOB_BACKOFF_SECONDS * 2 ** (attempt - 1), OPTIMIZE_JOB_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    # is_global excludes loopback, private, link-local (cloud metadata), shared and reserved ranges
+    return ip.is_global and not ip.is_multicast
+
+
+async def resolve_webhook_url(url: str) -> Optional[str]:
+    """
+    Check a webhook URL and resolve its host.
+
+    The host must be in OPTIMIZE_WEBHOOK_HOSTS if that is set. Otherwise
+    every address it resolves to must be public, so a webhook cannot be
+    aimed at the service's own network (localhost, 10.x, the cloud
+    metadata endpoint, ...). The check is on the resolved addresses, not
+    the name, so names pointing inside are refused too.
+
+    Returns:
+        The address to connect to, or None for an allowed host (connect by name)
+
+    Raises:
+        HTTPException: 400 if the URL is not allowed
+    """
+    parsed = urlparse(url)
+    if parsed.scheme != "https" or not parsed.hostname or parsed.username or parsed.password:
+        raise HTTPException(status_code=400, detail="webhook_url must be an https URL")
+    if OPTIMIZE_WEBHOOK_HOSTS:
+        if parsed.hostname not in OPTIMIZE_WEBHOOK_HOSTS:
+            raise HTTPException(status_code=400, detail=f"webhook_url host {parsed.hostname} is not allowed")
+        return None
+    try:
+        port = parsed.port or 443
+        infos = await asyncio.to_thread(socket.getaddrinfo, parsed.hostname, port, type=socket.SOCK_STREAM)
+    except (OSError, ValueError):
+        raise HTTPException(status_code=400, detail=f"webhook_url host {parsed.hostname} cannot be resolved")
+    addresses = [info[4][0] for info in infos]
+    if not addresses or not all(_is_public(address) for address in addresses):
+        raise HTTPException(
+            status_code=400, detail=f"webhook_url host {parsed.hostname} is not a public address"
+        )
+    return addresses[0]
+
+
+async def validate_webhook_url(url: str) -> str:
+    """
+    Raises:
+        HTTPException: 400 unless url is https and an allowed host (see
+            resolve_webhook_url)
+    """
+    await resolve_webhook_url(url)
+    return url
+
+
+def _pinned_request(url: str, address: Optional[str]) -> Tuple[str, Dict, Dict]:
+    # (url, headers, extensions) that reach the checked address, with TLS still verified for the name
+    if address is None:
+        return url, {}, {}
+    parsed = urlparse(url)
+    host = f"[{address}]" if ":" in address else address
+    netloc = f"{host}:{parsed.port}" if parsed.port else host
+    return (
+        parsed._replace(netloc=netloc).geturl(),
+        {"Host": parsed.netloc},
+        {"sni_hostname": parsed.hostname},
+    )
+
+
+class OptimizationJobQueue:
+    """
+    In-process queue of optimization jobs with a pool of async workers.
+
+    submit() persists a job and returns at once; OPTIMIZE_JOB_WORKERS
+    workers on the event loop run due jobs through the optimization
+    planner. A job whose call raised, timed out, came back empty or left
+    sections unoptimized is retried with jittered exponential backoff up
+    to OPTIMIZE_JOB_MAX_ATTEMPTS; on the last attempt a partial result is
+    still accepted. Jobs interrupted by a restart run again. A user may
+    have OPTIMIZE_JOB_MAX_QUEUED_PER_USER unfinished jobs, and the queue
+    OPTIMIZE_JOB_MAX_QUEUED. When a job reaches its final status its
+    webhook, if any, is POSTed the job view from a background task; the
+    URL is checked again before sending, and the request goes to the
+    address that passed the check.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        optimization_cache: Optional[OptimizationCache] = None,
+        workers: int = OPTIMIZE_JOB_WORKERS,
+        max_attempts: int = OPTIMIZE_JOB_MAX_ATTEMPTS,
+        max_queued: int = OPTIMIZE_JOB_MAX_QUEUED,
+        max_queued_per_user: int = OPTIMIZE_JOB_MAX_QUEUED_PER_USER,
+    ):
+        self.store = store
+        self.optimization_cache = optimization_cache
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.max_queued = max_queued
+        self.max_queued_per_user = max_queued_per_user
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._webhooks: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        now = time.time()
+        requeued = await asyncio.to_thread(self.store.requeue_running, now)
+        purged = await asyncio.to_thread(self.store.purge_finished, now - OPTIMIZE_JOB_RETENTION_SECONDS)
+        optimize_jobs_queued.set(await asyncio.to_thread(self.store.count, QUEUED))
+        optimize_jobs_running.set(0)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        logger.info(
+            f"Optimization job queue started: {self.workers} worker(s), "
+            f"{int(optimize_jobs_queued.value())} queued ({requeued} interrupted), {purged} old job(s) removed"
+        )
+
+    async def stop(self) -> None:
+        tasks = [*self._tasks, *self._webhooks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+
+    async def submit(
+        self,
+        user_id: str,
+        payload: Dict,
+        webhook_url: Optional[str] = None,
+        result: Optional[Dict] = None,
+    ) -> Dict:
+        """
+        Queue a job; payload is {"resume_data", "job_description", "additional_info"}.
+
+        A known result (e.g. from the optimization cache) creates the job
+        already succeeded.
+
+        Raises:
+            JobQueueFull: If the user or the queue has too many unfinished jobs
+        """
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "status": QUEUED if result is None else SUCCEEDED,
+            "payload": json.dumps(payload, ensure_ascii=False),
+            "result": None if result is None else json.dumps(result, ensure_ascii=False),
+            "webhook_url": webhook_url,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None if result is None else now,
+            "run_after": now,
+        }
+        await asyncio.to_thread(self.store.create, job, self.max_queued, self.max_queued_per_user)
+        if result is None:
+            optimize_jobs_queued.inc()
+            self._wakeup.set()
+        else:
+            self._notify_later(job["id"])
+        return job_view({**job, "attempts": 0, "error": None, "failed_sections": None})
+
+    async def get(self, job_id: str, user_id: str) -> Optional[Dict]:
+        """The job's view, or None if there is no such job for this user."""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job["user_id"] != user_id:
+            return None
+        return job_view(job)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "queued": int(optimize_jobs_queued.value()),
+            "running": int(optimize_jobs_running.value()),
+        }
+
+    async def _work(self) -> None:
+        while True:
+            # Clear before looking, so a submit during the lookup still wakes us
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self.store.claim, time.time())
+            except Exception as e:
+                logger.error(f"Could not claim an optimization job: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), OPTIMIZE_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            optimize_jobs_queued.dec()
+            optimize_jobs_running.inc()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Optimization job {job['id']} crashed the worker step: {e}")
+                try:
+                    await self._finish(job, FAILED, error="Internal error while running the job")
+                except Exception as e:
+                    logger.error(f"Could not mark optimization job {job['id']} failed: {e}")
+            finally:
+                optimize_jobs_running.dec()
+
+    async def _run(self, job: Dict) -> None:
+        if job["attempts"] == 1:
+            optimize_job_wait_seconds.observe(job["started_at"] - job["created_at"])
+        payload = json.loads(job["payload"])
+        # Nobody is waiting on the response, so interactive requests go first
+        set_ai_caller(job["user_id"], BATCH)
+        last_attempt = job["attempts"] >= self.max_attempts
+
+        outcome, error = None, None
+        try:
+            outcome = await optimize(
+                ai_data=payload["resume_data"],
+                job_description=payload["job_description"],
+                additional_info=payload.get("additional_info"),
+            )
+        except (asyncio.TimeoutError, TimeoutError):
+            error = "AI optimization timed out"
+        except Exception as e:
+            error = f"AI optimization failed: {str(e)}"
+
+        if outcome is not None and not has_content(outcome.result):
+            outcome, error = None, "AI optimization returned no result"
+        if outcome is not None and (outcome.complete or last_attempt):
+            await self._finish(job, SUCCEEDED, result=outcome.result, failed=outcome.failed)
+            if outcome.complete and self.optimization_cache is not None:
+                cache_key = self.optimization_cache.key(
+                    payload["resume_data"], payload["job_description"], payload.get("additional_info"), AI_MODEL
+                )
+                await asyncio.to_thread(self.optimization_cache.put, cache_key, outcome.result)
+            return
+        if outcome is not None:
+            error = f"Sections not optimized: {', '.join(outcome.failed)}"
+        if last_attempt:
+            await self._finish(job, FAILED, error=error)
+            return
+
+        delay = backoff_seconds(job["attempts"])
+        optimize_job_attempts_total.inc(outcome="retry")
+        logger.info(f"Optimization job {job['id']} attempt {job['attempts']} failed ({error}), retrying in {delay:.1f}s")
+        now = time.time()
+        await asyncio.to_thread(
+            self.store.update, job["id"], status=QUEUED, error=error, run_after=now + delay, updated_at=now
+        )
+        optimize_jobs_queued.inc()
+
+    async def _finish(
+        self,
+        job: Dict,
+        status: str,
+        result: Optional[Dict] = None,
+        failed: Optional[List[str]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        now = time.time()
+        await asyncio.to_thread(
+            self.store.update,
+            job["id"],
+            status=status,
+            result=None if result is None else json.dumps(result, ensure_ascii=False),
+            failed_sections=json.dumps(failed or []),
+            error=error,
+            updated_at=now,
+            finished_at=now,
+        )
+        optimize_job_attempts_total.inc(outcome=status)
+        optimize_job_seconds.observe(now - job["created_at"], status=status)
+        self._notify_later(job["id"])
+
+    def _notify_later(self, job_id: str) -> None:
+        # Neither the submitter nor a worker waits on someone else's server
+        task = asyncio.create_task(self._notify(job_id))
+        self._webhooks.add(task)
+        task.add_done_callback(self._webhooks.discard)
+
+    async def _notify(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or not job["webhook_url"]:
+            return
+        try:
+            # Checked again: the name may resolve elsewhere than at submit time
+            address = await resolve_webhook_url(job["webhook_url"])
+            url, headers, extensions = _pinned_request(job["webhook_url"], address)
+            async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT_SECONDS) as client:
+                response = await client.post(url, json=job_view(job), headers=headers, extensions=extensions)
+                response.raise_for_status()
+        except HTTPException as e:
+            logger.warning(f"Webhook for optimization job {job_id} not sent: {e.detail}")
+        except Exception as e:
+            # Best effort: the result stays available from the status endpoint
+            logger.warning(f"Webhook for optimization job {job_id} failed: {e}")
+
+
+def get_job_queue(request: Request) -> OptimizationJobQueue:
+    """FastAPI dependency returning the queue started in the app lifespan"""
+    if not hasattr(request.app.state, "job_queue"):
+        raise HTTPException(status_code=503, detail="Optimization job queue is not ready")
+    return request.app.state.job_queue
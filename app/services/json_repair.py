@@ -0,0 +1,239 @@
+# app/services/json_repair.py
+import re
+import json
+from typing import Any, Optional, Tuple
+
+_NUMBER_PATTERN = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_STRING_STOP_PATTERN = re.compile(r'["\\]')
+_BAREWORD_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_\-]*')
+_INVALID_ESCAPE_PATTERN = re.compile(r'\\(?!["\\/bfnrtu])')
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+_WHITESPACE = " \t\r\n"
+# A quote followed by one of these ends the string; any other quote is taken as part of it
+_STRING_END_FOLLOWERS = ',:}]'
+
+
+class _Truncated(Exception):
+    """The input ended inside a value."""
+
+
+class TolerantJsonParser:
+    """
+    Single-pass parser for the almost-JSON that language models return.
+
+    Reads the text once, left to right, and repairs as it goes:
+
+    - leading prose or code fences before the first '{' or '[' are skipped
+    - trailing and doubled commas are ignored; a missing comma between
+      members or elements is tolerated
+    - a '"' inside a string ends it when followed by , : } ] or the end of
+      input, or by another string that is a key or element (a missing
+      comma); any other '"' is kept as a literal quote (unescaped quotes
+      in model prose)
+    - raw newlines and tabs inside strings are accepted
+    - bare keys and True/False/None literals are accepted
+
+    When the input is truncated, every value that was complete is kept:
+    an array keeps its complete elements (an object cut off half way is
+    dropped), and an object keeps its complete members, plus arrays and
+    objects that were cut off, with whatever they salvaged.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def parse(self) -> Optional[Any]:
+        """Return the repaired value, or None if no object or array was found."""
+        starts = [i for i in (self.text.find("{"), self.text.find("[")) if i != -1]
+        if not starts:
+            return None
+        self.pos = min(starts)
+        value, _ = self._value()
+        return value
+
+    def _skip_whitespace(self) -> None:
+        text, pos = self.text, self.pos
+        while pos < len(text) and text[pos] in _WHITESPACE:
+            pos += 1
+        self.pos = pos
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        if self.pos >= len(self.text):
+            raise _Truncated()
+        return self.text[self.pos]
+
+    def _value(self) -> Tuple[Any, bool]:
+        """Parse one value; returns (value, complete)."""
+        char = self._peek()
+        if char == "{":
+            return self._object()
+        if char == "[":
+            return self._array()
+        if char == '"':
+            return self._string(), True
+        match = _NUMBER_PATTERN.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            if self.pos >= len(self.text):
+                raise _Truncated()  # digits may have been cut off
+            return json.loads(match.group()), True
+        match = _BAREWORD_PATTERN.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            word = match.group()
+            if word in _LITERALS:
+                return _LITERALS[word], True
+            return word, True
+        raise ValueError(f"Unexpected character {char!r} at {self.pos}")
+
+    def _object(self) -> Tuple[dict, bool]:
+        result: dict = {}
+        self.pos += 1  # '{'
+        while True:
+            try:
+                char = self._peek()
+            except _Truncated:
+                return result, False
+            if char == "}":
+                self.pos += 1
+                return result, True
+            if char == ",":
+                self.pos += 1
+                continue
+            if char == "]":
+                # Mismatched closer: treat as the end of this object
+                self.pos += 1
+                return result, True
+
+            try:
+                key = self._string() if char == '"' else self._bareword_key()
+                if self._peek() == ":":
+                    self.pos += 1
+                value, complete = self._value()
+            except _Truncated:
+                return result, False
+            except ValueError:
+                self._skip_past_member()
+                continue
+
+            if complete or isinstance(value, (dict, list)):
+                result[key] = value
+            if not complete:
+                return result, False
+
+    def _array(self) -> Tuple[list, bool]:
+        result: list = []
+        self.pos += 1  # '['
+        while True:
+            try:
+                char = self._peek()
+            except _Truncated:
+                return result, False
+            if char == "]":
+                self.pos += 1
+                return result, True
+            if char == ",":
+                self.pos += 1
+                continue
+            if char == "}":
+                self.pos += 1
+                return result, True
+
+            try:
+                value, complete = self._value()
+            except _Truncated:
+                return result, False
+            except ValueError:
+                self._skip_past_member()
+                continue
+            if not complete:
+                # An element cut off half way is dropped, not half-kept
+                return result, False
+            result.append(value)
+
+    def _bareword_key(self) -> str:
+        match = _BAREWORD_PATTERN.match(self.text, self.pos)
+        if not match:
+            raise ValueError(f"Expected a key at {self.pos}")
+        self.pos = match.end()
+        return match.group()
+
+    def _string(self) -> str:
+        text = self.text
+        start = self.pos + 1
+        pos = start
+        parts = []
+        while True:
+            match = _STRING_STOP_PATTERN.search(text, pos)
+            if match is None:
+                raise _Truncated()
+            stop = match.start()
+            if text[stop] == "\\":
+                if stop + 1 >= len(text):
+                    raise _Truncated()
+                pos = stop + 2
+                continue
+
+            # A quote: does it end the string?
+            after = stop + 1
+            while after < len(text) and text[after] in _WHITESPACE:
+                after += 1
+            if after >= len(text) or text[after] in _STRING_END_FOLLOWERS or self._next_member(after):
+                parts.append(text[start:stop])
+                self.pos = stop + 1
+                return self._decode("".join(parts))
+            # Unescaped quote inside the string
+            parts.append(text[start:stop] + '\\"')
+            start = pos = stop + 1
+
+    def _next_member(self, pos: int) -> bool:
+        """Whether a complete string at pos is followed by , : } ] (a member the comma was left out before)."""
+        text = self.text
+        if text[pos] != '"':
+            return False
+        search = pos + 1
+        while True:
+            match = _STRING_STOP_PATTERN.search(text, search)
+            if match is None:
+                return False
+            if text[match.start()] == '"':
+                break
+            search = match.start() + 2
+        after = match.end()
+        while after < len(text) and text[after] in _WHITESPACE:
+            after += 1
+        return after < len(text) and text[after] in _STRING_END_FOLLOWERS
+
+    @staticmethod
+    def _decode(raw: str) -> str:
+        raw = raw.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+        try:
+            return json.loads(f'"{raw}"')
+        except ValueError:
+            pass
+        # Invalid escape sequences (e.g. "C:\dir"): keep the backslash literally
+        try:
+            return json.loads('"' + _INVALID_ESCAPE_PATTERN.sub(r'\\\\', raw) + '"')
+        except ValueError:
+            return raw
+
+    def _skip_past_member(self) -> None:
+        """Skip an unparseable member up to the next ',' or closer at this level."""
+        text = self.text
+        while self.pos < len(text) and text[self.pos] not in ',}]':
+            self.pos += 1
+
+
+def repair_json(text: str) -> Optional[Any]:
+    """
+    Parse model output into JSON values, repairing it where needed.
+
+    Args:
+        text: Raw model response (may include fences, prose, or be truncated)
+
+    Returns:
+        The outermost object or array, or None if there is none
+    """
+    return TolerantJsonParser(text).parse()
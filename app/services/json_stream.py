@@ -0,0 +1,129 @@
+# app/services/json_stream.py
+import json
+import logging
+from typing import Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+
+
+class JsonArrayItemStream:
+    """
+    Incremental parser for the elements of top-level arrays in a JSON object.
+
+    Feed it the model output chunk by chunk; every time an element of one
+    of the watched arrays (e.g. {"projects": [...]}) is complete, feed()
+    returns it as (key, index, value). Text before the first '{' (such as
+    a ```json fence) is skipped. Each character is scanned once, tracking
+    only nesting depth, string/escape state and the current key, so
+    partial elements cost nothing until they close. Elements that are not
+    valid JSON on their own are skipped; the caller still parses the full
+    text at the end.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = set(keys)
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None   # last string seen at object level
+        self._pending_key: Optional[str] = None  # key whose value comes next
+        self._array_key: Optional[str] = None   # watched array we are inside
+        self._item_start: Optional[int] = None
+        self._counts = {key: 0 for key in self.keys}
+
+    def feed(self, chunk: str) -> List[Tuple[str, int, Any]]:
+        """Consume a chunk; return the array elements it completed, in order."""
+        self._buffer += chunk
+        items: List[Tuple[str, int, Any]] = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer):
+            char = buffer[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = buffer[self._string_start + 1:i]
+                i += 1
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                i += 1
+                continue
+
+            in_array = self._array_key is not None and self._depth == 2
+
+            if char == '"':
+                if in_array and self._item_start is None:
+                    self._item_start = i
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                if in_array and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._pending_key in self.keys:
+                    self._array_key = self._pending_key
+                self._pending_key = None
+            elif char in "}]":
+                if in_array and char == "]":
+                    # The watched array closes; flush a trailing scalar element
+                    self._emit(buffer, i, items)
+                    self._array_key = None
+                self._depth -= 1
+                if self._depth == 2 and self._array_key is not None and self._item_start is not None:
+                    self._emit(buffer, i + 1, items)
+            elif char == ",":
+                if in_array:
+                    self._emit(buffer, i, items)
+            elif char == ":":
+                if self._depth == 1:
+                    self._pending_key = self._last_key
+            elif char not in _WHITESPACE:
+                if in_array and self._item_start is None:
+                    self._item_start = i
+            i += 1
+
+        # Drop text that no open element or key can refer to any more
+        keep_from = min(
+            i,
+            self._item_start if self._item_start is not None else i,
+            self._string_start if self._in_string else i,
+        )
+        self._buffer = buffer[keep_from:]
+        if self._item_start is not None:
+            self._item_start -= keep_from
+        if self._in_string:
+            self._string_start -= keep_from
+        self._pos = i - keep_from
+        return items
+
+    def _emit(self, buffer: str, end: int, items: List[Tuple[str, int, Any]]) -> None:
+        if self._item_start is None:
+            return
+        raw = buffer[self._item_start:end].strip()
+        self._item_start = None
+        if not raw:
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            logger.debug(f"Skipping incomplete {self._array_key} element: {raw[:80]}")
+            return
+        key = self._array_key
+        items.append((key, self._counts[key], value))
+        self._counts[key] += 1
+
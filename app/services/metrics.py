@@ -0,0 +1,179 @@
+# app/services/metrics.py
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def snapshot(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge:
+    """Value that can go up and down (queue depth, in-flight work), optionally split by labels."""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def snapshot(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    def __init__(self, name: str, description: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets: List[float] = sorted(buckets)
+        self._series: Dict[LabelKey, Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0, "max": 0.0}
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+            series["max"] = max(series["max"], value)
+
+    def snapshot(self) -> Dict[LabelKey, Dict]:
+        with self._lock:
+            return {
+                key: {**series, "counts": list(series["counts"])}
+                for key, series in self._series.items()
+            }
+
+    def summary(self, **labels: str) -> Dict[str, float]:
+        """Return count/sum/mean/max for one label set."""
+        series = self.snapshot().get(_label_key(labels))
+        if not series or not series["count"]:
+            return {"count": 0, "sum": 0.0, "mean": 0.0, "max": 0.0}
+        return {
+            "count": series["count"],
+            "sum": series["sum"],
+            "mean": series["sum"] / series["count"],
+            "max": series["max"],
+        }
+
+
+_registry: Dict[str, object] = {}
+_registry_lock = threading.Lock()
+
+
+def counter(name: str, description: str) -> Counter:
+    """Get or create a process-wide counter."""
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = Counter(name, description)
+        return metric  # type: ignore[return-value]
+
+
+def gauge(name: str, description: str) -> Gauge:
+    """Get or create a process-wide gauge."""
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = Gauge(name, description)
+        return metric  # type: ignore[return-value]
+
+
+def histogram(name: str, description: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Get or create a process-wide histogram."""
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = Histogram(name, description, buckets)
+        return metric  # type: ignore[return-value]
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render_prometheus() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda metric: metric.name)
+
+    lines: List[str] = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        if isinstance(metric, (Counter, Gauge)):
+            lines.append(f"# TYPE {metric.name} {'counter' if isinstance(metric, Counter) else 'gauge'}")
+            for key, value in sorted(metric.snapshot().items()):
+                lines.append(f"{metric.name}{_format_labels(key)} {_format_value(value)}")
+        elif isinstance(metric, Histogram):
+            lines.append(f"# TYPE {metric.name} histogram")
+            for key, series in sorted(metric.snapshot().items()):
+                for bound, count in zip(metric.buckets, series["counts"]):
+                    labels = _format_labels(key, (("le", _format_value(bound)),))
+                    lines.append(f"{metric.name}_bucket{labels} {count}")
+                lines.append(f"{metric.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {series['count']}")
+                lines.append(f"{metric.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+                lines.append(f"{metric.name}_count{_format_labels(key)} {series['count']}")
+    return "\n".join(lines) + "\n"
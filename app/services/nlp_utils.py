@@ -1,29 +1,22 @@
 # app/services/nlp_utils.py
-import nltk
-import spacy
+import logging
+from functools import lru_cache
 
-def setup_nlp():
-    # Force only valid resources
-    required_resources = [
-        ("tokenizers/punkt", "punkt"),
-        ("corpora/stopwords", "stopwords"),
-        ("taggers/averaged_perceptron_tagger", "averaged_perceptron_tagger"),
-        ("chunkers/maxent_ne_chunker", "maxent_ne_chunker"),
-        ("corpora/words", "words"),
-    ]
+from .extract_info import DEFAULT_SPACY_MODEL, NAME_PIPELINE_EXCLUDE, load_spacy_model
 
-    for path, resource in required_resources:
-        try:
-            nltk.data.find(path)
-        except LookupError:
-            nltk.download(resource)
+logger = logging.getLogger(__name__)
 
-    # Load spaCy
+
+@lru_cache(maxsize=None)
+def get_nlp():
+    """
+    Load spaCy on first use (the same cached instance ResumeParser uses).
+
+    Nothing is loaded at import time. The NLTK corpora this module used to
+    download are not used by any parser code and are no longer fetched.
+    """
     try:
-        return spacy.load("en_core_web_sm")
+        return load_spacy_model(DEFAULT_SPACY_MODEL, NAME_PIPELINE_EXCLUDE)
     except OSError:
-        print("Please install spaCy English model: python -m spacy download en_core_web_sm")
+        logger.error("Please install spaCy English model: python -m spacy download en_core_web_sm")
         return None
-
-# Initialize at import
-nlp = setup_nlp()
@@ -0,0 +1,188 @@
+# app/services/optimization_cache.py
+import os
+import json
+import time
+import hashlib
+import inspect
+import logging
+import unicodedata
+from typing import Any, Dict, Optional, Protocol
+
+from fastapi import HTTPException, Request
+
+from . import json_repair, optimization_planner, prompt_builder, resume_parser
+from .cache import DiskCache, LRUCache, drop_stale_versions
+from .metrics import counter
+
+logger = logging.getLogger(__name__)
+
+# "memory", "disk" or "none"
+OPTIMIZE_CACHE_BACKEND = os.getenv("OPTIMIZE_CACHE_BACKEND", "memory")
+OPTIMIZE_CACHE_ENTRIES = int(os.getenv("OPTIMIZE_CACHE_ENTRIES", "512"))
+OPTIMIZE_CACHE_TTL_SECONDS = float(os.getenv("OPTIMIZE_CACHE_TTL_SECONDS", str(24 * 3600)))
+OPTIMIZE_CACHE_DIR = os.getenv("OPTIMIZE_CACHE_DIR", ".cache/optimize")
+OPTIMIZE_CACHE_MAX_BYTES = int(os.getenv("OPTIMIZE_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Modules whose source determines the optimization output
+OPTIMIZER_MODULES = (resume_parser, json_repair, prompt_builder, optimization_planner)
+
+optimize_cache_lookups_total = counter(
+    "optimize_cache_lookups_total",
+    "Optimization cache lookups by result (hit, miss, expired)",
+)
+
+
+class CacheBackend(Protocol):
+    """Key/value store the optimization cache can sit on (LRUCache, DiskCache)."""
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+def normalise_text(text: Optional[str]) -> str:
+    """NFKC-normalise and collapse whitespace so formatting-only edits hash the same."""
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def compute_prompt_version(
+    model: str = resume_parser.AI_MODEL,
+    strategy: str = optimization_planner.OPTIMIZE_STRATEGY,
+) -> str:
+    """Fingerprint the model, strategy and prompt/response code so cached results expire with them"""
+    digest = hashlib.sha256(f"{model}:{strategy}".encode("utf-8"))
+    for module in OPTIMIZER_MODULES:
+        digest.update(inspect.getsource(module).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def request_hash(
+    resume_sections: Dict,
+    job_description: str,
+    additional_info: Optional[str] = None,
+    model: str = resume_parser.AI_MODEL,
+    version: str = "",
+    route: str = "optimize",
+) -> str:
+    """
+    Canonical hash of an optimization request; formatting-only differences hash the same.
+
+    route names the prompt path ("optimize" for the planner, "batch" for
+    the context-cached single prompt), since they answer differently.
+    """
+    canonical = json.dumps(
+        {
+            "version": version,
+            "route": route,
+            "model": model,
+            "resume": resume_sections,
+            "job_description": normalise_text(job_description),
+            "additional_info": normalise_text(additional_info),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def has_content(result: Dict) -> bool:
+    """False for the optimizer's failure fallback, where every section is empty"""
+    return isinstance(result, dict) and any(result.values())
+
+
+class OptimizationCache:
+    """
+    TTL + LRU cache of optimization results.
+
+    Keys are a canonical hash of the rewritten resume sections (before
+    compaction, since trimmed content is restored into the result), the
+    normalised job description and additional_info, the route that built
+    the prompt, and the prompt version (model name, OPTIMIZE_STRATEGY and
+    optimizer source). Entries carry their store time and
+    are treated as misses once older than ttl_seconds.
+    Eviction is the backend's: entry-count LRU in memory, size-bounded LRU
+    on disk.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: float = OPTIMIZE_CACHE_TTL_SECONDS,
+        prompt_version: Optional[str] = None,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.prompt_version = prompt_version or compute_prompt_version()
+
+    def key(
+        self,
+        resume_sections: Dict,
+        job_description: str,
+        additional_info: Optional[str] = None,
+        model: str = resume_parser.AI_MODEL,
+        route: str = "optimize",
+    ) -> str:
+        return request_hash(resume_sections, job_description, additional_info, model, self.prompt_version, route)
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self.backend.get(key)
+        if entry is None:
+            optimize_cache_lookups_total.inc(result="miss")
+            return None
+        if time.time() - entry["stored_at"] > self.ttl_seconds:
+            optimize_cache_lookups_total.inc(result="expired")
+            self.backend.delete(key)
+            return None
+        optimize_cache_lookups_total.inc(result="hit")
+        return entry["value"]
+
+    def put(self, key: str, result: Dict) -> None:
+        # Empty results are the failure fallback; let the next submit retry
+        if not has_content(result):
+            return
+        try:
+            self.backend.set(key, {"stored_at": time.time(), "value": result})
+        except OSError as e:
+            logger.warning(f"Could not write optimization cache entry: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Return lookup counters and the hit rate."""
+        hits, misses, expired = (
+            optimize_cache_lookups_total.value(result=result) for result in ("hit", "miss", "expired")
+        )
+        lookups = hits + misses + expired
+        return {
+            "backend": type(self.backend).__name__,
+            "prompt_version": self.prompt_version,
+            "hits": hits,
+            "misses": misses,
+            "expired": expired,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+def create_optimization_cache(backend: str = OPTIMIZE_CACHE_BACKEND) -> Optional[OptimizationCache]:
+    """Build the cache for the configured backend; None disables caching."""
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return OptimizationCache(LRUCache(OPTIMIZE_CACHE_ENTRIES))
+    if backend == "disk":
+        version = compute_prompt_version()
+        drop_stale_versions(OPTIMIZE_CACHE_DIR, keep=version)
+        store = DiskCache(os.path.join(OPTIMIZE_CACHE_DIR, version), OPTIMIZE_CACHE_MAX_BYTES)
+        return OptimizationCache(store, prompt_version=version)
+    raise ValueError(f"Unknown OPTIMIZE_CACHE_BACKEND {backend!r}, expected memory, disk or none")
+
+
+def get_optimization_cache(request: Request) -> Optional[OptimizationCache]:
+    """FastAPI dependency returning the cache created in the app lifespan (None if disabled)"""
+    if not hasattr(request.app.state, "optimization_cache"):
+        raise HTTPException(status_code=503, detail="Optimizer is not ready")
+    return request.app.state.optimization_cache
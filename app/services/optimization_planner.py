@@ -0,0 +1,278 @@
+# app/services/optimization_planner.py
+import os
+import time
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+
+from .metrics import histogram
+from .prompt_builder import compact_resume, restore_trimmed, submitted_items
+from .resume_parser import (
+    OPTIMIZED_SECTIONS,
+    ai_calls_total,
+    ai_time_to_first_item_seconds,
+    build_section_prompt,
+    call_ai_for_optimization,
+    decode_model_json,
+    generate_text,
+    stream_ai_optimization,
+)
+from .timing import span
+
+logger = logging.getLogger(__name__)
+
+# "fanout": one request per section and per experience role; "single": one prompt for everything
+OPTIMIZE_STRATEGY = os.getenv("OPTIMIZE_STRATEGY", "fanout")
+# Extra attempts for a section whose response was empty, malformed or failed
+OPTIMIZE_SECTION_RETRIES = int(os.getenv("OPTIMIZE_SECTION_RETRIES", "1"))
+
+ai_section_seconds = histogram(
+    "ai_section_seconds",
+    "Wall time of one fanned-out optimization section, retries included",
+)
+
+
+class SectionTask(NamedTuple):
+    section: str     # response section the items go to
+    index: int       # experience role index; 0 for the other sections
+    data: Dict       # compacted resume data sent with the prompt
+    submitted: Dict  # the same data before compaction, returned if the section fails
+
+    @property
+    def label(self) -> str:
+        return f"{self.section}[{self.index}]" if self.section == "experience" else self.section
+
+
+class SectionResult(NamedTuple):
+    task: SectionTask
+    items: Optional[List]  # None if every attempt failed
+    attempts: int
+    seconds: float
+
+
+class OptimizationOutcome(NamedTuple):
+    result: Dict
+    failed: List[str]  # labels of sections returned as submitted
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed
+
+
+def plan_sections(ai_data: Dict, sections: Optional[Dict] = None) -> List[SectionTask]:
+    """
+    Split compacted resume data into one task per section, experience per role.
+
+    sections is the data before compaction (defaults to ai_data); a
+    section that fails is returned from it, as the user wrote it.
+    """
+    sections = sections or ai_data
+    tasks = []
+    if ai_data.get("skills"):
+        tasks.append(SectionTask("technical_skills", 0, {"skills": ai_data["skills"]}, {"skills": sections["skills"]}))
+    if ai_data.get("projects"):
+        tasks.append(SectionTask("projects", 0, {"projects": ai_data["projects"]}, {"projects": sections["projects"]}))
+    for index, role in enumerate(ai_data.get("experience", [])):
+        tasks.append(SectionTask(
+            "experience", index, {"experience": [role]}, {"experience": [sections["experience"][index]]}
+        ))
+    return tasks
+
+
+def _as_submitted(task: SectionTask) -> List:
+    # The uncompacted section as the user wrote it, in the response shape
+    if task.section == "technical_skills":
+        return submitted_items("skills", task.submitted["skills"])
+    return submitted_items(task.section, task.submitted[task.section])
+
+
+def _parse_section(task: SectionTask, response_text: str) -> Optional[List]:
+    decoded = decode_model_json(response_text)
+    items = decoded.get(task.section) if isinstance(decoded, dict) else None
+    if not isinstance(items, list) or not items:
+        return None
+    if task.section == "experience":
+        return items[:1] if isinstance(items[0], dict) else None
+    return items
+
+
+async def _run_section(
+    task: SectionTask,
+    job_description: str,
+    additional_info: Optional[str],
+    timeout: Optional[float],
+) -> SectionResult:
+    """
+    Optimize one section, retrying empty, malformed or failed responses.
+
+    A timeout is not retried: it already used the section's whole budget.
+    """
+    prompt = build_section_prompt(task.section, task.data, job_description, additional_info)
+    started = time.perf_counter()
+    items = None
+    attempts = 0
+    while items is None and attempts <= OPTIMIZE_SECTION_RETRIES:
+        attempts += 1
+        try:
+            response_text = await generate_text(prompt, timeout)
+        except asyncio.TimeoutError:
+            ai_calls_total.inc(outcome="timeout")
+            break
+        except asyncio.CancelledError:
+            ai_calls_total.inc(outcome="cancelled")
+            raise
+        except Exception as e:
+            ai_calls_total.inc(outcome="error")
+            logger.warning(f"Optimizing {task.label} failed (attempt {attempts}): {e}")
+            continue
+        if not response_text:
+            ai_calls_total.inc(outcome="empty")
+            continue
+        with span("json_repair"):
+            items = _parse_section(task, response_text)
+        ai_calls_total.inc(outcome="ok" if items is not None else "malformed")
+
+    seconds = time.perf_counter() - started
+    ai_section_seconds.observe(seconds, section=task.section)
+    return SectionResult(task, items, attempts, seconds)
+
+
+def _section_items(result: SectionResult) -> List:
+    return result.items if result.items is not None else _as_submitted(result.task)
+
+
+def merge_sections(results: List[SectionResult]) -> OptimizationOutcome:
+    """Assemble section results into the single-prompt response shape, roles in resume order."""
+    merged: Dict[str, List] = {section: [] for section in OPTIMIZED_SECTIONS}
+    failed = []
+    for result in sorted(results, key=lambda r: (OPTIMIZED_SECTIONS.index(r.task.section), r.task.index)):
+        if result.items is None:
+            failed.append(result.task.label)
+        merged[result.task.section].extend(_section_items(result))
+    return OptimizationOutcome(merged, failed)
+
+
+def _restore(outcome: OptimizationOutcome, results: List[SectionResult], sections: Dict, prompt_data: Dict) -> Dict:
+    # Failed sections already came back uncompacted; only the optimized ones miss trimmed content
+    sent = {name: list(value) for name, value in prompt_data.items()}
+    for result in results:
+        if result.items is not None:
+            continue
+        if result.task.section == "experience":
+            sent["experience"][result.task.index] = result.task.submitted["experience"][0]
+        else:
+            name = "skills" if result.task.section == "technical_skills" else result.task.section
+            sent[name] = result.task.submitted[name]
+    return restore_trimmed(outcome.result, sections, sent)
+
+
+def _log_report(results: List[SectionResult]) -> None:
+    parts = [
+        f"{r.task.label} {r.seconds:.2f}s"
+        + (f" x{r.attempts}" if r.attempts > 1 else "")
+        + (" FAILED" if r.items is None else "")
+        for r in results
+    ]
+    logger.info(f"Optimization fan-out: {', '.join(parts) or 'nothing to optimize'}")
+
+
+def _check_strategy(strategy: str) -> None:
+    if strategy not in ("fanout", "single"):
+        raise ValueError(f"Unknown OPTIMIZE_STRATEGY {strategy!r}, expected fanout or single")
+
+
+async def optimize(
+    ai_data: Dict,
+    job_description: str,
+    additional_info: Optional[str],
+    timeout: Optional[float] = None,
+    strategy: str = OPTIMIZE_STRATEGY,
+) -> OptimizationOutcome:
+    """
+    Optimize resume sections with the configured strategy.
+
+    ai_data is select_sections() output. The prompts are built from a
+    copy compacted to PROMPT_RESUME_TOKEN_BUDGET, and whatever the
+    compaction left out is put back in the result as submitted.
+
+    With "fanout" technical_skills, projects and each experience role are
+    separate, concurrent requests (through the shared AI dispatcher),
+    so the slowest section bounds the latency rather than the sum, and a
+    section that still fails after OPTIMIZE_SECTION_RETRIES comes back as
+    submitted instead of emptying the whole result. Per-section latency
+    goes to the ai_section_seconds histogram and the log.
+
+    Raises:
+        asyncio.TimeoutError: With "single", if the model call timed out
+    """
+    _check_strategy(strategy)
+    prompt_data = compact_resume(ai_data)
+    if strategy == "single":
+        result = await call_ai_for_optimization(prompt_data, job_description, additional_info, timeout)
+        return OptimizationOutcome(restore_trimmed(result, ai_data, prompt_data), [])
+
+    with span("ai_fanout"):
+        results = await asyncio.gather(*(
+            _run_section(task, job_description, additional_info, timeout)
+            for task in plan_sections(prompt_data, ai_data)
+        ))
+    _log_report(results)
+    outcome = merge_sections(results)
+    return outcome._replace(result=_restore(outcome, results, ai_data, prompt_data))
+
+
+async def stream_optimization(
+    ai_data: Dict,
+    job_description: str,
+    additional_info: Optional[str],
+    timeout: Optional[float] = None,
+    strategy: str = OPTIMIZE_STRATEGY,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of optimize.
+
+    Yields {"section", "index", "item"} per optimized element, then
+    {"result", "failed"}. With "fanout" a section's items are yielded
+    when that section finishes; with "single" as the model writes them.
+    Content left out of the prompt is only in the final result.
+
+    Raises:
+        asyncio.TimeoutError: With "single", if the stream timed out
+    """
+    _check_strategy(strategy)
+    prompt_data = compact_resume(ai_data)
+    if strategy == "single":
+        async for event in stream_ai_optimization(prompt_data, job_description, additional_info, timeout):
+            if "result" in event:
+                yield {"result": restore_trimmed(event["result"], ai_data, prompt_data), "failed": []}
+            else:
+                yield event
+        return
+
+    started = time.perf_counter()
+    pending = {
+        asyncio.ensure_future(_run_section(task, job_description, additional_info, timeout))
+        for task in plan_sections(prompt_data, ai_data)
+    }
+    results: List[SectionResult] = []
+    first_item = True
+    try:
+        with span("ai_fanout"):
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    result = finished.result()
+                    results.append(result)
+                    for offset, item in enumerate(_section_items(result)):
+                        if first_item:
+                            first_item = False
+                            ai_time_to_first_item_seconds.observe(time.perf_counter() - started)
+                        index = result.task.index if result.task.section == "experience" else offset
+                        yield {"section": result.task.section, "index": index, "item": item}
+    finally:
+        for task in pending:
+            task.cancel()
+
+    _log_report(results)
+    outcome = merge_sections(results)
+    yield {"result": _restore(outcome, results, ai_data, prompt_data), "failed": outcome.failed}
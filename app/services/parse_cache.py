@@ -0,0 +1,111 @@
+# app/services/parse_cache.py
+import os
+import hashlib
+import inspect
+import logging
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from . import extract_info, pdf_text, redaction, resume_document
+from .cache import DiskCache, LRUCache, drop_stale_versions
+from .metrics import counter
+
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE_ENTRIES = int(os.getenv("PARSE_CACHE_ENTRIES", "256"))
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", ".cache/parse")
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+
+# Modules whose source determines the parse output
+PARSER_MODULES = (extract_info, pdf_text, redaction, resume_document)
+
+parse_cache_lookups_total = counter(
+    "parse_cache_lookups_total",
+    "Parse cache lookups by tier and result",
+)
+
+
+def compute_parser_version(spacy_model: str = extract_info.DEFAULT_SPACY_MODEL) -> str:
+    """Fingerprint the parser code and model so cached results expire with them"""
+    digest = hashlib.sha256(spacy_model.encode("utf-8"))
+    for module in PARSER_MODULES:
+        digest.update(inspect.getsource(module).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ParseCache:
+    """
+    Two-tier cache of ResumeParser results keyed by PDF content.
+
+    Lookups try an in-memory LRU first, then a size-bounded on-disk store.
+    Disk entries live under a directory named after the parser version;
+    directories left behind by other versions are removed on startup.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PARSE_CACHE_ENTRIES,
+        directory: Optional[str] = PARSE_CACHE_DIR,
+        max_bytes: int = PARSE_CACHE_MAX_BYTES,
+        parser_version: Optional[str] = None,
+    ):
+        self.parser_version = parser_version or compute_parser_version()
+        self.memory = LRUCache(max_entries)
+        self.disk: Optional[DiskCache] = None
+        if directory:
+            drop_stale_versions(directory, keep=self.parser_version)
+            self.disk = DiskCache(os.path.join(directory, self.parser_version), max_bytes)
+        logger.info(f"Parse cache ready (parser version {self.parser_version})")
+
+    def key(self, pdf_data: bytes) -> str:
+        """SHA-256 of the PDF bytes; the version is applied by the store layout."""
+        return hashlib.sha256(pdf_data).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        result = self.memory.get(key)
+        if result is not None:
+            parse_cache_lookups_total.inc(tier="memory", result="hit")
+            return result
+        parse_cache_lookups_total.inc(tier="memory", result="miss")
+
+        if self.disk is None:
+            return None
+        result = self.disk.get(key)
+        if result is None:
+            parse_cache_lookups_total.inc(tier="disk", result="miss")
+            return None
+        parse_cache_lookups_total.inc(tier="disk", result="hit")
+        self.memory.set(key, result)
+        return result
+
+    def put(self, key: str, result: Dict) -> None:
+        # Failed parses are not cached so a fixed parser can retry them
+        if result.get("error"):
+            return
+        self.memory.set(key, result)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, result)
+            except OSError as e:
+                logger.warning(f"Could not write parse cache entry: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Return entry counts and hit/miss counters per tier."""
+        stats = {
+            "parser_version": self.parser_version,
+            "memory_entries": len(self.memory),
+            "disk_bytes": self.disk.size_bytes if self.disk else 0,
+        }
+        for tier in ("memory", "disk"):
+            for result, label in (("hit", "hits"), ("miss", "misses")):
+                stats[f"{tier}_{label}"] = parse_cache_lookups_total.value(tier=tier, result=result)
+        return stats
+
+
+def get_parse_cache(request: Request) -> ParseCache:
+    """FastAPI dependency returning the cache created in the app lifespan"""
+    cache = getattr(request.app.state, "parse_cache", None)
+    if cache is None:
+        raise HTTPException(status_code=503, detail="Resume parser is not ready")
+    return cache
@@ -0,0 +1,279 @@
+# app/services/parse_executor.py
+import os
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from .extract_info import DEFAULT_SPACY_MODEL, ResumeParser
+from .metrics import counter, histogram
+from .parser_pool import ParserPool
+from .timing import collect_timings, record, record_all
+
+logger = logging.getLogger(__name__)
+
+# 0 workers keeps parsing in-process on a thread backed by ParserPool
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+PARSE_QUEUE_SIZE = int(os.getenv("PARSE_QUEUE_SIZE", str(max(1, PARSE_WORKERS) * 4)))
+# How long a caller waits for a parse. A job that overruns it is not killed:
+# its worker stays busy (and its queue slot taken) until the job finishes.
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "30"))
+
+parse_queue_wait_seconds = histogram(
+    "parse_queue_wait_seconds",
+    "Time a parse job waited for a free worker",
+)
+parse_job_seconds = histogram(
+    "parse_job_seconds",
+    "Wall time of a parse job, from submission to result",
+)
+parse_jobs_total = counter(
+    "parse_jobs_total",
+    "Parse jobs by outcome",
+)
+
+
+class ParserSaturated(Exception):
+    """Raised when the submission queue is full."""
+
+
+# Worker-process state, populated by _init_worker
+_worker_parser: Optional[ResumeParser] = None
+
+
+def _init_worker(spacy_model: str) -> None:
+    """Process-pool initializer: load spaCy once per worker."""
+    global _worker_parser
+    _worker_parser = ResumeParser(spacy_model)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _run_job(method: str, payload: Any, submitted_at: float) -> Tuple[float, Any, Dict[str, float]]:
+    """Call a ResumeParser method inside a worker; returns (queue wait, result, stage timings)."""
+    waited = time.time() - submitted_at
+    with collect_timings(observe=False) as timings:
+        result = getattr(_worker_parser, method)(payload)
+    return waited, result, timings
+
+
+class ParseExecutor:
+    """
+    Runs ResumeParser.parse_resume off the event loop.
+
+    With workers > 0 jobs go to a ProcessPoolExecutor whose workers are
+    pre-initialised with the spaCy model. The number of in-flight jobs is
+    bounded by max_pending; submissions beyond that fail fast with
+    ParserSaturated so the route can answer 503.
+
+    A timeout only stops the caller waiting. Python cannot interrupt a
+    running job, so a runaway parse keeps its worker and queue slot until
+    it returns; max_pending bounds how many such jobs can pile up. A pool
+    broken by a crashed worker is restarted once, off the event loop,
+    while other submitters wait for it.
+    """
+
+    def __init__(
+        self,
+        workers: int = PARSE_WORKERS,
+        max_pending: int = PARSE_QUEUE_SIZE,
+        timeout: float = PARSE_TIMEOUT,
+        spacy_model: str = DEFAULT_SPACY_MODEL,
+    ):
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending)
+        self.timeout = timeout
+        self.spacy_model = spacy_model
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._restart_lock = asyncio.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ParserPool] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+
+        if self.workers:
+            self._pool = self._start_pool()
+        else:
+            self._thread_pool = ParserPool(spacy_model=spacy_model)
+            self._threads = ThreadPoolExecutor(
+                max_workers=self._thread_pool.size, thread_name_prefix="resume-parser"
+            )
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        started = time.perf_counter()
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.spacy_model,),
+        )
+        # Force every worker to spawn and load spaCy before traffic arrives
+        pids = {f.result() for f in [pool.submit(_warm_up) for _ in range(self.workers)]}
+        logger.info(
+            f"Parse executor ready: {len(pids)} worker process(es) in "
+            f"{time.perf_counter() - started:.2f}s"
+        )
+        return pool
+
+    def _reserve(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                parse_jobs_total.inc(outcome="rejected")
+                raise ParserSaturated(f"{self._pending} parse jobs already in flight")
+            self._pending += 1
+
+    def _release(self, _: Optional[Future] = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        async with self._restart_lock:
+            if self._pool is not broken:
+                return  # another submitter already restarted it
+            logger.error("Parse worker pool broken, restarting it")
+            broken.shutdown(wait=False, cancel_futures=True)
+            # Spawning workers and loading spaCy takes seconds; keep serving meanwhile
+            self._pool = await asyncio.to_thread(self._start_pool)
+
+    async def _submit(self, method: str, payload: Any) -> Future:
+        if self._pool is not None:
+            pool = self._pool
+            try:
+                return pool.submit(_run_job, method, payload, time.time())
+            except BrokenProcessPool:
+                await self._restart_pool(pool)
+                return self._pool.submit(_run_job, method, payload, time.time())
+
+        submitted_at = time.time()
+
+        def run_in_thread() -> Tuple[float, Any, Dict[str, float]]:
+            with self._thread_pool.acquire() as parser:
+                waited = time.time() - submitted_at
+                with collect_timings(observe=False) as timings:
+                    result = getattr(parser, method)(payload)
+                return waited, result, timings
+
+        return self._threads.submit(run_in_thread)
+
+    async def parse(self, pdf_data: bytes, timeout: Optional[float] = None) -> Dict:
+        """
+        Parse a resume without blocking the event loop.
+
+        Args:
+            pdf_data: PDF file content as bytes
+            timeout: Seconds to wait for the result, defaults to the executor timeout
+
+        Raises:
+            ParserSaturated: If max_pending jobs are already in flight
+            asyncio.TimeoutError: If the job did not finish in time
+        """
+        return await self._run("parse_resume", pdf_data, timeout)
+
+    async def extract_text(self, pdf_data: bytes, timeout: Optional[float] = None) -> str:
+        """
+        Run only the PDF text extraction stage of a parse.
+
+        Together with analyse() this splits parse() in two so callers can
+        report progress between the stages. Each stage is its own job.
+
+        Raises:
+            ParserSaturated: If max_pending jobs are already in flight
+            asyncio.TimeoutError: If the job did not finish in time
+        """
+        return await self._run("extract_text_from_pdf", pdf_data, timeout)
+
+    async def analyse(self, text: str, timeout: Optional[float] = None) -> Dict:
+        """
+        Run the field extraction stage of a parse on text from extract_text().
+
+        Raises:
+            ParserSaturated: If max_pending jobs are already in flight
+            asyncio.TimeoutError: If the job did not finish in time
+        """
+        return await self._run("analyse_text", text, timeout)
+
+    async def parse_batch(self, pdfs: List[bytes], timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Parse several resumes as one job, batching spaCy name extraction.
+
+        The batch holds a single queue slot and runs on a single worker, so
+        callers should keep batches small and submit several to use every
+        worker. The timeout covers the whole batch.
+
+        Args:
+            pdfs: PDF file contents as bytes
+            timeout: Seconds to wait for the batch, defaults to the executor
+                timeout times the batch size
+
+        Returns:
+            One parse result per PDF, in input order
+
+        Raises:
+            ParserSaturated: If max_pending jobs are already in flight
+            asyncio.TimeoutError: If the batch did not finish in time
+        """
+        if not pdfs:
+            return []
+        return await self._run("parse_resumes", list(pdfs), timeout or self.timeout * len(pdfs))
+
+    async def _run(self, method: str, payload: Any, timeout: Optional[float]) -> Any:
+        self._reserve()
+        started = time.perf_counter()
+        try:
+            future = await self._submit(method, payload)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the worker is really done, even after a timeout
+        future.add_done_callback(self._release)
+
+        try:
+            waited, result, timings = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout or self.timeout
+            )
+        except asyncio.TimeoutError:
+            parse_jobs_total.inc(outcome="timeout")
+            raise
+        except Exception:
+            parse_jobs_total.inc(outcome="error")
+            raise
+
+        parse_queue_wait_seconds.observe(max(0.0, waited))
+        # Stages measured in the worker count towards this request
+        record("queue_wait", max(0.0, waited))
+        record_all(timings)
+        parse_job_seconds.observe(time.perf_counter() - started)
+        parse_jobs_total.inc(outcome="ok")
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """Return backend, queue occupancy and wait-time summary."""
+        return {
+            "backend": "process" if self._pool is not None else "thread",
+            "workers": self.workers or self._thread_pool.size,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            **{f"wait_{k}": v for k, v in parse_queue_wait_seconds.summary().items()},
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+
+
+def get_parse_executor(request: Request) -> ParseExecutor:
+    """FastAPI dependency returning the executor created in the app lifespan"""
+    executor = getattr(request.app.state, "parse_executor", None)
+    if executor is None:
+        raise HTTPException(status_code=503, detail="Resume parser is not ready")
+    return executor
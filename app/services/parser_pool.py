@@ -0,0 +1,73 @@
+# app/services/parser_pool.py
+import os
+import queue
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from .extract_info import DEFAULT_SPACY_MODEL, ResumeParser
+from .metrics import histogram
+
+logger = logging.getLogger(__name__)
+
+PARSER_POOL_SIZE = int(os.getenv("PARSER_POOL_SIZE", "1"))
+PARSER_POOL_TIMEOUT = float(os.getenv("PARSER_POOL_TIMEOUT", "30"))
+
+pool_wait_seconds = histogram(
+    "parser_pool_wait_seconds",
+    "Time spent waiting to check a ResumeParser out of the pool",
+)
+
+
+class ParserPool:
+    """A fixed set of warm ResumeParser instances shared by all requests."""
+
+    def __init__(self, size: int = PARSER_POOL_SIZE, spacy_model: str = DEFAULT_SPACY_MODEL):
+        """
+        Build and preload the pool.
+
+        Args:
+            size: Number of parsers to keep warm
+            spacy_model: Name of the spacy language model to use
+        """
+        self.size = max(1, size)
+        self._parsers: "queue.Queue[ResumeParser]" = queue.Queue(maxsize=self.size)
+        started = time.perf_counter()
+        for _ in range(self.size):
+            self._parsers.put(ResumeParser(spacy_model))
+        logger.info(
+            f"Parser pool ready: {self.size} parser(s) in {time.perf_counter() - started:.2f}s"
+        )
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = PARSER_POOL_TIMEOUT) -> Iterator[ResumeParser]:
+        """
+        Check a parser out of the pool for the duration of the block.
+
+        Args:
+            timeout: Seconds to wait for a free parser, None to wait forever
+
+        Raises:
+            TimeoutError: If no parser became free within the timeout
+        """
+        started = time.perf_counter()
+        try:
+            parser = self._parsers.get(timeout=timeout)
+        except queue.Empty:
+            pool_wait_seconds.observe(time.perf_counter() - started, outcome="timeout")
+            raise TimeoutError("No resume parser available")
+        pool_wait_seconds.observe(time.perf_counter() - started, outcome="acquired")
+        try:
+            yield parser
+        finally:
+            self._parsers.put(parser)
+
+    def stats(self) -> Dict[str, float]:
+        """Return pool size, idle parsers and wait-time summary."""
+        return {
+            "size": self.size,
+            "idle": self._parsers.qsize(),
+            **{f"wait_{k}": v for k, v in pool_wait_seconds.summary(outcome="acquired").items()},
+        }
+
@@ -0,0 +1,134 @@
+# app/services/pdf_text.py
+import io
+import os
+import logging
+from concurrent.futures import Executor
+from typing import Iterator, List, Optional
+
+import PyPDF2
+from pdfminer.high_level import extract_text
+
+logger = logging.getLogger(__name__)
+
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# Pages without fonts or text to see before calling a PDF image-only
+IMAGE_ONLY_PROBE_PAGES = 2
+
+
+class PdfTooLarge(ValueError):
+    """Raised when a PDF exceeds the configured byte budget."""
+
+
+def _page_has_fonts(page) -> bool:
+    """True if the page declares any font resource, i.e. can carry text."""
+    try:
+        resources = page.get("/Resources")
+        resources = resources.get_object() if resources is not None else None
+        return bool(resources and resources.get("/Font"))
+    except Exception:
+        # Unreadable resources: assume text is possible and let extraction decide
+        return True
+
+
+def _extract_page(page, page_num: int) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception as e:
+        logger.warning(f"Error extracting text from page {page_num + 1}: {e}")
+        return ""
+
+
+def _extract_page_range(pdf_data: bytes, start: int, stop: int) -> List[str]:
+    """Worker task: open the PDF and extract pages [start, stop)."""
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_data))
+    return [_extract_page(reader.pages[i], i) for i in range(start, stop)]
+
+
+def iter_pdf_pages(
+    pdf_data: bytes,
+    fallback_method: bool = True,
+    max_pages: int = PDF_MAX_PAGES,
+    max_bytes: int = PDF_MAX_BYTES,
+    executor: Optional[Executor] = None,
+    pages_per_task: int = 4,
+) -> Iterator[str]:
+    """
+    Yield the non-empty text of each PDF page, in order, as it is decoded.
+
+    PyPDF2 is the primary extractor. pdfminer is only tried when PyPDF2
+    cannot open the file, or when it opened the file and found fonts but no
+    text. A document whose first pages have neither text nor fonts is
+    treated as image-only (scanned): the remaining pages and the pdfminer
+    pass are skipped, because neither extractor can get text from it.
+
+    Args:
+        pdf_data: PDF file as bytes
+        fallback_method: Whether to use pdfminer as fallback if PyPDF2 fails
+        max_pages: Pages beyond this count are ignored
+        max_bytes: Larger inputs are rejected before parsing
+        executor: Optional executor to fan page ranges out to; pages are still
+            yielded in document order
+        pages_per_task: Pages per executor task
+
+    Raises:
+        PdfTooLarge: If pdf_data is larger than max_bytes
+    """
+    if len(pdf_data) > max_bytes:
+        raise PdfTooLarge(f"PDF is {len(pdf_data)} bytes, limit is {max_bytes}")
+
+    found_text = False
+    saw_fonts = False
+    reader = None
+
+    # Primary method: PyPDF2
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(pdf_data))
+        page_count = min(len(reader.pages), max_pages)
+        if len(reader.pages) > max_pages:
+            logger.info(f"PDF has {len(reader.pages)} pages, reading the first {max_pages}")
+
+        if executor is not None and page_count > pages_per_task:
+            futures = [
+                executor.submit(_extract_page_range, pdf_data, start, min(start + pages_per_task, page_count))
+                for start in range(0, page_count, pages_per_task)
+            ]
+            for future in futures:
+                for page_text in future.result():
+                    if page_text.strip():
+                        found_text = True
+                        yield page_text
+            saw_fonts = True  # not probed per page on this path
+        else:
+            for page_num in range(page_count):
+                page = reader.pages[page_num]
+                page_text = _extract_page(page, page_num)
+                if page_text.strip():
+                    found_text = True
+                    yield page_text
+                    continue
+
+                saw_fonts = saw_fonts or _page_has_fonts(page)
+                if not found_text and not saw_fonts and page_num + 1 >= IMAGE_ONLY_PROBE_PAGES:
+                    logger.info("PDF looks image-only (no fonts, no text); skipping text extraction")
+                    return
+
+    except Exception as e:
+        logger.warning(f"PyPDF2 extraction failed: {e}")
+        reader = None
+
+    # Fallback method: pdfminer
+    if found_text or not fallback_method:
+        return
+    if reader is not None and not saw_fonts:
+        logger.info("PDF has no fonts; skipping pdfminer fallback")
+        return
+
+    try:
+        logger.info("Trying fallback method: pdfminer")
+        text = extract_text(io.BytesIO(pdf_data), maxpages=max_pages)
+        if text and text.strip():
+            yield text
+    except Exception as e:
+        logger.error(f"pdfminer extraction also failed: {e}")
@@ -0,0 +1,268 @@
+# app/services/prompt_builder.py
+import os
+import json
+import logging
+from collections import Counter
+from typing import Dict, List
+
+from .metrics import histogram
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the resume part of the optimization prompt, in estimated tokens
+PROMPT_RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "2000"))
+
+# Gemini tokenises English prose at roughly four characters per token
+CHARS_PER_TOKEN = 4
+
+# Sections the model is asked to rewrite, in the order they are trimmed last-to-first
+REWRITTEN_SECTIONS = ("skills", "experience", "projects")
+
+# Bullet-bearing entry fields per section
+_BULLET_FIELDS = {"experience": "description", "projects": "description"}
+
+prompt_resume_tokens = histogram(
+    "prompt_resume_tokens",
+    "Estimated tokens of the resume sent to the model, before and after compaction",
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without a round trip to the model's tokenizer."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def serialise_sections(sections: Dict) -> str:
+    """Compact JSON: no indentation, no spaces after separators, non-ASCII kept as is."""
+    return json.dumps(sections, separators=(",", ":"), ensure_ascii=False)
+
+
+def _clean(value):
+    # Drop empty strings, lists and dicts at every level; strip surrounding whitespace
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return [item for item in (_clean(v) for v in value) if item not in ("", [], {}, None)]
+    if isinstance(value, dict):
+        return {k: item for k, item in ((k, _clean(v)) for k, v in value.items()) if item not in ("", [], {}, None)}
+    return value
+
+
+def select_sections(resume_data: Dict) -> Dict:
+    """
+    Keep only the sections the model rewrites, without empty fields.
+
+    raw_markdown and extracted_text repeat the whole resume, and education,
+    summary, certifications and languages are not rewritten, so none of
+    them go into the prompt.
+    """
+    sections = {}
+    for name in REWRITTEN_SECTIONS:
+        value = _clean(resume_data.get(name) or [])
+        if value:
+            sections[name] = value
+    return sections
+
+
+def fit_to_budget(sections: Dict, budget: int) -> Dict:
+    """
+    Trim sections until their serialised form fits in budget tokens.
+
+    Trimming is deterministic and goes from least to most damaging:
+
+    1. lower a shared cap on bullets per experience/project entry, so the
+       longest lists lose bullets first, keeping at least one each
+    2. drop trailing projects, then trailing experience entries, keeping
+       at least one of each
+    3. drop trailing skills
+    4. drop the longest remaining bullets, one at a time
+
+    Only whole skills, bullets and entries are dropped, never part of one,
+    so restore_trimmed() can put them back in the optimized result as
+    submitted. The input is not modified. If the budget still cannot be
+    met the smallest version reached is returned.
+    """
+    sections = json.loads(json.dumps(sections))
+
+    def fits() -> bool:
+        return estimate_tokens(serialise_sections(sections)) <= budget
+
+    if fits():
+        return sections
+
+    entries = [
+        (entry, field)
+        for name, field in _BULLET_FIELDS.items()
+        for entry in sections.get(name, [])
+        if isinstance(entry, dict) and isinstance(entry.get(field), list)
+    ]
+
+    # 1. Bullet cap
+    cap = max((len(entry[field]) for entry, field in entries), default=0)
+    while cap > 1 and not fits():
+        cap -= 1
+        for entry, field in entries:
+            del entry[field][cap:]
+
+    # 2. Trailing entries
+    for name in ("projects", "experience"):
+        items: List = sections.get(name, [])
+        while len(items) > 1 and not fits():
+            items.pop()
+
+    # 3. Trailing skills
+    skills: List = sections.get("skills", [])
+    while skills and not fits():
+        skills.pop()
+    if "skills" in sections and not skills:
+        del sections["skills"]
+
+    # 4. Longest bullets
+    bullet_lists = [
+        entry[field]
+        for name, field in _BULLET_FIELDS.items()
+        for entry in sections.get(name, [])
+        if isinstance(entry, dict) and isinstance(entry.get(field), list)
+    ]
+    while not fits():
+        bullets = [(len(b), n, i) for n, lst in enumerate(bullet_lists) for i, b in enumerate(lst)]
+        if not bullets:
+            break
+        _, n, i = max(bullets)
+        del bullet_lists[n][i]
+
+    if not fits():
+        logger.warning(f"Resume sections still exceed the {budget} token prompt budget after trimming")
+    return sections
+
+
+def compact_resume(resume_data: Dict, budget: int = PROMPT_RESUME_TOKEN_BUDGET) -> Dict:
+    """
+    Reduce a ResumeContent dict to the sections the optimization prompt needs.
+
+    Args:
+        resume_data: ResumeContent.dict(), or sections from select_sections()
+        budget: Token budget for the serialised sections
+
+    Returns:
+        The selected, trimmed sections; serialise_sections() gives their
+        prompt form, and restore_trimmed() puts what was trimmed back
+        into the model's answer
+    """
+    before = estimate_tokens(str(resume_data))
+    sections = fit_to_budget(select_sections(resume_data), budget)
+    after = estimate_tokens(serialise_sections(sections))
+    prompt_resume_tokens.observe(before, stage="before")
+    prompt_resume_tokens.observe(after, stage="after")
+    logger.info(f"Compacted resume for the prompt: ~{before} -> ~{after} tokens (budget {budget})")
+    return sections
+
+
+def submitted_items(name: str, entries: List) -> List:
+    """
+    Entries of a rewritten section in the optimization response shape,
+    with the text as the user wrote it.
+
+    Args:
+        name: Section name in REWRITTEN_SECTIONS
+        entries: The section's entries from select_sections()
+    """
+    if name == "skills":
+        return list(entries)
+    if name == "projects":
+        return [
+            {"title": project.get("title", ""), "description": " ".join(project.get("description", []))}
+            for project in entries
+        ]
+    return [
+        {
+            "role": role.get("role", ""),
+            "company": role.get("company", ""),
+            "duration": role.get("dates", ""),
+            "details": list(role.get("description", [])),
+        }
+        for role in entries
+    ]
+
+
+def _left_out(submitted: List, sent: List) -> List:
+    # Items of submitted missing from sent, in submitted order
+    remaining = Counter(item for item in sent if isinstance(item, str))
+    left_out = []
+    for item in submitted:
+        if remaining.get(item):
+            remaining[item] -= 1
+        else:
+            left_out.append(item)
+    return left_out
+
+
+def missing_sections(result: Dict, prompt_sections: Dict) -> List[str]:
+    """
+    Sections a single-prompt answer lacks entries for, compared to what was sent.
+
+    Repaired JSON from a cut-off response keeps only its complete entries,
+    so a shorter section means the answer is partial. Labels are
+    "technical_skills", "projects" and "experience[i]" for each role.
+    """
+    missing = []
+    if prompt_sections.get("skills") and not result.get("technical_skills"):
+        missing.append("technical_skills")
+    if len(result.get("projects") or []) < len(prompt_sections.get("projects", [])):
+        missing.append("projects")
+    returned = len(result.get("experience") or [])
+    missing.extend(f"experience[{i}]" for i in range(returned, len(prompt_sections.get("experience", []))))
+    return missing
+
+
+def restore_trimmed(result: Dict, sections: Dict, prompt_sections: Dict) -> Dict:
+    """
+    Put what fit_to_budget left out of the prompt back into an optimization result.
+
+    The model never saw trimmed content, so it comes back as submitted:
+    skills after the optimized ones (unless already there), bullets at
+    the end of their optimized entry, and entries after the optimized
+    ones. Entries are matched to the result by position. An empty result
+    (the call failed) is returned as is.
+
+    Args:
+        result: Optimized sections in the response shape
+        sections: The resume's sections as select_sections() returned them
+        prompt_sections: The trimmed copy the prompt was built from
+
+    Returns:
+        A new result; the arguments are not modified
+    """
+    if not any(result.values()):
+        return result
+    restored = dict(result)
+
+    skills = _left_out(sections.get("skills", []), prompt_sections.get("skills", []))
+    if skills:
+        optimized = list(restored.get("technical_skills") or [])
+        present = {s.lower() for s in optimized if isinstance(s, str)}
+        optimized.extend(s for s in skills if s.lower() not in present)
+        restored["technical_skills"] = optimized
+
+    for name, field in _BULLET_FIELDS.items():
+        submitted, sent = sections.get(name, []), prompt_sections.get(name, [])
+        items = [dict(item) if isinstance(item, dict) else item for item in restored.get(name) or []]
+        changed = False
+        for index, entry in enumerate(sent):
+            bullets = _left_out(submitted[index].get(field, []), entry.get(field, []))
+            if not bullets or index >= len(items) or not isinstance(items[index], dict):
+                continue
+            item = items[index]
+            if name == "projects":
+                item["description"] = " ".join(filter(None, [str(item.get("description") or ""), *bullets]))
+            else:
+                item["details"] = list(item.get("details") or []) + bullets
+            changed = True
+        if len(submitted) > len(sent):
+            items.extend(submitted_items(name, submitted[len(sent):]))
+            changed = True
+        if changed:
+            restored[name] = items
+
+    return restored
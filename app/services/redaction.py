@@ -0,0 +1,165 @@
+# app/services/redaction.py
+import re
+from typing import Iterable, List, NamedTuple, Tuple
+
+MULTI_SPACE_PATTERN = re.compile(r' {2,}')
+NEWLINE_RUN_PATTERN = re.compile(r'\n\s*\n\s*\n')
+
+# Span kinds; at the same offset a value sorts before whitespace
+_VALUE, _WHITESPACE = 0, 1
+
+
+class RedactionTerm(NamedTuple):
+    value: str
+    ignore_case: bool = False
+    whole_word: bool = False
+
+
+def normalise_whitespace(run: str) -> str:
+    """
+    Normalise one whitespace run.
+
+    Three or more newlines collapse to a blank line (the span between the
+    first and the last newline becomes '\\n\\n'), then runs of spaces become
+    a single space.
+    """
+    if run.count('\n') >= 3:
+        run = run[:run.index('\n')] + '\n\n' + run[run.rindex('\n') + 1:]
+    return MULTI_SPACE_PATTERN.sub(' ', run)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """Same test as the regex \\b at text[index]."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+class Redactor:
+    """
+    Removes a set of values from a document in one linear rewrite.
+
+    Occurrences of every value, and every whitespace run that needs
+    normalising, are located first with C-level substring searches
+    (str.find on the text or its lower-cased copy). A single left-to-right
+    walk over those spans then copies the text that is kept. It drops the
+    removed values, and merges and normalises the whitespace around them, so
+    no cleanup passes are left. Leading and trailing whitespace is dropped.
+
+    Removal is simultaneous, not one value after another as a chain of
+    re.sub/str.replace calls would do, so where values overlap the result
+    can differ from such a chain:
+
+    - Values are matched in the original text. Where matches overlap, the
+      leftmost wins, and at equal offsets the longest (as in a
+      longest-first alternation). A value contained in another, such as a
+      name inside an email address or URL, therefore no longer breaks up
+      the longer value first. The term order does not matter.
+    - Removing a value never joins text into a new match.
+    - Values are stripped of surrounding whitespace before matching.
+    """
+
+    def __init__(self, terms: Iterable[RedactionTerm]):
+        self.terms: List[RedactionTerm] = []
+        seen = set()
+        for term in terms:
+            value = term.value.strip()
+            key = (value.lower() if term.ignore_case else value, term.ignore_case, term.whole_word)
+            if value and key not in seen:
+                seen.add(key)
+                self.terms.append(RedactionTerm(value, term.ignore_case, term.whole_word))
+
+    def _value_spans(self, text: str) -> List[Tuple[int, int, int]]:
+        spans = []
+        lowered = None
+        for term in self.terms:
+            if term.ignore_case:
+                if lowered is None:
+                    lowered = text.lower()
+                if len(lowered) != len(text):
+                    # Case mapping changed the length, so offsets would not line up
+                    pattern = re.compile(re.escape(term.value), re.IGNORECASE)
+                    spans.extend(
+                        (m.start(), m.end(), _VALUE) for m in pattern.finditer(text)
+                        if not term.whole_word
+                        or (_at_word_boundary(text, m.start()) and _at_word_boundary(text, m.end()))
+                    )
+                    continue
+                haystack, needle = lowered, term.value.lower()
+            else:
+                haystack, needle = text, term.value
+
+            start = haystack.find(needle)
+            while start != -1:
+                end = start + len(needle)
+                if not term.whole_word or (
+                    _at_word_boundary(text, start) and _at_word_boundary(text, end)
+                ):
+                    spans.append((start, end, _VALUE))
+                start = haystack.find(needle, start + 1)
+        return spans
+
+    @staticmethod
+    def _whitespace_spans(text: str) -> List[Tuple[int, int, int]]:
+        # Only runs that normalisation would change: 2+ spaces or 3+ newlines
+        starts = [m.start() for m in NEWLINE_RUN_PATTERN.finditer(text)]
+        index = text.find('  ')
+        while index != -1:
+            starts.append(index)
+            index = text.find('  ', index + 2)
+
+        spans = []
+        for start in starts:
+            end = start
+            while start > 0 and text[start - 1].isspace():
+                start -= 1
+            while end < len(text) and text[end].isspace():
+                end += 1
+            spans.append((start, end, _WHITESPACE))
+        return spans
+
+    def apply(self, text: str) -> str:
+        """
+        Return text with every term removed and whitespace normalised.
+
+        Args:
+            text: Document to clean
+
+        Returns:
+            Cleaned document
+        """
+        spans = self._value_spans(text) + self._whitespace_spans(text)
+        spans.sort(key=lambda span: (span[0], span[2], span[0] - span[1]))
+
+        out: List[str] = []
+        pending_ws = ""  # whitespace not yet written, merged across removals
+
+        def emit(segment: str) -> None:
+            nonlocal pending_ws
+            if not segment:
+                return
+            core = segment.lstrip()
+            pending_ws += segment[:len(segment) - len(core)]
+            if not core:
+                return
+            stripped = core.rstrip()
+            if out and pending_ws:
+                out.append(normalise_whitespace(pending_ws))
+            out.append(stripped)
+            pending_ws = core[len(stripped):]
+
+        position = 0
+        for start, end, kind in spans:
+            if start < position:
+                continue  # overlaps a span already consumed
+            emit(text[position:start])
+            if kind == _WHITESPACE:
+                pending_ws += text[start:end]
+            position = end
+        emit(text[position:])
+
+        return ''.join(out)
@@ -0,0 +1,209 @@
+# app/services/resonance.py
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# Terms are hashed into this many buckets; collisions at 2**20 are rare enough to ignore
+HASH_BITS = 20
+# Share of the overall score taken by vector similarity; the rest is JD keyword coverage
+SIMILARITY_WEIGHT = 0.5
+KEYWORD_LIMIT = 15
+
+# Keeps tech spellings whole: c++, c#, node.js, ci/cd, front-end
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./\-][a-z0-9+#]+)*")
+_SEGMENT_PATTERN = re.compile(r"(?:\n|[.;!?](?:\s|$))+")
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each etc few for from further had has have having he her here hers him his how i if in
+into is it its itself just me more most must my no nor not of off on once only or other our ours out
+over own per same she should so some such than that the their them then there these they this those
+through to too under until up us very via was we were what when where which while who whom why will
+with within without would you your yours
+able across work working works strong plus etc ability using use used including include includes
+experience experienced year years responsibilities requirements required preferred role team
+looking seeking join candidate ideal opportunity position job skills knowledge good great excellent
+new well like ensure help apply now
+""".split())
+
+@lru_cache(maxsize=65536)
+def _bucket(term: str) -> int:
+    # crc32, unlike hash(), is stable across processes and restarts
+    return zlib.crc32(term.encode("utf-8")) & ((1 << HASH_BITS) - 1)
+
+
+@lru_cache(maxsize=512)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Lower-cased keywords of text without stopwords, followed by their adjacent bigrams."""
+    words = [
+        word for word in (w.rstrip(".-") for w in _TOKEN_PATTERN.findall(text.lower()))
+        if len(word) > 1 and word not in STOPWORDS and any(c.isalpha() for c in word)
+    ]
+    return tuple(words) + tuple(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+
+class JobTerms(NamedTuple):
+    """Tokenised job description, reusable across scores."""
+    terms: Tuple[str, ...]
+    segments: Tuple[Tuple[str, ...], ...]  # one per sentence or line, for IDF
+
+
+def job_terms(job_description: str) -> JobTerms:
+    """Tokenise a job description as a whole and per sentence."""
+    text = job_description or ""
+    return JobTerms(
+        tokenize(text),
+        tuple(tokenize(segment) for segment in _SEGMENT_PATTERN.split(text) if segment.strip()),
+    )
+
+
+def top_keywords(job: JobTerms, limit: int = KEYWORD_LIMIT) -> List[str]:
+    """The job description's single-word keywords by sublinear TF x IDF over its sentences."""
+    counts, vocabulary = _count_matrix([job.terms, *job.segments])
+    weights = _weigh(counts[:1], counts[1:]).toarray().ravel()
+    names = {_bucket(term): term for term in job.terms if " " not in term}
+    ranked = sorted(
+        (i for i, bucket in enumerate(vocabulary) if bucket in names and weights[i] > 0),
+        key=lambda i: (-weights[i], names[vocabulary[i]]),
+    )
+    return [names[vocabulary[i]] for i in ranked[:limit]]
+
+
+def _join(values) -> str:
+    return "\n".join(str(v) for v in values if v)
+
+
+def section_texts(resume_data: Dict) -> Dict[str, str]:
+    """Plain text of each non-empty ResumeContent section."""
+    texts = {
+        "summary": resume_data.get("summary") or "",
+        "skills": _join(resume_data.get("skills") or []),
+        "experience": _join(
+            _join([item.get("role"), item.get("company"), *item.get("description", [])])
+            for item in resume_data.get("experience") or []
+        ),
+        "projects": _join(
+            _join([item.get("title"), *item.get("description", [])])
+            for item in resume_data.get("projects") or []
+        ),
+        "education": _join(
+            _join([item.get("degree"), item.get("college")]) for item in resume_data.get("education") or []
+        ),
+        "certifications": _join(resume_data.get("certifications") or []),
+        "languages": _join(resume_data.get("languages") or []),
+    }
+    return {name: text for name, text in texts.items() if text.strip()}
+
+
+def _count_matrix(docs: Sequence[Tuple[str, ...]]) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Term counts of docs over their joint hashed vocabulary.
+
+    Returns the (docs x vocabulary) count matrix and the hash bucket of
+    each vocabulary column.
+    """
+    lengths = [len(doc) for doc in docs]
+    rows = np.repeat(np.arange(len(docs)), lengths)
+    buckets = np.fromiter((_bucket(term) for doc in docs for term in doc), dtype=np.int64, count=sum(lengths))
+    vocabulary, columns = np.unique(buckets, return_inverse=True)
+    counts = sparse.csr_matrix(
+        (np.ones(len(columns)), (rows, columns)), shape=(len(docs), len(vocabulary))
+    )
+    counts.sum_duplicates()
+    return counts, vocabulary
+
+
+def _normalise_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def _weigh(counts: sparse.csr_matrix, segment_counts: sparse.csr_matrix) -> sparse.csr_matrix:
+    # Sublinear TF times smoothed IDF over the segments
+    document_frequency = np.asarray((segment_counts > 0).sum(axis=0)).ravel()
+    idf = np.log((1 + segment_counts.shape[0]) / (1 + document_frequency)) + 1.0
+    weights = counts.copy()
+    weights.data = 1.0 + np.log(weights.data)
+    return weights @ sparse.diags(idf)
+
+
+def score_resume(resume_data: Dict, job_description: str) -> Dict:
+    """Score a resume against job description text; see score_against."""
+    return score_against(resume_data, job_terms(job_description))
+
+
+def score_against(resume_data: Dict, job: JobTerms) -> Dict:
+    """
+    Score how well a resume matches a tokenised job description, without the model.
+
+    Both sides are tokenised into keywords and bigrams, hashed into sparse
+    term vectors and weighted by sublinear TF times an IDF taken over the
+    job description's sentences and the resume's sections, so terms that
+    appear everywhere count little. The overall score (0-100) blends the
+    cosine similarity of the resume and job description vectors with the
+    share of the job description's keyword weight the resume covers.
+
+    Args:
+        resume_data: ResumeContent.dict()
+        job: job_terms() of the posting (precomputed by the job description store)
+
+    Returns:
+        {"score", "similarity", "keyword_coverage", "sections":
+        {name: {"similarity", "keyword_coverage"}}, "matched_keywords",
+        "missing_keywords"}; keywords are ordered by weight
+    """
+    sections = section_texts(resume_data)
+    # Sections carry what the user is editing; the raw text only stands in when none were filled
+    resume_text = _join(sections.values()) or resume_data.get("extracted_text") or resume_data.get("raw_markdown") or ""
+    jd_terms = job.terms
+    resume_terms = tokenize(resume_text)
+    section_names = list(sections)
+    segments = [*job.segments, *(tokenize(sections[name]) for name in section_names)]
+
+    docs = [jd_terms, resume_terms, *(tokenize(sections[name]) for name in section_names), *segments]
+    counts, vocabulary = _count_matrix(docs)
+    n_docs = 2 + len(section_names)
+    tf, segment_counts = counts[:n_docs], counts[n_docs:]
+
+    weights = _weigh(tf, segment_counts)
+
+    unit = _normalise_rows(weights)
+    similarities = np.asarray((unit @ unit[0].T).todense()).ravel()
+
+    jd_weights = np.asarray(weights[0].todense()).ravel()
+    jd_total = jd_weights.sum()
+    present = np.asarray((tf > 0).todense())
+
+    def coverage(row: int) -> float:
+        return float(jd_weights[present[row]].sum() / jd_total) if jd_total else 0.0
+
+    similarity = float(similarities[1])
+    keyword_coverage = coverage(1)
+
+    # Name the JD's single-word columns; bigrams score but are not listed as keywords
+    buckets_of = {_bucket(term): term for term in jd_terms if " " not in term}
+    column_terms = {i: buckets_of[b] for i, b in enumerate(vocabulary) if b in buckets_of}
+
+    def keywords(mask: np.ndarray) -> List[str]:
+        ranked = sorted(
+            (i for i in np.flatnonzero(mask & (jd_weights > 0)) if i in column_terms),
+            key=lambda i: (-jd_weights[i], column_terms[i]),
+        )
+        return [column_terms[i] for i in ranked[:KEYWORD_LIMIT]]
+
+    return {
+        "score": round(100 * (SIMILARITY_WEIGHT * similarity + (1 - SIMILARITY_WEIGHT) * keyword_coverage)),
+        "similarity": round(similarity, 4),
+        "keyword_coverage": round(keyword_coverage, 4),
+        "sections": {
+            name: {"similarity": round(float(similarities[2 + i]), 4), "keyword_coverage": round(coverage(2 + i), 4)}
+            for i, name in enumerate(section_names)
+        },
+        "matched_keywords": keywords(present[1]),
+        "missing_keywords": keywords(~present[1]),
+    }
@@ -0,0 +1,138 @@
+# app/services/resume_document.py
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# Common resume section headers
+SECTION_HEADERS = frozenset({
+    'EXPERIENCE', 'WORK EXPERIENCE', 'EMPLOYMENT', 'CAREER',
+    'EDUCATION', 'ACADEMIC BACKGROUND', 'QUALIFICATIONS',
+    'SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES',
+    'SUMMARY', 'PROFILE', 'OBJECTIVE', 'ABOUT',
+    'PROJECTS', 'KEY PROJECTS', 'ACHIEVEMENTS',
+    'CERTIFICATIONS', 'CERTIFICATES', 'LICENSES',
+    'CONTACT', 'CONTACT INFORMATION', 'PERSONAL DETAILS',
+    'PUBLICATIONS', 'AWARDS', 'HONORS', 'LANGUAGES'
+})
+
+# Section headers that belong to each logical section, in lookup order
+SECTION_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'education': ('EDUCATION', 'ACADEMIC BACKGROUND'),
+    'experience': ('EXPERIENCE', 'WORK EXPERIENCE', 'EMPLOYMENT', 'CAREER'),
+    'skills': ('SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES'),
+    'projects': ('PROJECTS', 'KEY PROJECTS'),
+    'summary': ('SUMMARY', 'PROFILE', 'OBJECTIVE', 'ABOUT'),
+    'certifications': ('CERTIFICATIONS', 'CERTIFICATES', 'LICENSES'),
+    'languages': ('LANGUAGES',),
+}
+
+HEADING_PATTERNS = (
+    re.compile(r'^(Chapter|Section|Part|Article)\s+\d+', re.IGNORECASE),
+    re.compile(r'^\d+\.\s+[A-Z][a-zA-Z\s]+$', re.IGNORECASE),  # "1. Introduction"
+    re.compile(r'^[IVX]+\.\s+[A-Z]', re.IGNORECASE),  # Roman numerals
+)
+
+
+def normalise_title(line: str) -> str:
+    """Reduce a heading line to its bare upper-case title ('### Skills:' -> 'SKILLS')."""
+    return line.strip().lstrip('#').strip().rstrip(':').strip().upper()
+
+
+def is_heading(line: str) -> bool:
+    """
+    Detect if a line is likely a heading/section title.
+
+    Args:
+        line: Text line to analyze
+
+    Returns:
+        True if line appears to be a heading
+    """
+    if not line or len(line.strip()) < 2:
+        return False
+
+    line = line.strip()
+
+    # All caps and reasonable length
+    if line.isupper() and 3 <= len(line) <= 50:
+        return True
+
+    # Common resume section headers
+    if line.upper() in SECTION_HEADERS:
+        return True
+
+    # Pattern-based detection
+    return any(pattern.match(line) for pattern in HEADING_PATTERNS)
+
+
+class ResumeDocument:
+    """
+    Resume text split into lines once, with heading flags and a section index.
+
+    Built in a single pass over the text. Extractors take section bodies as
+    slices of the original text instead of searching the whole document.
+    Section bodies run from a known section header (SECTION_HEADERS) to the
+    next one, so an all-caps college or company name inside a section does
+    not cut it short.
+    """
+
+    def __init__(self, text: str):
+        """
+        Index the document.
+
+        Args:
+            text: Raw text content from PDF (or markdown)
+        """
+        self.text = text
+        self.lines: List[str] = text.split('\n')
+        self.line_offsets: List[int] = []
+        self.heading_flags: List[bool] = []
+        # First occurrence of each section header -> (body start, body end) offsets
+        self.sections: Dict[str, Tuple[int, int]] = {}
+
+        open_title = None
+        open_start = 0
+        offset = 0
+        for line in self.lines:
+            self.line_offsets.append(offset)
+            line_end = offset + len(line)
+            self.heading_flags.append(is_heading(line))
+
+            title = normalise_title(line)
+            if title in SECTION_HEADERS:
+                if open_title is not None:
+                    self.sections.setdefault(open_title, (open_start, max(open_start, offset - 1)))
+                open_title = title
+                open_start = min(line_end + 1, len(text))
+            offset = line_end + 1
+
+        if open_title is not None:
+            self.sections.setdefault(open_title, (open_start, len(text)))
+
+    def section_span(self, name: str) -> Tuple[int, int]:
+        """
+        Return the (start, end) text offsets of a logical section's body.
+
+        Args:
+            name: Key of SECTION_ALIASES (e.g. 'education') or a raw header title
+
+        Returns:
+            Offsets into self.text, or (0, 0) if the section is absent
+        """
+        for title in SECTION_ALIASES.get(name, (name.upper(),)):
+            if title in self.sections:
+                return self.sections[title]
+        return (0, 0)
+
+    def section(self, name: str) -> str:
+        """Return the stripped body text of a logical section, '' if absent."""
+        start, end = self.section_span(name)
+        return self.text[start:end].strip()
+
+    def has_section(self, name: str) -> bool:
+        return self.section_span(name) != (0, 0)
+
+    def headings(self) -> Iterable[Tuple[int, str]]:
+        """Yield (line number, stripped text) of every heading line."""
+        for line_no, flag in enumerate(self.heading_flags):
+            if flag:
+                yield line_no, self.lines[line_no].strip()
@@ -1,71 +1,250 @@
+import os
 import json
-import re
-from ..client.ai_client import client
-
-def fix_common_json_issues(json_str: str) -> str:
-    """Fix common JSON formatting issues"""
-    # Remove any trailing commas before closing braces/brackets
-    json_str = re.sub(r',\s*}', '}', json_str)
-    json_str = re.sub(r',\s*]', ']', json_str)
-    
-    # Fix incomplete objects by ensuring they have closing braces
-    # Count opening and closing braces
-    open_braces = json_str.count('{')
-    close_braces = json_str.count('}')
-    
-    # Add missing closing braces
-    if open_braces > close_braces:
-        missing_braces = open_braces - close_braces
-        json_str += '}' * missing_braces
-    
-    # Count opening and closing brackets
-    open_brackets = json_str.count('[')
-    close_brackets = json_str.count(']')
-    
-    # Add missing closing brackets
-    if open_brackets > close_brackets:
-        missing_brackets = open_brackets - close_brackets
-        json_str += ']' * missing_brackets
-    
-    return json_str
+import asyncio
+import logging
+from typing import AsyncIterator, Dict
+from ..client.ai_client import get_ai_client
+from .ai_dispatcher import AIDispatcher, estimate_call_tokens, usage_tokens
+from .json_repair import repair_json
+from .json_stream import JsonArrayItemStream
+from .metrics import counter, histogram
+from .prompt_builder import estimate_tokens, serialise_sections
+from .timing import span
+
+logger = logging.getLogger(__name__)
+
+AI_MODEL = "gemini-2.0-flash-001"
+
+# Concurrent Gemini calls per process, and the limit for one call (excluding the wait for a slot)
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", "60"))
+
+# Admits calls fairly across users and within the provider's per-minute quotas
+ai_dispatcher = AIDispatcher(AI_MAX_CONCURRENCY)
+
+# Array sections of the optimization response, in prompt order
+OPTIMIZED_SECTIONS = ("technical_skills", "projects", "experience")
+
+ai_calls_total = counter(
+    "ai_calls_total",
+    "Gemini optimization calls by outcome",
+)
+ai_time_to_first_item_seconds = histogram(
+    "ai_time_to_first_item_seconds",
+    "Time from a streamed optimization request to its first complete section item",
+)
+
 
-def try_extract_partial_json(json_str: str) -> dict:
-    """Try to extract valid parts from malformed JSON"""
+async def generate_text(
+    prompt: str,
+    timeout: float | None = None,
+    cached_content: str | None = None,
+) -> str:
+    """
+    Send one prompt to the model and return its text ("" if it had none).
+
+    Waits for the dispatcher first (one of the AI_MAX_CONCURRENCY slots,
+    the per-minute budgets and the caller's fair share); the timeout
+    (AI_TIMEOUT_SECONDS by default) covers only the call itself.
+    cached_content names a provider-side context cache the prompt follows.
+
+    Raises:
+        asyncio.TimeoutError: If the model call took longer than timeout
+    """
+    config = None
+    if cached_content is not None:
+        from google.genai import types
+
+        config = types.GenerateContentConfig(cached_content=cached_content)
+
+    with span("ai_queue"):
+        charge = await ai_dispatcher.acquire(estimate_call_tokens(prompt))
+    response = None
     try:
-        # Try to find the technical_skills array
-        technical_skills = []
-        skills_match = re.search(r'"technical_skills"\s*:\s*\[(.*?)\]', json_str, re.DOTALL)
-        if skills_match:
-            skills_content = skills_match.group(1)
-            # Extract strings from the array
-            skill_matches = re.findall(r'"([^"]+)"', skills_content)
-            technical_skills = skill_matches
-        
+        with span("ai_call"):
+            response = await asyncio.wait_for(
+                get_ai_client().aio.models.generate_content(
+                    model=AI_MODEL,
+                    contents=prompt,
+                    config=config
+                ),
+                timeout or AI_TIMEOUT_SECONDS,
+            )
+    finally:
+        ai_dispatcher.release(charge, usage_tokens(response))
+    return (response.text if response else None) or ""
+
+
+async def call_ai_for_optimization(
+    ai_data: dict,
+    job_description: str,
+    additional_info: str | None,
+    timeout: float | None = None,
+    context_cache=None,
+) -> dict:
+    """
+    Call AI to optimize resume sections and return JSON dict.
+
+    Uses the async Gemini client, so the event loop keeps serving while the
+    model works. At most AI_MAX_CONCURRENCY calls run at once; the rest wait
+    their turn at the dispatcher. Cancelling the calling task cancels the request.
+
+    With a context_cache (context_cache.ContextCache) the resume context
+    goes through it and only the job part is sent per call.
+
+    Raises:
+        asyncio.TimeoutError: If the model call took longer than timeout
+            (AI_TIMEOUT_SECONDS by default)
+    """
+    with span("prompt_build"):
+        if context_cache is None:
+            prompt = build_optimization_prompt(ai_data, job_description, additional_info)
+        else:
+            context = build_resume_context(ai_data)
+            job_prompt = build_job_prompt(job_description, additional_info)
+
+    try:
+        if context_cache is None:
+            response_text = await generate_text(prompt, timeout)
+        else:
+            response_text = await context_cache.generate(context, job_prompt, timeout)
         
-        # For projects and experience, return empty arrays if parsing fails
-        # This ensures the system continues to work even with partial data
+        if not response_text:
+            logger.warning("Empty AI response")
+            ai_calls_total.inc(outcome="empty")
+            return {}
+
+        ai_calls_total.inc(outcome="ok")
+        with span("json_repair"):
+            return parse_optimization_response(response_text)
+    
+    except asyncio.TimeoutError:
+        ai_calls_total.inc(outcome="timeout")
+        raise
+    except asyncio.CancelledError:
+        ai_calls_total.inc(outcome="cancelled")
+        raise
+    except Exception as e:
+        ai_calls_total.inc(outcome="error")
+        logger.error(f"Error in AI call: {e}")
         return {
-            "technical_skills": technical_skills,
+            "technical_skills": [],
             "projects": [],
             "experience": []
         }
-        
+
+
+async def stream_ai_optimization(
+    ai_data: dict,
+    job_description: str,
+    additional_info: str | None,
+    timeout: float | None = None,
+) -> AsyncIterator[Dict]:
+    """
+    Streaming variant of call_ai_for_optimization.
+
+    Reads the response with generate_content_stream and yields
+    {"section", "index", "item"} as soon as each element of
+    technical_skills, projects or experience is complete, then a final
+    {"result": ...} holding exactly what call_ai_for_optimization would
+    have returned for the same text. Goes through the same dispatcher, and
+    the timeout covers the whole stream.
+
+    Raises:
+        asyncio.TimeoutError: If the stream did not finish within timeout
+            (AI_TIMEOUT_SECONDS by default)
+    """
+    with span("prompt_build"):
+        prompt = build_optimization_prompt(ai_data, job_description, additional_info)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + (timeout or AI_TIMEOUT_SECONDS)
+    items = JsonArrayItemStream(OPTIMIZED_SECTIONS)
+    chunks = []
+    chunk = None
+    first_item = True
+
+    try:
+        with span("ai_queue"):
+            charge = await ai_dispatcher.acquire(estimate_call_tokens(prompt))
+        try:
+            with span("ai_call"):
+                stream = await asyncio.wait_for(
+                    get_ai_client().aio.models.generate_content_stream(
+                        model=AI_MODEL,
+                        contents=prompt
+                    ),
+                    deadline - loop.time(),
+                )
+                chunk_iterator = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            chunk_iterator.__anext__(), max(0.0, deadline - loop.time())
+                        )
+                    except StopAsyncIteration:
+                        break
+                    text = chunk.text or ""
+                    chunks.append(text)
+                    for section, index, item in items.feed(text):
+                        if first_item:
+                            first_item = False
+                            ai_time_to_first_item_seconds.observe(loop.time() - started)
+                        yield {"section": section, "index": index, "item": item}
+        finally:
+            # Usage is reported on the last chunk
+            ai_dispatcher.release(charge, usage_tokens(chunk))
+
+        response_text = "".join(chunks)
+        if not response_text:
+            logger.warning("Empty AI response")
+            ai_calls_total.inc(outcome="empty")
+            yield {"result": {}}
+            return
+
+        ai_calls_total.inc(outcome="ok")
+        with span("json_repair"):
+            result = parse_optimization_response(response_text)
+        yield {"result": result}
+
+    except asyncio.TimeoutError:
+        ai_calls_total.inc(outcome="timeout")
+        raise
+    except asyncio.CancelledError:
+        ai_calls_total.inc(outcome="cancelled")
+        raise
     except Exception as e:
-        print(f"Partial extraction failed: {e}")
-        return {
+        ai_calls_total.inc(outcome="error")
+        logger.error(f"Error in AI call: {e}")
+        yield {"result": {
             "technical_skills": [],
             "projects": [],
             "experience": []
-        }
+        }}
+
+
+def build_optimization_prompt(ai_data: dict, job_description: str, additional_info: str | None) -> str:
+    """
+    Build the optimization prompt for the resume sections.
 
-def call_ai_for_optimization(ai_data: dict, job_description: str, additional_info: str | None) -> dict:
-    """Call AI to optimize resume sections and return JSON dict"""
-    prompt = f"""
+    ai_data should already be reduced by prompt_builder.compact_resume;
+    it is embedded as compact JSON. The prompt is the resume context
+    followed by the job part, so prompts for one resume share a prefix.
+    """
+    prompt = build_resume_context(ai_data) + build_job_prompt(job_description, additional_info)
+    logger.info(f"Optimization prompt: ~{estimate_tokens(prompt)} tokens")
+    return prompt
+
+
+def build_resume_context(ai_data: dict) -> str:
+    """The job-independent part of the optimization prompt: instructions, format and resume"""
+    return f"""
 You are an expert career coach and professional resume writer.
 
 CRITICAL: Return ONLY valid JSON. No explanations, no markdown, no extra text.
 
-Task: Optimize these resume sections for the job description:
+Task: Optimize these resume sections for the job description that follows:
 - technical_skills: Array of skill strings  
 - projects: Array of objects with "title" and "description"
 - experience: Array of objects with "role", "company", "duration", and "details"
@@ -89,11 +268,66 @@ Required JSON format (copy this structure exactly):
   ]
 }}
 
+Resume Data to Optimize:
+{serialise_sections(ai_data)}
+"""
+
+
+def build_job_prompt(job_description: str, additional_info: str | None) -> str:
+    """The job-specific part of the optimization prompt, sent after the resume context"""
+    return f"""
 Job Description:
 {job_description}
 
-Resume Data to Optimize:
-{ai_data}
+Additional Context:
+{additional_info or "None"}
+
+Return optimized JSON now:
+"""
+
+
+# Output format per optimized section: (description, example)
+SECTION_FORMATS = {
+    "technical_skills": (
+        "Array of skill strings",
+        '["skill1", "skill2"]',
+    ),
+    "projects": (
+        'Array of objects with "title" and "description"',
+        '[{"title": "Project Name", "description": "Brief description"}]',
+    ),
+    "experience": (
+        'Array with exactly one object with "role", "company", "duration", and "details"',
+        '[{"role": "Job Title", "company": "Company Name", "duration": "2022-2023", '
+        '"details": ["Achievement 1", "Achievement 2"]}]',
+    ),
+}
+
+
+def build_section_prompt(
+    section: str,
+    section_data,
+    job_description: str,
+    additional_info: str | None,
+) -> str:
+    """Build the prompt that optimizes one section (or one experience role) on its own"""
+    description, example = SECTION_FORMATS[section]
+    return f"""
+You are an expert career coach and professional resume writer.
+
+CRITICAL: Return ONLY valid JSON. No explanations, no markdown, no extra text.
+
+Task: Optimize this resume section for the job description:
+- {section}: {description}
+
+Required JSON format:
+{{"{section}": {example}}}
+
+Job Description:
+{job_description}
+
+Resume Section to Optimize:
+{serialise_sections(section_data)}
 
 Additional Context:
 {additional_info or "None"}
@@ -101,66 +335,48 @@ Additional Context:
 Return optimized JSON now:
 """
 
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash-001",
-            contents=prompt
-        )
-        
-        if not response or not response.text:
-            print("Empty AI response")
-            return {}
 
-        optimized_text = response.text.strip()
-        print(f"Raw AI response: {optimized_text[:200]}...")  # Debug: first 200 chars
+def decode_model_json(response_text: str):
+    """Strip code fences from model output and parse it, repairing malformed or truncated JSON"""
+    optimized_text = response_text.strip()
 
-        # Clean up potential markdown formatting
-        if optimized_text.startswith("```json"):
-            optimized_text = optimized_text.removeprefix("```json").strip()
-        elif optimized_text.startswith("```"):
-            optimized_text = optimized_text.removeprefix("```").strip()
-        if optimized_text.endswith("```"):
-            optimized_text = optimized_text.removesuffix("```").strip()
+    # Clean up potential markdown formatting
+    if optimized_text.startswith("```json"):
+        optimized_text = optimized_text.removeprefix("```json").strip()
+    elif optimized_text.startswith("```"):
+        optimized_text = optimized_text.removeprefix("```").strip()
+    if optimized_text.endswith("```"):
+        optimized_text = optimized_text.removesuffix("```").strip()
 
-        print(f"Cleaned AI response length: {len(optimized_text)} chars")  # Debug: length
-        
-        # Try to fix common JSON issues before parsing
-        optimized_text = fix_common_json_issues(optimized_text)
+    # Well-formed output takes the fast C parser; anything else is repaired in one pass,
+    # keeping every complete item when the response was cut off
+    try:
+        return json.loads(optimized_text)
+    except json.JSONDecodeError:
+        return repair_json(optimized_text)
 
-        # Safely parse JSON
-        try:
-            optimized_json = json.loads(optimized_text)
-            
-            # Validate structure
-            if not isinstance(optimized_json, dict):
-                return {}
-                
-            # Ensure required keys exist with proper types
-            required_keys = {
-                "technical_skills": list,
-                "projects": list,
-                "experience": list
-            }
-            
-            for key, expected_type in required_keys.items():
-                if key not in optimized_json:
-                    print(f"Missing key in AI response: {key}")
-                    optimized_json[key] = []
-                elif not isinstance(optimized_json[key], expected_type):
-                    print(f"Wrong type for {key}: expected {expected_type}, got {type(optimized_json[key])}")
-                    optimized_json[key] = []
-                    
-            return optimized_json
-            
-        except json.JSONDecodeError as e:
-            
-            # Try to extract valid parts if possible
-            return try_extract_partial_json(optimized_text)
+
+def parse_optimization_response(response_text: str) -> dict:
+    """Turn the raw model output into the optimized sections dict"""
+    optimized_json = decode_model_json(response_text)
+        
+    # Validate structure
+    if not isinstance(optimized_json, dict):
+        return {}
+        
+    # Ensure required keys exist with proper types
+    required_keys = {
+        "technical_skills": list,
+        "projects": list,
+        "experience": list
+    }
+    
+    for key, expected_type in required_keys.items():
+        if key not in optimized_json:
+            logger.warning(f"Missing key in AI response: {key}")
+            optimized_json[key] = []
+        elif not isinstance(optimized_json[key], expected_type):
+            logger.warning(f"Wrong type for {key}: expected {expected_type.__name__}, got {type(optimized_json[key]).__name__}")
+            optimized_json[key] = []
             
-    except Exception as e:
-        print(f"Error in AI call: {e}")
-        return {
-            "technical_skills": [],
-            "projects": [],
-            "experience": []
-        }
\ No newline at end of file
+    return optimized_json
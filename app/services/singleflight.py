@@ -0,0 +1,78 @@
+# app/services/singleflight.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+from .metrics import counter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+singleflight_calls_total = counter(
+    "singleflight_calls_total",
+    "Coalesced calls by flight and result (leader ran the work, coalesced awaited it)",
+)
+
+
+class _Call(Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs one instance of identical concurrent work and shares its result.
+
+    The first caller for a key starts the work as a task; callers with the
+    same key that arrive while it runs await that task instead of starting
+    their own, and get its result or exception. Once it finishes the key is
+    free again, so this only merges requests that overlap in time; it is
+    not a cache.
+
+    Cancellation is reference counted: a caller that is cancelled (e.g. its
+    client disconnected) stops waiting, and the shared work is cancelled
+    only when no caller is left.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return the result of work(), shared with concurrent callers of key.
+
+        Args:
+            key: Identifies identical requests (include the user)
+            work: Called only if no call for key is in flight
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.ensure_future(work()))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            singleflight_calls_total.inc(flight=self.name, result="leader")
+        else:
+            singleflight_calls_total.inc(flight=self.name, result="coalesced")
+            logger.debug(f"Coalesced {self.name} call into the one in flight")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # The last caller gave up; nobody needs the result any more
+                self._forget(key, call)
+                call.task.cancel()
+                await asyncio.wait({call.task})
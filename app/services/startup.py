@@ -0,0 +1,59 @@
+# app/services/startup.py
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Build the external clients during startup instead of on the first request
+STARTUP_WARM_CLIENTS = os.getenv("STARTUP_WARM_CLIENTS", "1") == "1"
+
+
+class StartupReport:
+    """
+    Wall time of each startup component, in the order they ran.
+
+    Required components re-raise their errors and abort startup. Optional
+    ones (external clients) are recorded as failed and left to be built
+    lazily by their provider on first use, so the app still starts offline.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.components: List[Dict] = []
+
+    def record(self, name: str, seconds: float, error: Optional[str] = None) -> None:
+        entry = {"component": name, "seconds": round(seconds, 4), "ok": error is None}
+        if error is not None:
+            entry["error"] = error
+        self.components.append(entry)
+
+    @contextmanager
+    def step(self, name: str, required: bool = True) -> Iterator[None]:
+        """Time the enclosed block as one component."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(name, time.perf_counter() - started, error=str(e))
+            if required:
+                raise
+            logger.warning(f"Startup step {name} failed, continuing without it: {e}")
+        else:
+            self.record(name, time.perf_counter() - started)
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict:
+        return {"total_seconds": round(self.total_seconds, 4), "components": self.components}
+
+    def log(self) -> None:
+        breakdown = ", ".join(
+            f"{c['component']}={c['seconds']:.2f}s{'' if c['ok'] else ' (failed)'}"
+            for c in self.components
+        )
+        logger.info(f"Startup finished in {self.total_seconds:.2f}s: {breakdown}")
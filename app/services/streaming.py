@@ -0,0 +1,41 @@
+# app/services/streaming.py
+import json
+import time
+from typing import Any, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Stop proxies (nginx) from buffering the stream and defeating early delivery
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def ndjson_line(obj: Any) -> bytes:
+    """Encode one object (pydantic models included) as a newline-terminated JSON line."""
+    return (json.dumps(jsonable_encoder(obj), separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event with a JSON data payload."""
+    payload = json.dumps(jsonable_encoder(data), separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class StageClock:
+    """Wall-clock timings for the stage events of one streamed request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def lap(self) -> Dict[str, float]:
+        """Return time spent in the stage that just ended and since the start, in ms."""
+        now = time.perf_counter()
+        timings = {
+            "stage_ms": round((now - self._last) * 1000, 1),
+            "elapsed_ms": round((now - self.started) * 1000, 1),
+        }
+        self._last = now
+        return timings
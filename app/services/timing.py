@@ -0,0 +1,120 @@
+# app/services/timing.py
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from .metrics import histogram
+
+logger = logging.getLogger(__name__)
+
+stage_seconds = histogram(
+    "stage_seconds",
+    "Wall time of one pipeline stage (download, PDF decoding, spaCy, AI call, ...)",
+)
+http_request_seconds = histogram(
+    "http_request_seconds",
+    "HTTP request latency by route, method and status",
+)
+
+# (stage -> seconds for the current request, observe into stage_seconds)
+_collector: ContextVar[Optional[Tuple[Dict[str, float], bool]]] = ContextVar("timing_collector", default=None)
+
+
+def record(stage: str, seconds: float) -> None:
+    """
+    Add seconds to a stage of the current request and to the stage histogram.
+
+    Repeated stages within one request are summed.
+    """
+    collector = _collector.get()
+    observe = True
+    if collector is not None:
+        timings, observe = collector
+        timings[stage] = timings.get(stage, 0.0) + seconds
+    if observe:
+        stage_seconds.observe(seconds, stage=stage)
+
+
+def record_all(timings: Mapping[str, float]) -> None:
+    """Merge stage timings measured elsewhere (a worker process or thread)."""
+    for stage, seconds in timings.items():
+        record(stage, seconds)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as one stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+
+@contextmanager
+def collect_timings(observe: bool = True) -> Iterator[Dict[str, float]]:
+    """
+    Collect the stages recorded inside the block into a fresh dict.
+
+    Args:
+        observe: Also feed stage_seconds. Pass False where the timings are
+            handed back to a caller that merges them with record_all, so
+            each stage is observed once, in the serving process.
+    """
+    timings: Dict[str, float] = {}
+    token = _collector.set((timings, observe))
+    try:
+        yield timings
+    finally:
+        _collector.reset(token)
+
+
+def server_timing_header(timings: Mapping[str, float]) -> str:
+    """Format stage timings as a Server-Timing header value (durations in ms)."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that times every HTTP request.
+
+    Stages recorded while the request is handled are sent back in a
+    Server-Timing header, followed by the total. Streaming responses only
+    carry the stages finished before their headers go out. Each request is
+    also observed in http_request_seconds by route template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = "500"
+
+        with collect_timings() as timings:
+            async def send_with_timing(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = str(message["status"])
+                    entries = dict(timings, total=time.perf_counter() - started)
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing_header(entries).encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = scope.get("route")
+                http_request_seconds.observe(
+                    time.perf_counter() - started,
+                    route=getattr(route, "path", "unmatched"),
+                    method=scope["method"],
+                    status=status,
+                )
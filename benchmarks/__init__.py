@@ -0,0 +1,11 @@
+"""
+Performance benchmarks for the resume parsing pipeline.
+
+Run each module from the repository root with ``python -m benchmarks.<name>``:
+
+- bench_parser: per-stage ResumeParser latency over the synthetic corpus,
+  with baseline save/compare
+- bench_contact_scan: contact-field extraction on large documents
+- bench_name_extraction: full vs. trimmed spaCy pipeline
+- corpus: the deterministic resume PDF generator the benchmarks share
+"""
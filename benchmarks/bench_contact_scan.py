@@ -0,0 +1,113 @@
+"""
+Micro-benchmark: contact-field extraction on large, many-page resumes.
+
+The legacy baseline reproduces the extractors as they were before the
+pattern registry: each call looks its patterns up in the re cache, and
+email and phone use findall, so every call scans the whole text once per
+pattern even when the match sits in the first line.
+
+Usage:
+    python -m benchmarks.bench_contact_scan [--pages 40] [--repeat 20]
+"""
+import re
+import argparse
+import timeit
+
+from app.services.extract_info import scan_contact_fields
+
+FILLER = (
+    "Led migration of 40 services to Kubernetes, cutting deploy time by 35% across 2019-2021.\n"
+    "Built streaming ETL in Python and Go processing 2.5 TB/day; on-call for 12 regions.\n"
+    "Mentored 6 engineers, introduced code review guidelines and CI quality gates.\n"
+)
+
+
+def legacy_contact_fields(text: str) -> dict:
+    """Reference: the pre-registry extract_email/phone/linkedin/github."""
+    result = {}
+
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b', text)
+    result['email'] = next((e for e in emails if '.' in e and '@' in e), "")
+
+    result['phone'] = ""
+    for pattern in [
+        r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',
+        r'\+?(\d{1,4})?[-.\s]?\(?(\d{3,4})\)?[-.\s]?(\d{3,4})[-.\s]?(\d{3,4})',
+        r'(\d{10})',
+    ]:
+        phones = re.findall(pattern, text)
+        if phones:
+            phone = phones[0]
+            phone_str = ''.join(filter(None, phone)) if isinstance(phone, tuple) else phone
+            if 10 <= len(re.sub(r'\D', '', phone_str)) <= 15:
+                result['phone'] = phone_str
+                break
+
+    for field, base, patterns in (
+        ('linkedin', "https://linkedin.com/in/", [
+            r'https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9\-_]+/?',
+            r'linkedin\.com/in/[a-zA-Z0-9\-_]+',
+            r'LinkedIn[:\s\-]+([a-zA-Z0-9\-_]{3,})',
+        ]),
+        ('github', "https://github.com/", [
+            r'https?://(?:www\.)?github\.com/[a-zA-Z0-9\-_]+/?',
+            r'github\.com/[a-zA-Z0-9\-_]+',
+            r'GitHub[:\s\-]+([a-zA-Z0-9\-_]{3,})',
+            r'git[:\s\-]+([a-zA-Z0-9\-_]{3,})',
+        ]),
+    ):
+        result[field] = ""
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                url = match.group(0) if match.group(0).startswith('http') else match.group(1) if match.lastindex else match.group(0)
+                if not url.startswith('http'):
+                    url = f"{base}{url.strip('/')}"
+                result[field] = url
+                break
+    return result
+
+
+CONTACT_BLOCK = (
+    "Jane Q Candidate\n"
+    "jane.candidate@example.com | +1 (415) 555-0134\n"
+    "linkedin.com/in/jane-candidate | https://github.com/janecandidate\n"
+)
+
+CASES = (
+    ("contact in header", "header"),
+    ("contact at end", "end"),
+    ("no contact info", "none"),
+)
+
+
+def build_resume(pages: int, placement: str = "header") -> str:
+    body = "".join(f"--- Page {p + 1} ---\nEXPERIENCE\n" + FILLER * 20 for p in range(pages))
+    if placement == "header":
+        return CONTACT_BLOCK + body
+    if placement == "end":
+        return body + CONTACT_BLOCK
+    return body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for label, placement in CASES:
+        text = build_resume(args.pages, placement)
+        assert scan_contact_fields(text) == legacy_contact_fields(text), label
+
+        legacy = min(timeit.repeat(lambda: legacy_contact_fields(text), number=1, repeat=args.repeat))
+        current = min(timeit.repeat(lambda: scan_contact_fields(text), number=1, repeat=args.repeat))
+        print(
+            f"{label:<18} {len(text) / 1024:8.1f} KiB  "
+            f"legacy {legacy * 1000:8.2f} ms  registry {current * 1000:8.2f} ms  "
+            f"speedup x{legacy / current:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: name extraction with the full spaCy pipeline vs. the trimmed one.
+
+Compares, for each pipeline:
+  - model load time and memory allocated while loading (tracemalloc)
+  - per-document latency of ResumeParser.extract_name
+  - per-document latency of the batched ResumeParser.extract_names (nlp.pipe)
+and checks that both pipelines pick the same names.
+
+Usage:
+    python -m benchmarks.bench_name_extraction [--model en_core_web_sm] [--docs 200]
+        [--batch-size 32] [--n-process 1]
+"""
+import time
+import argparse
+import tracemalloc
+
+from app.services.extract_info import (
+    DEFAULT_SPACY_MODEL,
+    NAME_PIPELINE_EXCLUDE,
+    ResumeParser,
+    load_spacy_model,
+)
+
+FIRST_NAMES = ["Jane", "Arjun", "Maria", "Wei", "Olusegun", "Priya", "Lukas", "Aiko"]
+LAST_NAMES = ["Candidate", "Sharma", "Garcia", "Zhang", "Adeyemi", "Iyer", "Becker", "Tanaka"]
+
+
+def build_texts(count: int):
+    texts = []
+    for i in range(count):
+        name = f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+        texts.append(
+            f"{name}\n"
+            f"Senior Software Engineer | {name.split()[0].lower()}@example.com | +1 415 555 {1000 + i}\n"
+            "San Francisco, CA\n"
+            "EXPERIENCE\n"
+            "Built distributed systems in Python and Go.\n"
+        )
+    return texts
+
+
+def bench(label: str, model: str, exclude, texts, batch_size: int, n_process: int):
+    load_spacy_model.cache_clear()
+    tracemalloc.start()
+    started = time.perf_counter()
+    parser = ResumeParser(model, pipeline_exclude=exclude)
+    load_seconds = time.perf_counter() - started
+    load_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    parser.extract_name(texts[0])  # warm up
+
+    started = time.perf_counter()
+    single = [parser.extract_name(text) for text in texts]
+    single_ms = (time.perf_counter() - started) * 1000 / len(texts)
+
+    started = time.perf_counter()
+    batched = parser.extract_names(texts, batch_size=batch_size, n_process=n_process)
+    batched_ms = (time.perf_counter() - started) * 1000 / len(texts)
+
+    assert single == batched, f"{label}: batched names differ from per-document names"
+    print(
+        f"{label:<8} pipes={','.join(parser.nlp.pipe_names):<45} "
+        f"load {load_seconds:6.2f} s {load_bytes / 2**20:7.1f} MiB  "
+        f"per-doc {single_ms:6.2f} ms  batched {batched_ms:6.2f} ms/doc"
+    )
+    return single
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=DEFAULT_SPACY_MODEL)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    texts = build_texts(args.docs)
+    full = bench("full", args.model, (), texts, args.batch_size, args.n_process)
+    trimmed = bench("trimmed", args.model, NAME_PIPELINE_EXCLUDE, texts, args.batch_size, args.n_process)
+
+    same = sum(a == b for a, b in zip(full, trimmed))
+    print(f"same name from both pipelines: {same}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
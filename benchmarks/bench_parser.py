@@ -0,0 +1,188 @@
+"""
+Benchmark: ResumeParser stage by stage over the synthetic corpus.
+
+For every corpus case each stage is timed separately, the same way
+parse_resume chains them:
+
+  extract_text   extract_text_from_pdf
+  document       ResumeDocument (line split + section index)
+  name           extract_name
+  contact        extract_contact_info
+  education      extract_college_and_degree + extract_cgpa
+  markdown       convert_text_to_markdown
+  clean          clean_markdown
+  parse_resume   the whole pipeline end to end
+
+and reported as p50/p90/p99 latency over all cases and repeats, plus
+end-to-end throughput and the tracemalloc peak of one parse per case.
+
+Results can be saved as a baseline and later runs compared against it;
+a stage whose p50 or p90 grew by more than --threshold is reported as a
+regression (and makes the exit status non-zero with --fail-on-regression).
+
+Usage:
+    python -m benchmarks.bench_parser [--repeat 5] [--cases short,huge_line]
+        [--model en_core_web_sm] [--save baseline.json] [--compare baseline.json]
+        [--threshold 0.2] [--fail-on-regression]
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from typing import Dict, List
+
+from app.services.extract_info import DEFAULT_SPACY_MODEL, ResumeParser
+from app.services.resume_document import ResumeDocument
+
+from .corpus import CASES, CorpusCase, build_corpus
+
+STAGES = ("extract_text", "document", "name", "contact", "education", "markdown", "clean", "parse_resume")
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (which must be non-empty)."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def time_stages(parser: ResumeParser, case: CorpusCase) -> Dict[str, float]:
+    """Run the pipeline once, returning seconds per stage."""
+    timings = {}
+
+    def timed(stage, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings[stage] = time.perf_counter() - started
+        return result
+
+    text = timed("extract_text", parser.extract_text_from_pdf, case.pdf)
+    document = timed("document", ResumeDocument, text)
+    name = timed("name", parser.extract_name, text)
+    contact = timed("contact", parser.extract_contact_info, text)
+    education = timed(
+        "education", lambda doc: (parser.extract_college_and_degree(doc), parser.extract_cgpa(doc)), document
+    )
+    markdown = timed("markdown", parser.convert_text_to_markdown, document)
+    extracted_info = {'name': name, **contact, 'education': education[0], 'cgpa': education[1]}
+    timed("clean", parser.clean_markdown, markdown, extracted_info)
+    timed("parse_resume", parser.parse_resume, case.pdf)
+    return timings
+
+
+def peak_memory(parser: ResumeParser, case: CorpusCase) -> int:
+    tracemalloc.start()
+    try:
+        parser.parse_resume(case.pdf)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(corpus: List[CorpusCase], parser: ResumeParser, repeat: int) -> Dict:
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    for case in corpus:
+        time_stages(parser, case)  # warm up
+        for _ in range(repeat):
+            for stage, seconds in time_stages(parser, case).items():
+                samples[stage].append(seconds)
+
+    parse_seconds = sum(samples["parse_resume"])
+    parsed_bytes = sum(len(case.pdf) for case in corpus) * repeat
+    return {
+        "stages_ms": {
+            stage: {
+                **{f"p{p}": round(percentile(values, p) * 1000, 3) for p in PERCENTILES},
+                "mean": round(sum(values) / len(values) * 1000, 3),
+            }
+            for stage, values in samples.items()
+        },
+        "throughput": {
+            "docs_per_second": round(len(samples["parse_resume"]) / parse_seconds, 2),
+            "mib_per_second": round(parsed_bytes / 2**20 / parse_seconds, 3),
+        },
+        "peak_memory_bytes": {case.name: peak_memory(parser, case) for case in corpus},
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return one message per stage percentile that regressed beyond threshold."""
+    regressions = []
+    print(f"\n{'stage':<14} {'p50 base':>10} {'p50 now':>10} {'change':>8}   {'p90 base':>10} {'p90 now':>10} {'change':>8}")
+    for stage, now in current["stages_ms"].items():
+        base = baseline.get("stages_ms", {}).get(stage)
+        if base is None:
+            continue
+        cells = []
+        for key in ("p50", "p90"):
+            change = (now[key] - base[key]) / base[key] if base[key] else 0.0
+            cells.append(f"{base[key]:10.3f} {now[key]:10.3f} {change:+8.1%}")
+            if change > threshold:
+                regressions.append(f"{stage} {key} {base[key]:.3f} ms -> {now[key]:.3f} ms ({change:+.1%})")
+        print(f"{stage:<14} {'   '.join(cells)}")
+    return regressions
+
+
+def report(result: Dict) -> None:
+    print(f"{'stage':<14}" + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES) + f"{'mean ms':>10}")
+    for stage, stats in result["stages_ms"].items():
+        print(f"{stage:<14}" + "".join(f"{stats[f'p{p}']:10.3f}" for p in PERCENTILES) + f"{stats['mean']:10.3f}")
+    throughput = result["throughput"]
+    print(f"\nthroughput: {throughput['docs_per_second']} docs/s, {throughput['mib_per_second']} MiB/s")
+    print("peak memory per parse:")
+    for name, peak in result["peak_memory_bytes"].items():
+        print(f"  {name:<16} {peak / 2**20:8.2f} MiB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated corpus case names")
+    parser.add_argument("--model", default=DEFAULT_SPACY_MODEL)
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    cases = [name for name in args.cases.split(",") if name]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    resume_parser = ResumeParser(args.model)
+    result = run(build_corpus(args.seed, cases), resume_parser, args.repeat)
+    result["meta"] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "model": args.model,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "cases": cases,
+    }
+    report(result)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nsaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("cases") != cases:
+            print("warning: baseline was recorded with a different case list")
+        regressions = compare(result, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
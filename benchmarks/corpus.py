@@ -0,0 +1,281 @@
+"""
+Deterministic synthetic resume PDFs for benchmarking ResumeParser.
+
+PDFs are written by hand (one Helvetica font, absolutely positioned text
+runs), so the corpus needs no PDF library and is byte-identical for a
+given seed on every machine. Alongside ordinary resumes of increasing
+length it includes layouts that stress specific stages:
+
+  short, standard, long   1, ~2 and ~6 page single-column resumes
+  two_column              sidebar + main column, interleaved in the content stream
+  dense_text              long paragraphs with almost no structure
+  many_headings           hundreds of all-caps headings (heading detection, sections)
+  huge_line               a single 20k character line (regex and redaction scans)
+  over_page_cap           more pages than PDF_MAX_PAGES
+  image_only              pages without fonts or text (early image-only exit)
+
+Usage:
+    python -m benchmarks.corpus --out /tmp/corpus [--seed 0]
+"""
+import os
+import random
+import argparse
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 50
+LINE_HEIGHT = 13
+FONT_SIZE = 10
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+# (x, y, text) runs of one page
+Page = List[Tuple[float, float, str]]
+
+FIRST_NAMES = ["Jane", "Arjun", "Maria", "Wei", "Olusegun", "Priya", "Lukas", "Aiko"]
+LAST_NAMES = ["Candidate", "Sharma", "Garcia", "Zhang", "Adeyemi", "Iyer", "Becker", "Tanaka"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises"]
+ROLES = ["Software Engineer", "Senior Software Engineer", "Data Engineer", "Backend Developer", "Tech Lead"]
+COLLEGES = ["Stanford University", "IIT Bombay", "University of Toronto", "ETH Zurich", "NIT Trichy"]
+DEGREES = ["B.Tech in Computer Science", "Bachelor of Science", "M.S. in Computer Science", "B.E. Electronics"]
+SKILLS = ["Python", "Go", "Rust", "PostgreSQL", "Kubernetes", "Terraform", "React", "Kafka", "Spark", "AWS"]
+ACHIEVEMENTS = [
+    "Led migration of {n} services to Kubernetes, cutting deploy time by {p}%.",
+    "Built streaming ETL in Python and Go processing {n} TB/day across {p} regions.",
+    "Reduced p99 API latency by {p}% by introducing request coalescing and caching.",
+    "Mentored {n} engineers and introduced code review guidelines and CI quality gates.",
+    "Designed a billing pipeline handling {n}M events/day with exactly-once delivery.",
+]
+
+
+class CorpusCase(NamedTuple):
+    name: str
+    pdf: bytes
+    pages: int
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(pages: Sequence[Page], fonts: bool = True) -> bytes:
+    """
+    Write a minimal PDF 1.4 file.
+
+    Args:
+        pages: Text runs per page
+        fonts: If False, pages carry no font resource and draw a filled
+            rectangle instead of text, like a scanned page
+
+    Returns:
+        PDF file content
+    """
+    objects: List[bytes] = []
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    for i, runs in enumerate(pages):
+        resources = "<< /Font << /F1 3 0 R >> >>" if fonts else "<< >>"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources {resources} /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        if fonts:
+            stream = "".join(
+                f"BT /F1 {FONT_SIZE} Tf {x:.0f} {y:.0f} Td ({_escape(text)}) Tj ET\n"
+                for x, y, text in runs
+            )
+        else:
+            stream = f"0.5 g {MARGIN} {MARGIN} {PAGE_WIDTH - 2 * MARGIN} {PAGE_HEIGHT - 2 * MARGIN} re f\n"
+        data = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(data) + data + b"endstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def single_column(lines: Sequence[str]) -> List[Page]:
+    """Flow lines top to bottom, starting a new page when one is full."""
+    pages: List[Page] = []
+    for start in range(0, max(len(lines), 1), LINES_PER_PAGE):
+        chunk = lines[start:start + LINES_PER_PAGE]
+        pages.append([
+            (MARGIN, PAGE_HEIGHT - MARGIN - row * LINE_HEIGHT, text) for row, text in enumerate(chunk)
+        ])
+    return pages
+
+
+def two_column(sidebar: Sequence[str], main: Sequence[str]) -> List[Page]:
+    """Sidebar at the left edge, main column to its right, runs interleaved row by row."""
+    pages: List[Page] = []
+    rows = max(len(sidebar), len(main))
+    for start in range(0, max(rows, 1), LINES_PER_PAGE):
+        page: Page = []
+        for row in range(start, min(start + LINES_PER_PAGE, rows)):
+            y = PAGE_HEIGHT - MARGIN - (row - start) * LINE_HEIGHT
+            if row < len(sidebar):
+                page.append((MARGIN, y, sidebar[row]))
+            if row < len(main):
+                page.append((MARGIN + 170, y, main[row]))
+        pages.append(page)
+    return pages
+
+
+def _achievement(rng: random.Random) -> str:
+    return rng.choice(ACHIEVEMENTS).format(n=rng.randint(2, 60), p=rng.randint(10, 80))
+
+
+def contact_lines(rng: random.Random) -> List[str]:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}{last}".lower()
+    return [
+        f"{first} {last}",
+        f"{handle}@example.com | +1 415 555 {rng.randint(1000, 9999)}",
+        f"linkedin.com/in/{handle} | github.com/{handle}",
+    ]
+
+
+def experience_lines(rng: random.Random, roles: int, bullets: int = 4) -> List[str]:
+    lines = ["EXPERIENCE"]
+    year = 2024
+    for _ in range(roles):
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)}  {start} - {year}")
+        lines.extend(f"- {_achievement(rng)}" for _ in range(bullets))
+        year = start
+    return lines
+
+
+def education_lines(rng: random.Random) -> List[str]:
+    return [
+        "EDUCATION",
+        rng.choice(COLLEGES),
+        f"{rng.choice(DEGREES)}  CGPA: {rng.randint(70, 99) / 10:.1f}/10",
+    ]
+
+
+def skills_lines(rng: random.Random) -> List[str]:
+    return ["SKILLS", ", ".join(rng.sample(SKILLS, 6))]
+
+
+def project_lines(rng: random.Random, projects: int) -> List[str]:
+    lines = ["PROJECTS"]
+    for i in range(projects):
+        lines.append(f"Project {i + 1}: {rng.choice(SKILLS)} {rng.choice(['pipeline', 'service', 'dashboard'])}")
+        lines.append(f"- {_achievement(rng)}")
+    return lines
+
+
+def resume_lines(rng: random.Random, roles: int, projects: int) -> List[str]:
+    return (
+        contact_lines(rng)
+        + ["SUMMARY", f"Engineer with {rng.randint(2, 15)} years of experience building backend systems."]
+        + experience_lines(rng, roles)
+        + education_lines(rng)
+        + skills_lines(rng)
+        + project_lines(rng, projects)
+    )
+
+
+def _short(rng: random.Random) -> Tuple[List[Page], bool]:
+    return single_column(resume_lines(rng, roles=2, projects=1)), True
+
+
+def _standard(rng: random.Random) -> Tuple[List[Page], bool]:
+    return single_column(resume_lines(rng, roles=8, projects=6)), True
+
+
+def _long(rng: random.Random) -> Tuple[List[Page], bool]:
+    return single_column(resume_lines(rng, roles=50, projects=25)), True
+
+
+def _two_column(rng: random.Random) -> Tuple[List[Page], bool]:
+    sidebar = contact_lines(rng) + education_lines(rng) + skills_lines(rng)
+    main = experience_lines(rng, roles=6) + project_lines(rng, 4)
+    return two_column(sidebar, main), True
+
+
+def _dense_text(rng: random.Random) -> Tuple[List[Page], bool]:
+    words = " ".join(_achievement(rng) for _ in range(400)).split()
+    lines = contact_lines(rng)
+    for start in range(0, len(words), 14):
+        lines.append(" ".join(words[start:start + 14]))
+    return single_column(lines), True
+
+
+def _many_headings(rng: random.Random) -> Tuple[List[Page], bool]:
+    lines = contact_lines(rng)
+    for i in range(300):
+        lines.append(f"{rng.choice(COMPANIES).upper()} {rng.choice(ROLES).upper()} {i}")
+        lines.append(_achievement(rng))
+    return single_column(lines), True
+
+
+def _huge_line(rng: random.Random) -> Tuple[List[Page], bool]:
+    line = " ".join(_achievement(rng) for _ in range(250))[:20000]
+    return single_column(contact_lines(rng) + [line] + education_lines(rng)), True
+
+
+def _over_page_cap(rng: random.Random) -> Tuple[List[Page], bool]:
+    return single_column(resume_lines(rng, roles=250, projects=150)), True
+
+
+def _image_only(rng: random.Random) -> Tuple[List[Page], bool]:
+    return [[] for _ in range(3)], False
+
+
+CASES: Dict[str, Callable[[random.Random], Tuple[List[Page], bool]]] = {
+    "short": _short,
+    "standard": _standard,
+    "long": _long,
+    "two_column": _two_column,
+    "dense_text": _dense_text,
+    "many_headings": _many_headings,
+    "huge_line": _huge_line,
+    "over_page_cap": _over_page_cap,
+    "image_only": _image_only,
+}
+
+
+def build_corpus(seed: int = 0, cases: Optional[Sequence[str]] = None) -> List[CorpusCase]:
+    """
+    Build the corpus; the same seed always yields the same bytes.
+
+    Args:
+        seed: Seed for the content generator
+        cases: Names from CASES to build, all of them by default
+    """
+    corpus = []
+    for name in cases or CASES:
+        # Seed per case so selecting a subset does not change the others
+        rng = random.Random(f"{seed}:{name}")
+        pages, fonts = CASES[name](rng)
+        corpus.append(CorpusCase(name, render_pdf(pages, fonts=fonts), len(pages)))
+    return corpus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Directory to write the PDFs to")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for case in build_corpus(args.seed):
+        path = os.path.join(args.out, f"{case.name}.pdf")
+        with open(path, "wb") as f:
+            f.write(case.pdf)
+        print(f"{path:<50} {case.pages:3d} pages {len(case.pdf) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
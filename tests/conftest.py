@@ -0,0 +1,77 @@
+import os
+
+# Settings the app reads at import time; no test talks to these services
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-secret")
+os.environ.setdefault("BUCKET_NAME", "resumes")
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+
+import asyncio
+import json
+
+import pytest
+
+
+class FakeResponse:
+    def __init__(self, text, total_tokens=None):
+        self.text = text
+        self.usage_metadata = type("Usage", (), {"total_token_count": total_tokens})()
+
+
+class FakeGemini:
+    """
+    Stand-in for the google-genai client's aio.models.
+
+    reply(prompt) returns the response text, or raises to fail the call.
+    Tracks calls and the peak number running at once.
+    """
+
+    def __init__(self):
+        self.reply = lambda prompt: json.dumps({"technical_skills": ["Python"], "projects": [], "experience": []})
+        self.delay = 0.0
+        self.prompts = []
+        self.configs = []
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def aio(self):
+        return self
+
+    @property
+    def models(self):
+        return self
+
+    async def generate_content(self, model, contents, config=None):
+        self.prompts.append(contents)
+        self.configs.append(config)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            return FakeResponse(self.reply(contents))
+        finally:
+            self.active -= 1
+
+    async def generate_content_stream(self, model, contents, config=None):
+        self.prompts.append(contents)
+        text = self.reply(contents)
+        delay = self.delay
+
+        async def chunks():
+            for start in range(0, len(text), 7):
+                await asyncio.sleep(delay)
+                yield FakeResponse(text[start:start + 7])
+
+        return chunks()
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    from app.services import resume_parser
+
+    client = FakeGemini()
+    monkeypatch.setattr(resume_parser, "get_ai_client", lambda: client)
+    return client
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from app.services.ai_dispatcher import BATCH, INTERACTIVE, AICaller, AIDispatcher, set_ai_caller
+
+
+async def hold(dispatcher, caller, order, cost=100, release=None):
+    """Acquire a slot, note the admission, and keep it until release is set."""
+    charge = await dispatcher.acquire(cost, caller)
+    order.append(caller.user_id)
+    try:
+        if release is not None:
+            await release.wait()
+    finally:
+        dispatcher.release(charge)
+
+
+def test_cancelling_holder_and_waiters_together_frees_the_slot():
+    async def main():
+        dispatcher = AIDispatcher(1, 0, 0)
+        release, order = asyncio.Event(), []
+        tasks = [
+            asyncio.create_task(hold(dispatcher, AICaller(f"user-{n}", INTERACTIVE), order, release=release))
+            for n in range(3)
+        ]
+        await asyncio.sleep(0)
+        assert order == ["user-0"]
+
+        # The holder's release hands the slot to waiters that are already cancelled
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        stats = dispatcher.stats()
+        assert stats["running"] == 0
+        assert stats["queued"] == {INTERACTIVE: 0, BATCH: 0}
+        charge = await asyncio.wait_for(dispatcher.acquire(100, AICaller("user-3", INTERACTIVE)), 1)
+        dispatcher.release(charge)
+        assert dispatcher.stats()["running"] == 0
+
+    asyncio.run(main())
+
+
+def test_users_take_turns_whatever_their_queue_length():
+    async def main():
+        dispatcher = AIDispatcher(1, 0, 0, quantum=100)
+        release, order = asyncio.Event(), []
+        holder = asyncio.create_task(hold(dispatcher, AICaller("holder", INTERACTIVE), order, release=release))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(hold(dispatcher, AICaller("busy", INTERACTIVE), order)) for _ in range(5)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(hold(dispatcher, AICaller("light", INTERACTIVE), order)))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert order[:3] == ["holder", "busy", "light"]
+
+    asyncio.run(main())
+
+
+def test_interactive_calls_go_before_batch_ones():
+    async def main():
+        dispatcher = AIDispatcher(1, 0, 0)
+        release, order = asyncio.Event(), []
+        holder = asyncio.create_task(hold(dispatcher, AICaller("holder", INTERACTIVE), order, release=release))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(hold(dispatcher, AICaller(f"batch-{n}", BATCH), order)) for n in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(hold(dispatcher, AICaller("interactive", INTERACTIVE), order)))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert order[1] == "interactive"
+
+    asyncio.run(main())
+
+
+def test_calls_wait_for_the_per_minute_budgets():
+    async def main():
+        caller = AICaller("user", INTERACTIVE)
+        by_requests = AIDispatcher(10, requests_per_minute=2, tokens_per_minute=0)
+        for _ in range(2):
+            by_requests.release(await by_requests.acquire(100, caller))
+        third = asyncio.create_task(by_requests.acquire(100, caller))
+        await asyncio.sleep(0.05)
+        assert not third.done()
+        third.cancel()
+
+        by_tokens = AIDispatcher(10, requests_per_minute=0, tokens_per_minute=1000)
+        charge = await by_tokens.acquire(800, caller)
+        # Reported usage replaces the estimate in the budget
+        by_tokens.release(charge, used_tokens=300)
+        assert by_tokens.stats()["tokens_last_minute"] == 300
+        by_tokens.release(await asyncio.wait_for(by_tokens.acquire(700, caller), 1))
+        blocked = asyncio.create_task(by_tokens.acquire(100, caller))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        blocked.cancel()
+        await asyncio.gather(third, blocked, return_exceptions=True)
+        assert by_requests.stats()["queued"][INTERACTIVE] == 0
+        assert by_tokens.stats()["queued"][INTERACTIVE] == 0
+
+    asyncio.run(main())
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        set_ai_caller("user", "urgent")
@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+import pytest
+
+from app.models.resume_model import BatchOptimizeRequest
+from app.routes import resume as resume_routes
+from app.services.cache import LRUCache
+from app.services.job_descriptions import JobDescriptionStore
+from app.services.optimization_cache import OptimizationCache
+from app.services.prompt_builder import missing_sections
+
+RESUME = {
+    "skills": ["Python", "SQL"],
+    "experience": [
+        {"role": "Engineer", "company": "Acme", "dates": "2020-2022", "description": ["Built APIs"]},
+        {"role": "Intern", "company": "Initech", "dates": "2019", "description": ["Fixed bugs"]},
+    ],
+}
+JOB = "Python developer"
+COMPLETE = {
+    "technical_skills": ["Python", "SQL"],
+    "projects": [],
+    "experience": [{"role": "Senior Engineer", "details": ["Rewritten"]}, {"role": "Intern", "details": ["Rewritten"]}],
+}
+# A response cut off inside the second role: repair keeps only the first
+TRUNCATED = {**COMPLETE, "experience": COMPLETE["experience"][:1]}
+
+
+@pytest.fixture
+def cache():
+    return OptimizationCache(LRUCache(16))
+
+
+def run_batch(monkeypatch, cache, answer):
+    async def call_ai_for_optimization(ai_data, job_description, additional_info, context_cache=None):
+        return json.loads(json.dumps(answer))
+
+    monkeypatch.setattr(resume_routes, "call_ai_for_optimization", call_ai_for_optimization)
+    request = BatchOptimizeRequest(resume_content=RESUME, jobs=[{"job_description": JOB}])
+    sections = resume_routes.select_sections(RESUME)
+    store = JobDescriptionStore(":memory:")
+
+    async def main():
+        lines = [
+            json.loads(line)
+            async for line in resume_routes._batch_optimize_lines(
+                "user-1", sections, request, cache, store, None
+            )
+        ]
+        batch = await resume_routes._cached_optimization(cache, sections, JOB, None, route="batch")
+        single = await resume_routes._cached_optimization(cache, sections, JOB, None)
+        return lines, batch[1], single[1]
+
+    try:
+        return asyncio.run(main())
+    finally:
+        store.close()
+
+
+def test_missing_sections_spots_a_cut_off_answer():
+    sent = {"skills": ["Python"], "projects": [{"title": "Shop"}], "experience": [{"role": "A"}, {"role": "B"}]}
+    assert missing_sections({"technical_skills": ["Python"], "projects": [{}], "experience": [{}, {}]}, sent) == []
+    assert missing_sections({"technical_skills": [], "projects": [], "experience": [{}]}, sent) == [
+        "technical_skills", "projects", "experience[1]"
+    ]
+
+
+def test_truncated_batch_answer_is_neither_cached_nor_served_to_optimize_resume(monkeypatch, cache):
+    lines, batch_cached, single_cached = run_batch(monkeypatch, cache, TRUNCATED)
+    assert lines[0]["cached"] is False
+    assert batch_cached is None
+    assert single_cached is None
+
+
+def test_complete_batch_answer_is_cached_for_batches_only(monkeypatch, cache):
+    _, batch_cached, single_cached = run_batch(monkeypatch, cache, COMPLETE)
+    assert batch_cached == COMPLETE
+    # optimize-resume builds its prompts differently and keeps its own entries
+    assert single_cached is None
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.job_descriptions import (
+    JobDescriptionStore,
+    analyse_job_description,
+    clean_text,
+    extract_requirements,
+    job_description_id,
+    resolve_job_description,
+)
+
+POSTING = """Backend Engineer
+
+Requirements:
+- 5+ years of Python
+- Experience with PostgreSQL
+Apply now!
+Apply now!"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobDescriptionStore(str(tmp_path / "jd.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_whitespace_variants_share_an_id():
+    assert job_description_id(POSTING) == job_description_id(POSTING.replace("\n", "\n\n  "))
+    assert job_description_id(POSTING) != job_description_id(POSTING + " Remote")
+
+
+def test_clean_text_drops_blank_and_repeated_lines():
+    assert clean_text("a  b\n\n a b \nc") == "a b\nc"
+
+
+def test_requirements_come_from_bullets_and_cue_sentences():
+    assert extract_requirements(POSTING) == ["5+ years of Python", "Experience with PostgreSQL"]
+
+
+def test_analysis_keeps_the_text_as_written():
+    analysis = analyse_job_description(POSTING)
+    # Prompts embed the user's text, repeated lines and all
+    assert analysis["text"] == POSTING
+    assert "python" in analysis["keywords"]
+
+
+def test_analyse_does_not_store(store):
+    analysis = store.analyse(POSTING)
+    assert store.analyse(POSTING) is analysis
+    assert store.stats()["entries"] == 0
+    # Not reachable by ID either, since no ID was handed out
+    assert store.get(analysis["id"]) is None
+
+
+def test_ingest_stores_and_get_reads_back(store, tmp_path):
+    jd_id = store.ingest(POSTING)["id"]
+    assert store.stats()["entries"] == 1
+    assert store.analyse(POSTING)["id"] == jd_id
+
+    reopened = JobDescriptionStore(store.path)
+    try:
+        assert reopened.get(jd_id)["text"] == POSTING
+    finally:
+        reopened.close()
+
+
+def test_rows_from_another_analyser_version_are_reanalysed(store):
+    jd_id = store.ingest(POSTING)["id"]
+    with store._lock:
+        store._db.execute(
+            "UPDATE job_descriptions SET analysis = ?, analyser_version = 'old' WHERE id = ?",
+            (json.dumps({"id": jd_id, "text": POSTING, "keywords": []}), jd_id),
+        )
+        store._db.commit()
+    store.memory.delete(jd_id)
+    assert store.get(jd_id)["keywords"]
+
+
+def test_resolve_stores_nothing_for_text(store):
+    analysis = asyncio.run(resolve_job_description(store, POSTING, None))
+    assert analysis["text"] == POSTING
+    assert store.stats()["entries"] == 0
+
+    with pytest.raises(HTTPException) as unknown:
+        asyncio.run(resolve_job_description(store, None, analysis["id"]))
+    assert unknown.value.status_code == 404
+
+    store.ingest(POSTING)
+    assert asyncio.run(resolve_job_description(store, None, analysis["id"]))["id"] == analysis["id"]
+
+    with pytest.raises(HTTPException) as missing:
+        asyncio.run(resolve_job_description(store, None, None))
+    assert missing.value.status_code == 400
@@ -0,0 +1,56 @@
+import pytest
+
+from app.services.json_repair import repair_json
+from app.services.resume_parser import decode_model_json
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Missing commas
+    ('{"a": "x" "b": "y"}', {"a": "x", "b": "y"}),
+    ('["a" "b", "c"]', ["a", "b", "c"]),
+    ('{"a": 1 "b": [1, 2] "c": {"d": true}}', {"a": 1, "b": [1, 2], "c": {"d": True}}),
+    ('[{"a": 1} {"a": 2}]', [{"a": 1}, {"a": 2}]),
+    # Trailing and doubled commas
+    ('{"a": [1, 2,], "b": 3,}', {"a": [1, 2], "b": 3}),
+    ('[1,, 2]', [1, 2]),
+    # Unescaped quotes in prose
+    ('{"a": "He said "hi" to me", "b": 1}', {"a": 'He said "hi" to me', "b": 1}),
+    ('["a 6" screen"]', ['a 6" screen']),
+    # Raw control characters and invalid escapes inside strings
+    ('{"a": "line one\nline two\tend"}', {"a": "line one\nline two\tend"}),
+    ('{"path": "C:\\dir\\sub"}', {"path": "C:\\dir\\sub"}),
+    # Bare keys and Python literals
+    ('{a: True, b_c: None, d: false}', {"a": True, "b_c": None, "d": False}),
+    # Leading prose and fences
+    ('Here you go:\n```json\n{"a": 1}\n```', {"a": 1}),
+    # Mismatched closer
+    ('{"a": [1, 2}', {"a": [1, 2]}),
+])
+def test_repairs(text, expected):
+    assert repair_json(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Every complete element survives; the element cut off is dropped
+    ('{"technical_skills": ["Python", "Go"], "projects": [{"title": "A"}, {"title": "B", "descr',
+     {"technical_skills": ["Python", "Go"], "projects": [{"title": "A"}]}),
+    ('{"a": "complete", "b": "cut', {"a": "complete"}),
+    ('{"a": 12', {}),  # a number at the very end may have lost digits
+    ('[{"a": 1}, {"a": 2}, {"a"', [{"a": 1}, {"a": 2}]),
+])
+def test_truncated_output_keeps_complete_values(text, expected):
+    assert repair_json(text) == expected
+
+
+def test_no_json_at_all():
+    assert repair_json("Sorry, I can't help with that.") is None
+
+
+def test_valid_json_is_unchanged():
+    text = '{"a": [1, 2.5, -3e2, "x\\"y", null], "b": {"c": "\\u00e9"}}'
+    assert repair_json(text) == {"a": [1, 2.5, -300.0, 'x"y', None], "b": {"c": "é"}}
+
+
+def test_decode_model_json_repairs_fenced_truncated_output():
+    text = '```json\n{"technical_skills": ["Python",], "experience": [{"role": "Dev"}, {"ro'
+    assert decode_model_json(text) == {"technical_skills": ["Python"], "experience": [{"role": "Dev"}]}
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.json_stream import JsonArrayItemStream
+from app.services.resume_parser import OPTIMIZED_SECTIONS, stream_ai_optimization
+
+RESPONSE = {
+    "technical_skills": ["Python", "SQL, advanced", "C++"],
+    "projects": [{"title": "Parser", "description": ["Handles \"quotes\" and [brackets]", "and {braces}"]}],
+    "experience": [{"role": "Engineer", "company": "ACME", "description": ["Built APIs"]}],
+    "summary": ["not watched"],
+}
+
+
+def feed_in_chunks(text, size):
+    stream = JsonArrayItemStream(OPTIMIZED_SECTIONS)
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(stream.feed(text[start:start + size]))
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 3, 16, 10_000])
+def test_items_are_the_same_whatever_the_chunking(size):
+    text = "```json\n" + json.dumps(RESPONSE, indent=2) + "\n```"
+    items = feed_in_chunks(text, size)
+    assert items == [
+        ("technical_skills", 0, "Python"),
+        ("technical_skills", 1, "SQL, advanced"),
+        ("technical_skills", 2, "C++"),
+        ("projects", 0, RESPONSE["projects"][0]),
+        ("experience", 0, RESPONSE["experience"][0]),
+    ]
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    stream = JsonArrayItemStream(["projects"])
+    assert stream.feed('{"projects": [{"title": "A"}') == [("projects", 0, {"title": "A"})]
+    assert stream.feed(', {"title": "B", "description": ["x"') == []
+    assert stream.feed("]}") == [("projects", 1, {"title": "B", "description": ["x"]})]
+
+
+def test_truncated_and_invalid_elements_are_skipped():
+    items = feed_in_chunks('{"technical_skills": ["Python", oops, "Go", "Ru', 5)
+    assert items == [("technical_skills", 0, "Python"), ("technical_skills", 1, "Go")]
+
+
+def test_nested_arrays_with_watched_names_are_not_watched():
+    items = feed_in_chunks('{"experience": [{"projects": ["inner"]}], "projects": ["outer"]}', 4)
+    assert items == [("experience", 0, {"projects": ["inner"]}), ("projects", 0, "outer")]
+
+
+def test_stream_yields_items_then_the_full_result(gemini):
+    gemini.reply = lambda prompt: json.dumps(RESPONSE)
+
+    async def collect():
+        resume = {"skills": ["Python"], "experience": [], "projects": []}
+        return [event async for event in stream_ai_optimization(resume, "Python developer", None)]
+
+    events = asyncio.run(collect())
+    assert [e["section"] for e in events[:-1]] == ["technical_skills"] * 3 + ["projects", "experience"]
+    assert events[-1]["result"]["technical_skills"] == RESPONSE["technical_skills"]
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from app.services import optimization_cache as oc
+from app.services.cache import LRUCache
+from app.services.optimization_cache import (
+    OptimizationCache,
+    compute_prompt_version,
+    create_optimization_cache,
+    normalise_text,
+    request_hash,
+)
+
+RESUME = {"skills": ["Python", "SQL"], "experience": [{"role": "Engineer", "description": ["Built APIs"]}]}
+RESULT = {"technical_skills": ["Python"], "projects": [], "experience": []}
+
+
+def test_formatting_only_differences_share_a_key():
+    assert normalise_text("  Senior Python \n\n developer ") == "Senior Python developer"
+    assert request_hash(RESUME, "Python  developer\n") == request_hash(RESUME, "Python developer")
+    assert request_hash(RESUME, "Python developer", "") == request_hash(RESUME, "Python developer", None)
+
+
+def test_content_model_and_version_change_the_key():
+    base = request_hash(RESUME, "Python developer")
+    assert request_hash(RESUME, "Go developer") != base
+    assert request_hash({**RESUME, "skills": ["Go"]}, "Python developer") != base
+    assert request_hash(RESUME, "Python developer", "Remote only") != base
+    assert request_hash(RESUME, "Python developer", model="other-model") != base
+    assert request_hash(RESUME, "Python developer", version="v2") != base
+
+
+def test_prompt_version_depends_on_model_and_strategy():
+    assert compute_prompt_version() == compute_prompt_version()
+    assert compute_prompt_version(model="other-model") != compute_prompt_version()
+    assert compute_prompt_version(strategy="single") != compute_prompt_version(strategy="fanout")
+
+
+def test_cache_keys_include_the_prompt_version():
+    one = OptimizationCache(LRUCache(), prompt_version="v1")
+    two = OptimizationCache(LRUCache(), prompt_version="v2")
+    assert one.key(RESUME, "job") != two.key(RESUME, "job")
+
+
+def test_round_trip_and_expiry(monkeypatch):
+    cache = OptimizationCache(LRUCache(), ttl_seconds=60, prompt_version="v1")
+    key = cache.key(RESUME, "Python developer")
+    assert cache.get(key) is None
+    cache.put(key, RESULT)
+    assert cache.get(key) == RESULT
+
+    now = oc.time.time()
+    monkeypatch.setattr(oc.time, "time", lambda: now + 61)
+    assert cache.get(key) is None
+    assert cache.backend.get(key) is None  # expired entries are dropped
+
+
+def test_empty_fallback_results_are_not_stored():
+    cache = OptimizationCache(LRUCache(), prompt_version="v1")
+    cache.put("k", {"technical_skills": [], "projects": [], "experience": []})
+    cache.put("e", {})
+    assert cache.get("k") is None and cache.get("e") is None
+
+
+def test_disk_backend_keeps_only_the_current_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(oc, "OPTIMIZE_CACHE_DIR", str(tmp_path))
+    (tmp_path / "stale-version").mkdir()
+    cache = create_optimization_cache("disk")
+    assert os.listdir(tmp_path) == [cache.prompt_version]
+    cache.put("k", RESULT)
+    assert create_optimization_cache("disk").get("k") == RESULT
+
+
+def test_backend_selection():
+    assert create_optimization_cache("none") is None
+    assert isinstance(create_optimization_cache("memory").backend, LRUCache)
+    with pytest.raises(ValueError):
+        create_optimization_cache("redis")
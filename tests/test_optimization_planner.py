@@ -0,0 +1,132 @@
+import asyncio
+import json
+import re
+
+import pytest
+
+from app.services import optimization_planner
+from app.services.optimization_planner import optimize, plan_sections, stream_optimization
+from app.services.prompt_builder import compact_resume, select_sections, submitted_items
+
+SECTIONS = select_sections({
+    "skills": ["python", "sql"],
+    "projects": [{"title": "Shop", "description": ["Built a shop"]}],
+    "experience": [
+        {"role": "Engineer", "company": "Acme", "dates": "2020-2022", "description": ["Built APIs"]},
+        {"role": "Intern", "company": "Initech", "dates": "2019", "description": ["Fixed bugs"]},
+    ],
+})
+
+
+def section_of(prompt):
+    return re.search(r"^- (\w+):", prompt, re.MULTILINE).group(1)
+
+
+def role_of(prompt):
+    return re.search(r'"role":"([^"]+)"', prompt.split("Resume Section to Optimize:")[1]).group(1)
+
+
+def answer(prompt):
+    section = section_of(prompt)
+    if section == "technical_skills":
+        return json.dumps({"technical_skills": ["Python", "SQL"]})
+    if section == "projects":
+        return json.dumps({"projects": [{"title": "Shop", "description": "Shipped a shop"}]})
+    return json.dumps({"experience": [{"role": f"Senior {role_of(prompt)}", "details": ["Rewritten"]}]})
+
+
+def test_plan_sections_fans_out_experience_per_role():
+    labels = [task.label for task in plan_sections(SECTIONS)]
+    assert labels == ["technical_skills", "projects", "experience[0]", "experience[1]"]
+
+
+def test_fanout_merges_sections_in_resume_order(gemini):
+    gemini.reply = answer
+    gemini.delay = 0.01
+    outcome = asyncio.run(optimize(SECTIONS, "Python developer", None, strategy="fanout"))
+    assert outcome.complete
+    assert outcome.result["technical_skills"] == ["Python", "SQL"]
+    assert [r["role"] for r in outcome.result["experience"]] == ["Senior Engineer", "Senior Intern"]
+    assert len(gemini.prompts) == 4
+    # Sections run concurrently
+    assert gemini.peak > 1
+
+
+def test_malformed_section_is_retried(gemini):
+    calls = []
+
+    def reply(prompt):
+        calls.append(section_of(prompt))
+        if section_of(prompt) == "projects" and calls.count("projects") == 1:
+            return "not json at all"
+        return answer(prompt)
+
+    gemini.reply = reply
+    outcome = asyncio.run(optimize(SECTIONS, "Python developer", None, strategy="fanout"))
+    assert outcome.complete
+    assert calls.count("projects") == 2
+    assert outcome.result["projects"] == [{"title": "Shop", "description": "Shipped a shop"}]
+
+
+def test_failed_section_comes_back_as_submitted(gemini, monkeypatch):
+    monkeypatch.setattr(optimization_planner, "OPTIMIZE_SECTION_RETRIES", 0)
+
+    def reply(prompt):
+        if section_of(prompt) == "experience" and role_of(prompt) == "Intern":
+            raise RuntimeError("model unavailable")
+        return answer(prompt)
+
+    gemini.reply = reply
+    outcome = asyncio.run(optimize(SECTIONS, "Python developer", None, strategy="fanout"))
+    assert outcome.failed == ["experience[1]"]
+    assert outcome.result["experience"] == [
+        {"role": "Senior Engineer", "details": ["Rewritten"]},
+        {"role": "Intern", "company": "Initech", "duration": "2019", "details": ["Fixed bugs"]},
+    ]
+
+
+def test_failed_section_falls_back_to_the_uncompacted_resume(gemini, monkeypatch):
+    monkeypatch.setattr(optimization_planner, "OPTIMIZE_SECTION_RETRIES", 0)
+    bullets = [f"Delivered project {n} which improved throughput and reliability for the team" for n in range(8)]
+    sections = select_sections({
+        "skills": [f"Skill{n}" for n in range(10)],
+        "experience": [
+            {"role": f"Role {r}", "company": "Acme", "dates": "2020", "description": bullets}
+            for r in range(60)
+        ],
+    })
+    sent = compact_resume(sections)
+    assert len(sent["experience"][0]["description"]) < len(bullets)
+
+    def reply(prompt):
+        if section_of(prompt) == "experience":
+            raise RuntimeError("model unavailable")
+        return answer(prompt)
+
+    gemini.reply = reply
+    outcome = asyncio.run(optimize(sections, "Python developer", None, strategy="fanout"))
+    assert len(outcome.failed) == len(sent["experience"])
+    # Every role, sent or trimmed, comes back exactly as written, once
+    assert outcome.result["experience"] == submitted_items("experience", sections["experience"])
+
+
+def test_stream_yields_items_then_the_merged_result(gemini):
+    gemini.reply = answer
+    events = []
+
+    async def collect():
+        async for event in stream_optimization(SECTIONS, "Python developer", None, strategy="fanout"):
+            events.append(event)
+
+    asyncio.run(collect())
+    items, final = events[:-1], events[-1]
+    assert {(e["section"], e["index"]) for e in items} == {
+        ("technical_skills", 0), ("technical_skills", 1), ("projects", 0), ("experience", 0), ("experience", 1)
+    }
+    assert final["failed"] == []
+    assert [r["role"] for r in final["result"]["experience"]] == ["Senior Engineer", "Senior Intern"]
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(optimize(SECTIONS, "Python developer", None, strategy="bogus"))
@@ -0,0 +1,75 @@
+import os
+
+from app.services.cache import DiskCache, LRUCache
+from app.services.parse_cache import ParseCache, compute_parser_version
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # b is now the oldest
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c"), len(cache)) == (1, 3, 2)
+
+
+def test_disk_cache_survives_reopening_and_tracks_size(tmp_path):
+    store = DiskCache(str(tmp_path), max_bytes=10_000)
+    store.set("k", {"name": "Ada"})
+    reopened = DiskCache(str(tmp_path), max_bytes=10_000)
+    assert reopened.get("k") == {"name": "Ada"}
+    assert reopened.size_bytes == store.size_bytes > 0
+    reopened.delete("k")
+    assert reopened.get("k") is None
+    assert reopened.size_bytes == 0
+
+
+def test_disk_cache_evicts_oldest_files_over_budget(tmp_path):
+    value = {"text": "x" * 40}
+    store = DiskCache(str(tmp_path), max_bytes=120)
+    for i, key in enumerate(("a", "b")):
+        store.set(key, value)
+        os.utime(tmp_path / f"{key}.json", (1000 + i, 1000 + i))
+    store.set("c", value)
+    assert store.get("a") is None
+    assert store.get("b") == store.get("c") == value
+    assert store.size_bytes <= 120
+
+
+def test_disk_cache_drops_unreadable_entries(tmp_path):
+    store = DiskCache(str(tmp_path))
+    (tmp_path / "bad.json").write_text("{not json")
+    assert store.get("bad") is None
+    assert not (tmp_path / "bad.json").exists()
+
+
+def test_parse_cache_falls_back_to_disk_and_refills_memory(tmp_path):
+    cache = ParseCache(directory=str(tmp_path), parser_version="v1")
+    key = cache.key(b"%PDF-1.4 resume")
+    assert key == cache.key(b"%PDF-1.4 resume") != cache.key(b"%PDF-1.4 other")
+    cache.put(key, {"extracted_info": {"name": "Ada"}})
+
+    restarted = ParseCache(directory=str(tmp_path), parser_version="v1")
+    assert len(restarted.memory) == 0
+    assert restarted.get(key) == {"extracted_info": {"name": "Ada"}}
+    assert len(restarted.memory) == 1
+
+
+def test_parse_cache_does_not_store_failed_parses(tmp_path):
+    cache = ParseCache(directory=str(tmp_path), parser_version="v1")
+    cache.put("k", {"error": "not a PDF"})
+    assert cache.get("k") is None
+
+
+def test_new_parser_version_drops_old_entries(tmp_path):
+    old = ParseCache(directory=str(tmp_path), parser_version="v1")
+    old.put("k", {"extracted_info": {}})
+    new = ParseCache(directory=str(tmp_path), parser_version="v2")
+    assert new.get("k") is None
+    assert os.listdir(tmp_path) == ["v2"]
+
+
+def test_parser_version_depends_on_the_spacy_model():
+    assert compute_parser_version("en_core_web_sm") == compute_parser_version("en_core_web_sm")
+    assert compute_parser_version("en_core_web_sm") != compute_parser_version("en_core_web_md")
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services.parse_executor import ParseExecutor, ParserSaturated
+
+
+class FakePool:
+    def __init__(self, broken=False, delay=0.0):
+        self.broken = broken
+        self.delay = delay
+        self.submitted = 0
+
+    def submit(self, fn, method, payload, submitted_at):
+        if self.broken:
+            raise BrokenProcessPool("a worker died")
+        self.submitted += 1
+        future = Future()
+        future.set_running_or_notify_cancel()  # running jobs cannot be cancelled
+        if self.delay:
+            # Finishes later, like a slow worker
+            asyncio.get_running_loop().call_later(self.delay, future.set_result, (0.0, payload, {}))
+        else:
+            future.set_result((0.0, payload, {}))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class FakeExecutor(ParseExecutor):
+    """ParseExecutor over FakePools; restarts take restart_seconds of blocking work."""
+
+    def __init__(self, restart_seconds=0.0, **kwargs):
+        self.restart_seconds = restart_seconds
+        self.started = []
+        super().__init__(workers=1, **kwargs)
+
+    def _start_pool(self):
+        time.sleep(self.restart_seconds if self.started else 0)
+        pool = FakePool(broken=not self.started)  # the first pool breaks
+        self.started.append(pool)
+        return pool
+
+
+def test_broken_pool_is_restarted_once_off_the_event_loop():
+    async def scenario():
+        executor = FakeExecutor(restart_seconds=0.2, max_pending=5)
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        beating = asyncio.create_task(heartbeat())
+        results = await asyncio.gather(*(executor.parse(f"pdf{i}".encode()) for i in range(5)))
+        beating.cancel()
+        return executor, results, ticks
+
+    executor, results, ticks = asyncio.run(scenario())
+    assert results == [f"pdf{i}".encode() for i in range(5)]
+    assert len(executor.started) == 2  # the initial pool and a single restart
+    assert executor.started[1].submitted == 5
+    assert ticks >= 10  # the loop kept running during the 0.2s restart
+
+
+def test_submissions_beyond_max_pending_are_rejected():
+    async def scenario():
+        executor = FakeExecutor(max_pending=2)
+        executor._pool = FakePool(delay=0.05)
+        first = [asyncio.create_task(executor.parse(b"a")) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ParserSaturated):
+            await executor.parse(b"b")
+        await asyncio.gather(*first)
+        return await executor.parse(b"c")
+
+    assert asyncio.run(scenario()) == b"c"
+
+
+def test_timeout_keeps_the_slot_until_the_job_finishes():
+    async def scenario():
+        executor = FakeExecutor(max_pending=1)
+        executor._pool = FakePool(delay=0.1)
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.parse(b"slow", timeout=0.01)
+        assert executor.stats()["pending"] == 1
+        await asyncio.sleep(0.15)
+        assert executor.stats()["pending"] == 0
+
+    asyncio.run(scenario())
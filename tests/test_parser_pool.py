@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from app.services import parser_pool
+from app.services.parser_pool import ParserPool
+
+
+class FakeParser:
+    created = 0
+
+    def __init__(self, spacy_model):
+        FakeParser.created += 1
+        self.spacy_model = spacy_model
+
+
+@pytest.fixture(autouse=True)
+def fake_parser(monkeypatch):
+    FakeParser.created = 0
+    monkeypatch.setattr(parser_pool, "ResumeParser", FakeParser)
+
+
+def test_parsers_are_built_once_up_front():
+    pool = ParserPool(size=3, spacy_model="model")
+    assert FakeParser.created == 3
+    for _ in range(5):
+        with pool.acquire() as parser:
+            assert parser.spacy_model == "model"
+    assert FakeParser.created == 3
+    assert pool.stats()["idle"] == 3
+
+
+def test_checked_out_parsers_are_not_shared():
+    pool = ParserPool(size=2)
+    with pool.acquire() as first, pool.acquire() as second:
+        assert first is not second
+        assert pool.stats()["idle"] == 0
+    assert pool.stats()["idle"] == 2
+
+
+def test_acquire_times_out_when_every_parser_is_busy():
+    pool = ParserPool(size=1)
+    with pool.acquire():
+        with pytest.raises(TimeoutError):
+            with pool.acquire(timeout=0.01):
+                pass
+
+
+def test_parser_is_returned_when_the_block_raises():
+    pool = ParserPool(size=1)
+    with pytest.raises(ValueError):
+        with pool.acquire():
+            raise ValueError("parse failed")
+    with pool.acquire(timeout=0.01):
+        pass
+
+
+def test_waiter_gets_the_parser_released_by_another_thread():
+    pool = ParserPool(size=1)
+    got = []
+
+    def wait_for_parser():
+        with pool.acquire(timeout=1) as parser:
+            got.append(parser)
+
+    with pool.acquire() as held:
+        waiter = threading.Thread(target=wait_for_parser)
+        waiter.start()
+    waiter.join()
+    assert got == [held]
@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+from app.services.optimization_planner import optimize
+from app.services.prompt_builder import (
+    PROMPT_RESUME_TOKEN_BUDGET,
+    compact_resume,
+    estimate_tokens,
+    fit_to_budget,
+    restore_trimmed,
+    select_sections,
+    serialise_sections,
+    submitted_items,
+)
+
+
+def bullet(n):
+    return f"Delivered project number {n} which improved throughput and reliability for the team"
+
+
+def make_sections(roles=6, bullets=5, projects=3, skills=20):
+    return select_sections({
+        "skills": [f"Skill{n}" for n in range(skills)],
+        "experience": [
+            {"role": f"Role {r}", "company": f"Company {r}", "dates": "2020-2022",
+             "description": [bullet(r * 10 + b) for b in range(bullets)]}
+            for r in range(roles)
+        ],
+        "projects": [
+            {"title": f"Project {p}", "description": [bullet(100 + p * 10 + b) for b in range(bullets)]}
+            for p in range(projects)
+        ],
+    })
+
+
+def test_select_sections_keeps_only_rewritten_non_empty_fields():
+    sections = select_sections({
+        "skills": [" Python ", ""],
+        "experience": [{"role": "Engineer", "company": "", "dates": "", "description": ["  Built APIs "]}],
+        "projects": [],
+        "education": [{"college": "MIT"}],
+        "raw_markdown": "# Resume",
+    })
+    assert sections == {"skills": ["Python"], "experience": [{"role": "Engineer", "description": ["Built APIs"]}]}
+
+
+def test_fit_to_budget_leaves_fitting_sections_alone():
+    sections = make_sections(roles=1, bullets=1, projects=1, skills=2)
+    assert fit_to_budget(sections, 10_000) == sections
+
+
+def test_fit_to_budget_only_drops_whole_items():
+    sections = make_sections()
+    snapshot = json.loads(json.dumps(sections))
+    for budget in (1500, 800, 400, 200, 100):
+        trimmed = fit_to_budget(sections, budget)
+        assert estimate_tokens(serialise_sections(trimmed)) <= budget
+        assert sections == snapshot
+        for name in ("experience", "projects"):
+            for entry, original in zip(trimmed.get(name, []), sections[name]):
+                assert all(b in original["description"] for b in entry["description"])
+        assert all(s in sections["skills"] for s in trimmed.get("skills", []))
+
+
+def test_restore_trimmed_puts_back_what_the_prompt_left_out():
+    sections = make_sections()
+    prompt = fit_to_budget(sections, 250)
+    assert len(prompt["experience"]) < len(sections["experience"])
+
+    # A model answer that rewrote exactly what it was sent
+    result = {
+        "technical_skills": [s.upper() for s in prompt.get("skills", [])],
+        "projects": [{"title": p["title"], "description": "rewritten"} for p in prompt["projects"]],
+        "experience": [
+            {"role": r["role"], "company": r["company"], "duration": r["dates"], "details": ["rewritten"]}
+            for r in prompt["experience"]
+        ],
+    }
+    restored = restore_trimmed(result, sections, prompt)
+
+    assert len(restored["experience"]) == len(sections["experience"])
+    assert len(restored["projects"]) == len(sections["projects"])
+    kept = len(prompt["experience"])
+    assert restored["experience"][kept:] == submitted_items("experience", sections["experience"][kept:])
+    first = restored["experience"][0]
+    assert first["details"][0] == "rewritten"
+    assert first["details"][1:] == [
+        b for b in sections["experience"][0]["description"] if b not in prompt["experience"][0]["description"]
+    ]
+    skills = [s.lower() for s in restored["technical_skills"]]
+    assert sorted(skills) == sorted(s.lower() for s in sections["skills"])
+    # The model's answer is not modified in place
+    assert result["experience"][0]["details"] == ["rewritten"]
+
+
+def test_restore_trimmed_does_not_fill_in_a_failed_answer():
+    sections = make_sections()
+    empty = {"technical_skills": [], "projects": [], "experience": []}
+    assert restore_trimmed(empty, sections, fit_to_budget(sections, 250)) == empty
+
+
+def test_optimize_returns_entries_trimmed_from_the_prompt(gemini):
+    sections = make_sections(roles=80)
+    assert estimate_tokens(serialise_sections(sections)) > PROMPT_RESUME_TOKEN_BUDGET
+    sent = len(compact_resume(sections)["experience"])
+    assert sent < 80
+
+    def reply(prompt):
+        count = prompt.count('"role":"Role ')
+        return json.dumps({
+            "technical_skills": ["Python"],
+            "projects": [],
+            "experience": [{"role": f"Rewritten {n}", "details": []} for n in range(count)],
+        })
+
+    gemini.reply = reply
+    outcome = asyncio.run(optimize(sections, "Python developer", None, strategy="single"))
+    roles = [r["role"] for r in outcome.result["experience"]]
+    assert roles[:sent] == [f"Rewritten {n}" for n in range(sent)]
+    assert roles[sent:] == [f"Role {r}" for r in range(sent, 80)]
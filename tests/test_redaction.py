@@ -0,0 +1,63 @@
+from app.services.extract_info import ResumeParser
+from app.services.redaction import RedactionTerm, Redactor, normalise_whitespace
+
+
+def clean_markdown(markdown, extracted_info):
+    # clean_markdown does not use the parser's spaCy state
+    return ResumeParser.clean_markdown(None, markdown, extracted_info)
+
+
+def redact(text, *terms):
+    return Redactor(terms).apply(text)
+
+
+def test_removes_values_and_normalises_whitespace():
+    assert redact("a x  b\n\n\n\nc", RedactionTerm("x")) == "a b\n\nc"
+    assert redact("  x keep x  ", RedactionTerm("x")) == "keep"
+
+
+def test_whole_word_terms_ignore_case_and_respect_word_boundaries():
+    term = RedactionTerm("Ada", ignore_case=True, whole_word=True)
+    assert redact("Adam met ADA.", term) == "Adam met ."
+
+
+def test_terms_are_stripped_before_matching():
+    term = RedactionTerm("  Ada  ", ignore_case=True, whole_word=True)
+    assert redact("Hi ada, bye", term) == "Hi , bye"
+
+
+def test_overlapping_terms_leftmost_match_wins_regardless_of_term_order():
+    assert redact("xabcdx", RedactionTerm("bcd"), RedactionTerm("abc")) == "xdx"
+    assert redact("xabcdx", RedactionTerm("abc"), RedactionTerm("bcd")) == "xdx"
+
+
+def test_overlapping_terms_at_the_same_offset_longest_wins():
+    assert redact("xabcdx", RedactionTerm("abc"), RedactionTerm("abcd")) == "xx"
+
+
+def test_removal_does_not_join_text_into_a_new_match():
+    # A sequential chain would drop the email first and then find "MIT"
+    text = "MIada@x.ioT rocks"
+    assert redact(text, RedactionTerm("ada@x.io"), RedactionTerm("MIT")) == "MIT rocks"
+
+
+def test_name_inside_email_removes_the_whole_email():
+    info = {"name": "Ada", "email": "ada@lovelace.io"}
+    cleaned = clean_markdown("Contact: ada@lovelace.io\nAda Lovelace", info)
+    assert "@" not in cleaned and "lovelace.io" not in cleaned
+    assert "Lovelace" in cleaned
+
+
+def test_name_inside_profile_url_removes_the_whole_url():
+    info = {"name": "Ada", "github": "https://github.com/ada"}
+    assert clean_markdown("See github.com/ada for code", info) == "See for code"
+
+
+def test_phone_is_removed_as_written_and_as_digits():
+    info = {"phone": "(555) 123-4567"}
+    assert clean_markdown("Call (555) 123-4567 or 5551234567 today", info) == "Call or today"
+
+
+def test_normalise_whitespace_collapses_blank_line_runs_and_spaces():
+    assert normalise_whitespace("  \n\n \n  ") == " \n\n "
+    assert normalise_whitespace("a    b") == "a b"
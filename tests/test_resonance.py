@@ -0,0 +1,62 @@
+from app.services.resonance import job_terms, score_resume, section_texts, tokenize, top_keywords
+
+JOB = """Senior Python engineer.
+We build data pipelines with Python, Kafka and PostgreSQL on AWS.
+Experience with Kubernetes and CI/CD is a plus.
+Strong Python and SQL skills required."""
+
+MATCHING = {
+    "summary": "Python engineer building data pipelines",
+    "skills": ["Python", "PostgreSQL", "Kafka", "AWS", "Kubernetes", "CI/CD", "SQL"],
+    "experience": [{"role": "Backend engineer", "company": "Acme",
+                    "description": ["Built Kafka data pipelines in Python on AWS"]}],
+}
+UNRELATED = {
+    "skills": ["Photoshop", "Illustrator"],
+    "experience": [{"role": "Graphic designer", "company": "Studio", "description": ["Designed brand identities"]}],
+}
+
+
+def test_tokenize_keeps_tech_spellings_and_drops_stopwords():
+    words = tokenize("We use C++, C#, Node.js and CI/CD with the front-end team.")
+    assert {"c++", "c#", "node.js", "ci/cd", "front-end"} <= set(words)
+    assert "we" not in words and "the" not in words and "team" not in words
+    # Single words come first, then adjacent bigrams
+    assert "c++ c#" in words and words.index("c++ c#") > words.index("front-end")
+
+
+def test_top_keywords_ranks_repeated_terms_first():
+    keywords = top_keywords(job_terms(JOB))
+    assert keywords[0] == "python"
+    assert {"kafka", "postgresql", "kubernetes"} <= set(keywords)
+
+
+def test_matching_resume_scores_higher_than_an_unrelated_one():
+    good, bad = score_resume(MATCHING, JOB), score_resume(UNRELATED, JOB)
+    assert 0 <= bad["score"] < good["score"] <= 100
+    assert good["keyword_coverage"] > 0.5
+    assert bad["matched_keywords"] == []
+    assert "python" in good["matched_keywords"]
+    assert "python" in bad["missing_keywords"]
+
+
+def test_scores_are_reported_per_filled_section():
+    result = score_resume(MATCHING, JOB)
+    assert set(result["sections"]) == {"summary", "skills", "experience"}
+    assert result["sections"]["skills"]["keyword_coverage"] > 0
+    assert set(section_texts({"skills": [], "summary": "  "})) == set()
+
+
+def test_raw_text_stands_in_when_no_section_is_filled():
+    result = score_resume({"extracted_text": "Python engineer with Kafka and AWS"}, JOB)
+    assert "python" in result["matched_keywords"]
+    assert result["sections"] == {}
+
+
+def test_empty_inputs_score_zero():
+    assert score_resume({}, JOB)["score"] == 0
+    assert score_resume(MATCHING, "")["score"] == 0
+
+
+def test_scoring_is_deterministic():
+    assert score_resume(MATCHING, JOB) == score_resume(MATCHING, JOB)
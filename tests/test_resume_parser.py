@@ -0,0 +1,69 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from app.services import resume_parser
+from app.services.resume_parser import (
+    call_ai_for_optimization,
+    decode_model_json,
+    parse_optimization_response,
+)
+
+RESUME = {"skills": ["Python"], "experience": [], "projects": []}
+
+
+def optimize(**kwargs):
+    return asyncio.run(call_ai_for_optimization(RESUME, "Python developer", None, **kwargs))
+
+
+def test_returns_the_parsed_sections(gemini):
+    assert optimize() == {"technical_skills": ["Python"], "projects": [], "experience": []}
+
+
+def test_empty_response_is_logged_and_returns_nothing(gemini, caplog):
+    gemini.reply = lambda prompt: ""
+    with caplog.at_level(logging.WARNING, logger="app.services.resume_parser"):
+        assert optimize() == {}
+    assert "Empty AI response" in caplog.text
+
+
+def test_failed_call_is_logged_and_returns_empty_sections(gemini, caplog):
+    def fail(prompt):
+        raise RuntimeError("quota exceeded")
+
+    gemini.reply = fail
+    with caplog.at_level(logging.ERROR, logger="app.services.resume_parser"):
+        assert optimize() == {"technical_skills": [], "projects": [], "experience": []}
+    assert "quota exceeded" in caplog.text
+
+
+def test_slow_call_times_out(gemini):
+    gemini.delay = 0.2
+    with pytest.raises(asyncio.TimeoutError):
+        optimize(timeout=0.01)
+
+
+def test_concurrent_calls_are_capped(gemini):
+    gemini.delay = 0.02
+
+    async def many():
+        await asyncio.gather(*(call_ai_for_optimization(RESUME, f"job {i}", None) for i in range(20)))
+
+    asyncio.run(many())
+    assert len(gemini.prompts) == 20
+    assert gemini.peak == resume_parser.AI_MAX_CONCURRENCY
+
+
+def test_decode_strips_code_fences_without_printing(capsys):
+    assert decode_model_json('```json\n{"a": [1]}\n```') == {"a": [1]}
+    assert capsys.readouterr().out == ""
+
+
+def test_missing_and_mistyped_sections_become_empty_lists(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.services.resume_parser"):
+        result = parse_optimization_response(json.dumps({"technical_skills": "Python", "projects": []}))
+    assert result == {"technical_skills": [], "projects": [], "experience": []}
+    assert "Wrong type for technical_skills" in caplog.text
+    assert "Missing key in AI response: experience" in caplog.text
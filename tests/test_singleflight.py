@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from app.routes.resume import _optimize_flight_key
+from app.services.singleflight import SingleFlight
+
+
+class Work:
+    """Counts runs; each run waits until released, then returns its run number."""
+
+    def __init__(self):
+        self.runs = 0
+        self.cancelled = 0
+        self.release = None
+
+    async def __call__(self):
+        self.runs += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.runs
+
+
+def test_concurrent_calls_share_one_run():
+    async def main():
+        flight, work = SingleFlight("test"), Work()
+        work.release = asyncio.Event()
+        callers = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert len(flight) == 1
+        work.release.set()
+        assert await asyncio.gather(*callers) == [1] * 5
+        assert work.runs == 1
+        # Finished work frees the key: this is not a cache
+        assert len(flight) == 0
+        assert await flight.do("key", work) == 2
+
+    asyncio.run(main())
+
+
+def test_different_keys_run_separately():
+    async def main():
+        flight, work = SingleFlight("test"), Work()
+        work.release = asyncio.Event()
+        work.release.set()
+        await asyncio.gather(flight.do("a", work), flight.do("b", work))
+        assert work.runs == 2
+
+    asyncio.run(main())
+
+
+def test_errors_are_shared_and_not_kept():
+    async def main():
+        flight, runs = SingleFlight("test"), []
+
+        async def failing():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", failing), flight.do("key", failing), return_exceptions=True
+        )
+        assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+        assert len(runs) == 1
+        with pytest.raises(RuntimeError):
+            await flight.do("key", failing)
+        assert len(runs) == 2
+
+    asyncio.run(main())
+
+
+def test_cancelling_one_caller_keeps_the_work_for_the_others():
+    async def main():
+        flight, work = SingleFlight("test"), Work()
+        work.release = asyncio.Event()
+        leader = asyncio.create_task(flight.do("key", work))
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        assert leader.cancelled()
+        assert work.cancelled == 0
+
+        work.release.set()
+        assert await follower == 1
+        assert work.runs == 1
+
+    asyncio.run(main())
+
+
+def test_cancelling_every_caller_cancels_the_work():
+    async def main():
+        flight, work = SingleFlight("test"), Work()
+        work.release = asyncio.Event()
+        callers = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        assert work.cancelled == 1
+        assert len(flight) == 0
+
+        # A new caller starts fresh work rather than joining the cancelled one
+        work.release.set()
+        assert await flight.do("key", work) == 2
+
+    asyncio.run(main())
+
+
+def test_optimize_routes_do_not_share_flights():
+    args = ("user-1", {"skills": ["Python"]}, "Python developer", None)
+    single = _optimize_flight_key("optimize", *args)
+    batch = _optimize_flight_key("batch", *args)
+    assert single != batch
+    assert single == _optimize_flight_key("optimize", *args)
+    assert single != _optimize_flight_key("optimize", "user-2", *args[1:])
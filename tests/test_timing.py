@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.routes import resume as resume_routes
+from app.services.metrics import counter, histogram, render_prometheus
+from app.services.timing import ServerTimingMiddleware, collect_timings, record, server_timing_header, span
+
+
+def test_spans_are_collected_per_request_and_summed():
+    with collect_timings() as timings:
+        with span("download"):
+            pass
+        record("ai_call", 0.25)
+        record("ai_call", 0.5)
+    assert set(timings) == {"download", "ai_call"}
+    assert timings["ai_call"] == 0.75
+
+
+def test_server_timing_header_is_in_milliseconds():
+    assert server_timing_header({"parse": 0.0123, "total": 0.1}) == "parse;dur=12.3, total;dur=100.0"
+
+
+def test_middleware_adds_server_timing_with_stages_and_total():
+    async def endpoint(request):
+        with span("work"):
+            await asyncio.sleep(0.01)
+        return PlainTextResponse("ok")
+
+    app = ServerTimingMiddleware(Starlette(routes=[Route("/", endpoint)]))
+    header = TestClient(app).get("/").headers["server-timing"]
+    stages = [entry.split(";")[0] for entry in header.split(", ")]
+    assert stages == ["work", "total"]
+
+
+def test_prometheus_rendering_of_counters_and_histograms():
+    calls = counter("test_render_calls_total", "Calls")
+    calls.inc(outcome="ok")
+    calls.inc(2, outcome='we"ird')
+    latency = histogram("test_render_seconds", "Latency", buckets=(0.1, 1.0))
+    latency.observe(0.5)
+    text = render_prometheus()
+    assert "# TYPE test_render_calls_total counter" in text
+    assert 'test_render_calls_total{outcome="ok"} 1' in text
+    assert 'test_render_calls_total{outcome="we\\"ird"} 2' in text
+    assert 'test_render_seconds_bucket{le="0.1"} 0' in text
+    assert 'test_render_seconds_bucket{le="1"} 1' in text
+    assert 'test_render_seconds_bucket{le="+Inf"} 1' in text
+    assert "test_render_seconds_sum 0.5" in text
+
+
+class SlowStorage:
+    """Supabase storage whose download blocks the calling thread."""
+
+    def from_(self, bucket):
+        return self
+
+    def download(self, path):
+        time.sleep(0.2)
+        return b"%PDF-1.4"
+
+
+class FakeSupabase:
+    storage = SlowStorage()
+
+
+class CachedParse:
+    def key(self, pdf_bytes):
+        return "key"
+
+    def get(self, key):
+        return {"extracted_info": {}, "sections": {}}
+
+
+def test_parse_download_does_not_block_the_event_loop(monkeypatch):
+    monkeypatch.setattr(resume_routes, "get_supabase", lambda: FakeSupabase())
+    monkeypatch.setattr(resume_routes, "_build_parse_response", lambda result: result)
+
+    async def scenario():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        beating = asyncio.create_task(heartbeat())
+        with collect_timings() as timings:
+            await resume_routes._parse_stored_file("u1/cv.pdf", "cv.pdf", None, CachedParse())
+        beating.cancel()
+        return ticks, timings
+
+    ticks, timings = asyncio.run(scenario())
+    assert ticks >= 10
+    assert timings["download"] >= 0.2